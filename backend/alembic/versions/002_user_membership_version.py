@@ -0,0 +1,27 @@
+"""Add users.membership_version for /auth/me ETags
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("membership_version", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    # batch mode so the column drop also works on SQLite
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("membership_version")
@@ -0,0 +1,61 @@
+"""Add order archive tables and teams.purged_at
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("teams", sa.Column("purged_at", sa.DateTime(timezone=True), nullable=True))
+
+    # -- orders_archive (no FKs: cold data must not pin hot rows) --
+    op.create_table(
+        "orders_archive",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("team_id", sa.Uuid(), nullable=False),
+        sa.Column("share_token", sa.String(64), nullable=False),
+        sa.Column("created_by", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "archived_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_orders_archive_team_id", "orders_archive", ["team_id"])
+
+    # -- order_items_archive --
+    op.create_table(
+        "order_items_archive",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("order_id", sa.Uuid(), nullable=False),
+        sa.Column("colleague_id", sa.Uuid(), nullable=False),
+        sa.Column("colleague_name", sa.String(100), nullable=True),
+        sa.Column("coffee_option_id", sa.Uuid(), nullable=False),
+        sa.Column("drink_type_name", sa.String(100), nullable=False),
+        sa.Column("size_name", sa.String(50), nullable=False),
+        sa.Column("size_abbreviation", sa.String(10), nullable=False),
+        sa.Column("milk_option_name", sa.String(50), nullable=True),
+        sa.Column("sugar", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("notes", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_order_items_archive_order_id", "order_items_archive", ["order_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_items_archive_order_id", table_name="order_items_archive")
+    op.drop_table("order_items_archive")
+    op.drop_index("ix_orders_archive_team_id", table_name="orders_archive")
+    op.drop_table("orders_archive")
+    with op.batch_alter_table("teams") as batch_op:
+        batch_op.drop_column("purged_at")
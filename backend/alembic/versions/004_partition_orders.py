@@ -0,0 +1,171 @@
+"""Range-partition orders and order_items by month (PostgreSQL only)
+
+PostgreSQL requires the partition key in every unique constraint, so the primary keys
+become (id, created_at), share_token uniqueness becomes (share_token, created_at) and
+the order_items -> orders foreign key is dropped (the application always writes items
+for an existing order, and share tokens are 384 random bits). The models keep the
+unpartitioned shape; see the note in app/models/order.py. SQLite keeps plain tables
+and uses the *_archive tables from 003 as its cold tier instead; see
+app/services/partitions.py.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+"""
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+# Named explicitly: later downgrades re-add columns at the end, so positions differ
+ORDER_COLUMNS = "id, team_id, share_token, created_by, created_at"
+ORDER_ITEM_COLUMNS = (
+    "id, order_id, colleague_id, coffee_option_id, drink_type_name, size_name, "
+    "size_abbreviation, milk_option_name, sugar, notes, created_at"
+)
+
+
+def _months(start: datetime, end: datetime):
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _create_partitions(table: str, first: datetime, last: datetime) -> None:
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    for year, month in _months(first, last):
+        lo = datetime(year, month, 1, tzinfo=timezone.utc)
+        hi = datetime(year + (month == 12), month % 12 + 1, 1, tzinfo=timezone.utc)
+        op.execute(
+            f"CREATE TABLE {table}_p{year:04d}{month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}')"
+        )
+
+
+def _copy(source: str, target: str, columns: str) -> None:
+    op.execute(f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {source}")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    now = datetime.now(timezone.utc)
+    first = bind.execute(sa.text("SELECT min(created_at) FROM orders")).scalar() or now
+    last = datetime(
+        now.year + (now.month + MONTHS_AHEAD - 1) // 12,
+        (now.month + MONTHS_AHEAD - 1) % 12 + 1,
+        1,
+        tzinfo=timezone.utc,
+    )
+
+    op.execute("ALTER TABLE order_items RENAME TO order_items_unpartitioned")
+    op.execute("ALTER TABLE orders RENAME TO orders_unpartitioned")
+
+    op.execute(
+        """
+        CREATE TABLE orders (
+            id uuid NOT NULL,
+            team_id uuid NOT NULL,
+            share_token varchar(64) NOT NULL,
+            created_by uuid NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT pk_orders_partitioned PRIMARY KEY (id, created_at),
+            CONSTRAINT uq_orders_share_token_created_at UNIQUE (share_token, created_at),
+            CONSTRAINT fk_orders_team_id FOREIGN KEY (team_id) REFERENCES teams (id),
+            CONSTRAINT fk_orders_created_by FOREIGN KEY (created_by) REFERENCES users (id)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE order_items (
+            id uuid NOT NULL,
+            order_id uuid NOT NULL,
+            colleague_id uuid NOT NULL,
+            coffee_option_id uuid NOT NULL,
+            drink_type_name varchar(100) NOT NULL,
+            size_name varchar(50) NOT NULL,
+            size_abbreviation varchar(10) NOT NULL,
+            milk_option_name varchar(50),
+            sugar integer NOT NULL DEFAULT 0,
+            notes varchar(255),
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT pk_order_items_partitioned PRIMARY KEY (id, created_at),
+            CONSTRAINT fk_order_items_colleague_id
+                FOREIGN KEY (colleague_id) REFERENCES colleagues (id),
+            CONSTRAINT fk_order_items_coffee_option_id
+                FOREIGN KEY (coffee_option_id) REFERENCES coffee_options (id)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_index("ix_orders_team_id_created_at", "orders", ["team_id", "created_at"])
+    op.create_index("ix_orders_share_token", "orders", ["share_token"])
+    op.create_index("ix_order_items_order_id", "order_items", ["order_id"])
+
+    _create_partitions("orders", first, last)
+    _create_partitions("order_items", first, last)
+
+    _copy("orders_unpartitioned", "orders", ORDER_COLUMNS)
+    _copy("order_items_unpartitioned", "order_items", ORDER_ITEM_COLUMNS)
+    op.drop_table("order_items_unpartitioned")
+    op.drop_table("orders_unpartitioned")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE order_items RENAME TO order_items_partitioned")
+    op.execute("ALTER TABLE orders RENAME TO orders_partitioned")
+
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("team_id", sa.Uuid(), nullable=False),
+        sa.Column("share_token", sa.String(64), nullable=False),
+        sa.Column("created_by", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("share_token"),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"]),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+    )
+    op.create_table(
+        "order_items",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("order_id", sa.Uuid(), nullable=False),
+        sa.Column("colleague_id", sa.Uuid(), nullable=False),
+        sa.Column("coffee_option_id", sa.Uuid(), nullable=False),
+        sa.Column("drink_type_name", sa.String(100), nullable=False),
+        sa.Column("size_name", sa.String(50), nullable=False),
+        sa.Column("size_abbreviation", sa.String(10), nullable=False),
+        sa.Column("milk_option_name", sa.String(50), nullable=True),
+        sa.Column("sugar", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("notes", sa.String(255), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"]),
+        sa.ForeignKeyConstraint(["colleague_id"], ["colleagues.id"]),
+        sa.ForeignKeyConstraint(["coffee_option_id"], ["coffee_options.id"]),
+    )
+    _copy("orders_partitioned", "orders", ORDER_COLUMNS)
+    _copy("order_items_partitioned", "order_items", ORDER_ITEM_COLUMNS)
+    # Dropping the parents drops every attached partition; detached ones are left alone
+    op.execute("DROP TABLE order_items_partitioned")
+    op.execute("DROP TABLE orders_partitioned")
@@ -0,0 +1,51 @@
+"""Add order_templates and order_template_items
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "006"
+down_revision = "005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_templates",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("team_id", sa.Uuid(), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("created_by", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"]),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_order_templates_team_id", "order_templates", ["team_id"])
+
+    op.create_table(
+        "order_template_items",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("template_id", sa.Uuid(), nullable=False),
+        sa.Column("colleague_id", sa.Uuid(), nullable=False),
+        sa.Column("coffee_option_id", sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(["template_id"], ["order_templates.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["colleague_id"], ["colleagues.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["coffee_option_id"], ["coffee_options.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_order_template_items_template_id", "order_template_items", ["template_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_template_items_template_id", table_name="order_template_items")
+    op.drop_table("order_template_items")
+    op.drop_index("ix_order_templates_team_id", table_name="order_templates")
+    op.drop_table("order_templates")
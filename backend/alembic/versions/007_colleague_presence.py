@@ -0,0 +1,45 @@
+"""Add colleague_presence attendance counts and job_watermarks
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "colleague_presence",
+        sa.Column("colleague_id", sa.Uuid(), nullable=False),
+        sa.Column("weekday", sa.SmallInteger(), nullable=False),
+        sa.Column("team_id", sa.Uuid(), nullable=False),
+        sa.Column("days_observed", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("days_present", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.ForeignKeyConstraint(["colleague_id"], ["colleagues.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"]),
+        sa.PrimaryKeyConstraint("colleague_id", "weekday"),
+    )
+    # The forecast endpoint reads one weekday for one team
+    op.create_index(
+        "ix_colleague_presence_team_weekday", "colleague_presence", ["team_id", "weekday"]
+    )
+
+    op.create_table(
+        "job_watermarks",
+        sa.Column("name", sa.String(64), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_watermarks")
+    op.drop_index("ix_colleague_presence_team_weekday", table_name="colleague_presence")
+    op.drop_table("colleague_presence")
@@ -0,0 +1,53 @@
+"""Add drink_frequencies usual-drink counts, backfilled from order history
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "drink_frequencies",
+        sa.Column("colleague_id", sa.Uuid(), nullable=False),
+        sa.Column("coffee_option_id", sa.Uuid(), nullable=False),
+        sa.Column("weekday", sa.SmallInteger(), nullable=False),
+        sa.Column("team_id", sa.Uuid(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_ordered_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["colleague_id"], ["colleagues.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["coffee_option_id"], ["coffee_options.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["team_id"], ["teams.id"]),
+        sa.PrimaryKeyConstraint("colleague_id", "coffee_option_id", "weekday"),
+    )
+    op.create_index("ix_drink_frequencies_team", "drink_frequencies", ["team_id"])
+
+    # Monday = 0, as Python's date.weekday(); the app keeps the counts current from here
+    if op.get_bind().dialect.name == "postgresql":
+        weekday = "CAST(EXTRACT(ISODOW FROM o.created_at AT TIME ZONE 'UTC') - 1 AS SMALLINT)"
+    else:
+        weekday = "CAST((CAST(strftime('%w', o.created_at) AS INTEGER) + 6) % 7 AS INTEGER)"
+    op.execute(
+        f"""
+        INSERT INTO drink_frequencies
+            (colleague_id, coffee_option_id, weekday, team_id, order_count, last_ordered_at)
+        SELECT oi.colleague_id, oi.coffee_option_id, {weekday}, o.team_id,
+               COUNT(*), MAX(o.created_at)
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        GROUP BY oi.colleague_id, oi.coffee_option_id, {weekday}, o.team_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_drink_frequencies_team", table_name="drink_frequencies")
+    op.drop_table("drink_frequencies")
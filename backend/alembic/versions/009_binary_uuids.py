@@ -0,0 +1,80 @@
+"""Store UUIDs as 16-byte BLOBs on SQLite and add the order join indexes there
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+"""
+
+import uuid
+
+from alembic import op
+
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+# Every UUID column as of revision 008
+UUID_COLUMNS = {
+    "users": ["id"],
+    "magic_link_tokens": ["id", "user_id"],
+    "teams": ["id", "created_by"],
+    "team_memberships": ["id", "team_id", "user_id"],
+    "team_invites": ["id", "team_id", "colleague_id", "invited_by"],
+    "colleagues": ["id", "team_id", "user_id"],
+    "drink_types": ["id", "team_id"],
+    "sizes": ["id", "team_id"],
+    "milk_options": ["id", "team_id"],
+    "coffee_options": ["id", "colleague_id", "drink_type_id", "size_id", "milk_option_id"],
+    "orders": ["id", "team_id", "created_by"],
+    "order_items": ["id", "order_id", "colleague_id", "coffee_option_id"],
+    "orders_archive": ["id", "team_id", "created_by"],
+    "order_items_archive": ["id", "order_id", "colleague_id", "coffee_option_id"],
+    "idempotency_keys": ["id", "user_id"],
+    "order_templates": ["id", "team_id", "created_by"],
+    "order_template_items": ["id", "template_id", "colleague_id", "coffee_option_id"],
+    "colleague_presence": ["colleague_id", "team_id"],
+    "drink_frequencies": ["colleague_id", "coffee_option_id", "team_id"],
+}
+
+
+def _text_to_blob(value):
+    return uuid.UUID(value).bytes if isinstance(value, str) else value
+
+
+def upgrade() -> None:
+    # PostgreSQL already stores uuid natively
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    # The declared CHAR(32) columns keep their TEXT affinity, which SQLite never applies
+    # to BLOB values, so converting the values is enough; no table rebuild is needed.
+    # Parent and child keys are rewritten in separate statements, which relies on
+    # foreign_keys being off, as it is for the app's and alembic's connections.
+    bind.connection.dbapi_connection.create_function(
+        "uuid_text_to_blob", 1, _text_to_blob, deterministic=True
+    )
+    for table, columns in UUID_COLUMNS.items():
+        assignments = ", ".join(f"{c} = uuid_text_to_blob({c})" for c in columns)
+        op.execute(f"UPDATE {table} SET {assignments}")
+    # Run VACUUM afterwards to return the freed pages to the filesystem
+
+    # Migration 004 created these on PostgreSQL only; without them SQLite answers every
+    # team's statistics join by scanning all of order_items
+    op.create_index(
+        "ix_orders_team_id_created_at", "orders", ["team_id", "created_at"], if_not_exists=True
+    )
+    op.create_index("ix_order_items_order_id", "order_items", ["order_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.drop_index("ix_order_items_order_id", table_name="order_items", if_exists=True)
+    op.drop_index("ix_orders_team_id_created_at", table_name="orders", if_exists=True)
+    for table, columns in UUID_COLUMNS.items():
+        assignments = ", ".join(
+            f"{c} = CASE WHEN typeof({c}) = 'blob' THEN lower(hex({c})) ELSE {c} END"
+            for c in columns
+        )
+        op.execute(f"UPDATE {table} SET {assignments}")
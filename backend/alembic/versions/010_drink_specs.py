@@ -0,0 +1,121 @@
+"""Move order item drink details into the content-keyed drink_specs dictionary
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+"""
+
+import hashlib
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+SPEC_COLUMNS = [
+    "drink_type_name",
+    "size_name",
+    "size_abbreviation",
+    "milk_option_name",
+    "sugar",
+    "notes",
+]
+
+
+def _spec_key(*values) -> bytes:
+    # Must match app.services.drink_spec.spec_key, which keeps writing these ids
+    canonical = "\x1f".join("0" if value is None else f"1{value}" for value in values)
+    return uuid.UUID(hashlib.md5(canonical.encode()).hexdigest()).bytes
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.create_table(
+        "drink_specs",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("drink_type_name", sa.String(100), nullable=False),
+        sa.Column("size_name", sa.String(50), nullable=False),
+        sa.Column("size_abbreviation", sa.String(10), nullable=False),
+        sa.Column("milk_option_name", sa.String(50), nullable=True),
+        sa.Column("sugar", sa.Integer(), nullable=False),
+        sa.Column("notes", sa.String(255), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.add_column("order_items", sa.Column("drink_spec_id", sa.Uuid(), nullable=True))
+
+    columns = ", ".join(SPEC_COLUMNS)
+    if bind.dialect.name == "postgresql":
+        parts = ", ".join(
+            f"CASE WHEN {c} IS NULL THEN '0' ELSE '1' || {c}::text END" for c in SPEC_COLUMNS
+        )
+        key = f"md5(concat_ws(chr(31), {parts}))::uuid"
+    else:
+        # Keys are stored as 16-byte BLOBs on SQLite since migration 009
+        bind.connection.dbapi_connection.create_function(
+            "drink_spec_key", len(SPEC_COLUMNS), _spec_key, deterministic=True
+        )
+        key = f"drink_spec_key({columns})"
+    op.execute(
+        f"INSERT INTO drink_specs (id, {columns}) "
+        f"SELECT {key}, {columns} FROM order_items GROUP BY {columns}"
+    )
+    op.execute(f"UPDATE order_items SET drink_spec_id = {key}")
+
+    if bind.dialect.name == "postgresql":
+        # order_items is partitioned (migration 004); these cascade to every partition
+        for column in SPEC_COLUMNS:
+            op.drop_column("order_items", column)
+        op.alter_column("order_items", "drink_spec_id", nullable=False)
+        op.create_foreign_key(
+            "fk_order_items_drink_spec_id", "order_items", "drink_specs", ["drink_spec_id"], ["id"]
+        )
+    else:
+        with op.batch_alter_table("order_items") as batch:
+            for column in SPEC_COLUMNS:
+                batch.drop_column(column)
+            batch.alter_column("drink_spec_id", existing_type=sa.Uuid(), nullable=False)
+            batch.create_foreign_key(
+                "fk_order_items_drink_spec_id", "drink_specs", ["drink_spec_id"], ["id"]
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    restored = [
+        sa.Column("drink_type_name", sa.String(100), nullable=True),
+        sa.Column("size_name", sa.String(50), nullable=True),
+        sa.Column("size_abbreviation", sa.String(10), nullable=True),
+        sa.Column("milk_option_name", sa.String(50), nullable=True),
+        sa.Column("sugar", sa.Integer(), nullable=True, server_default=sa.text("0")),
+        sa.Column("notes", sa.String(255), nullable=True),
+    ]
+    for column in restored:
+        op.add_column("order_items", column)
+
+    assignments = ", ".join(
+        f"{c} = (SELECT ds.{c} FROM drink_specs ds WHERE ds.id = order_items.drink_spec_id)"
+        for c in SPEC_COLUMNS
+    )
+    op.execute(f"UPDATE order_items SET {assignments}")
+
+    required = ["drink_type_name", "size_name", "size_abbreviation", "sugar"]
+    if bind.dialect.name == "postgresql":
+        for column in required:
+            op.alter_column("order_items", column, nullable=False)
+        op.drop_constraint("fk_order_items_drink_spec_id", "order_items", type_="foreignkey")
+        op.drop_column("order_items", "drink_spec_id")
+    else:
+        with op.batch_alter_table("order_items") as batch:
+            for column in restored:
+                if column.name in required:
+                    batch.alter_column(column.name, existing_type=column.type, nullable=False)
+            batch.drop_constraint("fk_order_items_drink_spec_id", type_="foreignkey")
+            batch.drop_column("drink_spec_id")
+    op.drop_table("drink_specs")
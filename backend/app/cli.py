@@ -0,0 +1,117 @@
+"""Maintenance commands.
+
+Usage (from backend/):
+    PYTHONPATH=. python -m app.cli purge-teams [--mode archive|delete] [--grace-days N]
+    PYTHONPATH=. python -m app.cli partitions [--months-ahead N] [--hot-months N]
+    PYTHONPATH=. python -m app.cli migrate [--check]
+"""
+
+import argparse
+import asyncio
+
+from app.database import engine
+
+
+async def _purge_teams(args: argparse.Namespace) -> None:
+    from app.services.purge import purge_inactive_teams
+
+    archive = None if args.mode is None else args.mode == "archive"
+    purged = await purge_inactive_teams(
+        chunk_size=args.chunk_size, archive=archive, grace_days=args.grace_days
+    )
+    print(f"Purged {purged} inactive team(s)")
+
+
+async def _partitions(args: argparse.Namespace) -> None:
+    from app.services.partitions import manage_order_partitions
+
+    report = await manage_order_partitions(
+        months_ahead=args.months_ahead, hot_months=args.hot_months
+    )
+    if not report:
+        print("Partition maintenance is already running in another process")
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+async def _current_revisions() -> set[str]:
+    from alembic.runtime.migration import MigrationContext
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.database import database_url
+
+    # Throwaway engine: this may run in the gunicorn master, which must not keep
+    # pooled connections around to be inherited by forked workers
+    check_engine = create_async_engine(database_url, poolclass=NullPool)
+    try:
+        async with check_engine.connect() as conn:
+            return set(
+                await conn.run_sync(lambda c: MigrationContext.configure(c).get_current_heads())
+            )
+    finally:
+        await check_engine.dispose()
+
+
+def migrate(check: bool = False, config_path: str = "alembic.ini") -> bool:
+    """Upgrade to head only when the database is behind; returns True if it was current.
+
+    Must be called without a running event loop (alembic's env.py starts its own).
+    """
+    from alembic import command
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(config_path)
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    current = asyncio.run(_current_revisions())
+    if current == heads:
+        print(f"Database schema is current ({', '.join(sorted(heads))})")
+        return True
+    if check:
+        print(f"Database schema is behind: {sorted(current) or 'empty'} -> {sorted(heads)}")
+        raise SystemExit(1)
+
+    print(f"Upgrading database schema: {sorted(current) or 'empty'} -> {sorted(heads)}")
+    command.upgrade(config, "head")
+    return False
+
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        await args.handler(args)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    purge = commands.add_parser("purge-teams", help="Move deleted teams out of the hot tables")
+    purge.add_argument("--mode", choices=["archive", "delete"], default=None)
+    purge.add_argument("--chunk-size", type=int, default=None)
+    purge.add_argument("--grace-days", type=int, default=None)
+    purge.set_defaults(handler=_purge_teams)
+
+    partitions = commands.add_parser(
+        "partitions", help="Create upcoming order partitions and retire cold ones"
+    )
+    partitions.add_argument("--months-ahead", type=int, default=None)
+    partitions.add_argument("--hot-months", type=int, default=None)
+    partitions.set_defaults(handler=_partitions)
+
+    migrate_cmd = commands.add_parser("migrate", help="Run alembic upgrade head if not current")
+    migrate_cmd.add_argument(
+        "--check", action="store_true", help="Exit 1 if behind instead of upgrading"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "migrate":
+        migrate(check=args.check)
+        return
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
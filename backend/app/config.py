@@ -3,15 +3,83 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./coffeerun.db"
+    # Optional read replica for GET handlers; reads stay on the primary for a while after
+    # a client's write, and while the replica fails to connect
+    read_database_url: str = ""
+    read_replica_sticky_seconds: int = 10
+    read_replica_timeout_seconds: float = 2.0
+    read_replica_retry_seconds: int = 30
     admin_email: str = "admin@example.com"
     resend_api_key: str = ""
     jwt_secret: str = "dev-secret-change-in-production"
     jwt_expiry_days: int = 7
+    jwt_cache_size: int = 4096  # verified-token LRU entries per worker; 0 disables
+    jwt_backend: str = "jose"  # "jose" or "pyjwt" (install PyJWT separately)
     magic_link_expiry_minutes: int = 15
+    # /auth/login token buckets: N requests per window, refilled continuously (0 disables)
+    login_rate_limit_per_email: int = 5
+    login_rate_limit_per_ip: int = 20
+    login_rate_limit_window_seconds: int = 900
+    login_coalesce_seconds: int = 30
+    rate_limit_backend: str = "memory"  # "memory" (per worker) or "redis" (shared)
+    redis_url: str = ""
     frontend_url: str = "http://localhost:5173"
     email_from: str = "CoffeeRun <noreply@example.com>"
     sentry_dsn: str = ""
     invite_expiry_days: int = 7
+    # Background purge of deleted teams (interval 0 = only via `python -m app.cli purge-teams`)
+    team_purge_interval_seconds: int = 0
+    team_purge_grace_days: int = 7
+    team_purge_chunk_size: int = 500
+    team_purge_mode: str = "archive"  # "archive" (copy to *_archive tables) or "delete"
+    # Hot/cold order history: months served by the API, monthly partitions created ahead
+    order_hot_months: int = 24
+    order_partition_months_ahead: int = 3
+    order_partition_interval_seconds: int = 0
+    # Response compression: gzip, or brotli when the brotli package is installed
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024  # bytes; smaller bodies are sent as-is
+    compression_content_types: str = "application/json,text/plain,text/html,text/css"
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_cache_size: int = 256  # compressed shared-order bodies kept per worker
+    # Lifespan warm-up: optional imports, pooled connections, hot query compilation
+    startup_warmup: bool = True
+    warmup_pool_connections: int = 2
+    # /api/ready: not ready while warming up, or when any of these checks fail
+    ready_db_timeout_seconds: float = 2.0
+    ready_max_loop_lag_seconds: float = 0.5
+    ready_check_migrations: bool = True  # schema must be at the migration head
+    # SQLAlchemy compiled-statement cache: entries per engine, and stats reporting
+    query_cache_size: int = 500
+    query_cache_log_interval_seconds: int = 0  # 0 disables the periodic hit-ratio log
+    diagnostics_enabled: bool = False  # exposes /api/diagnostics/* (per-worker internals)
+    # Prometheus /metrics (aggregated across gunicorn workers) and the per-worker sampler
+    # that copies pool and cache figures into it and measures event-loop lag
+    metrics_enabled: bool = False
+    metrics_sample_interval_seconds: float = 5.0
+    # Debug aid: log the loop thread's stack whenever the event loop is blocked this long
+    loop_watchdog_threshold_ms: int = 0  # 0 disables; try 100 in development
+    # In-place request profiling (pyinstrument) for requests sending X-Profile-Token, plus
+    # a sampled fraction of all requests; /api/profiles serves them as speedscope JSON
+    profiling_token: str = ""  # empty disables profiling entirely
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: float = 1.0
+    profiling_buffer_size: int = 20  # profiles kept (per worker without profiling_dir)
+    profiling_dir: str = ""  # shared by every worker; gunicorn.conf.py defaults it
+    # Idempotency-Key replay window for POST /orders, and how often expired keys are swept
+    idempotency_key_ttl_hours: int = 24
+    idempotency_sweep_interval_seconds: int = 3600  # 0 disables the sweeper
+    # Per-weekday attendance forecast, folded in from completed days of order history
+    presence_forecast_interval_seconds: int = 86400  # 0 disables the job
+    presence_min_days: int = 3  # weekdays observed before the forecast overrides usually_in
+    presence_threshold: float = 0.5  # probability at or above which a colleague is likely in
+    # Columnar analytics: order history copied incrementally to per-team Parquet files that
+    # the stats endpoints query with DuckDB (empty disables; needs the duckdb package)
+    analytics_dir: str = ""  # must be shared by every worker
+    analytics_export_interval_seconds: int = 300
+    analytics_export_lag_seconds: int = 60  # leave in-flight order transactions time to commit
+    analytics_export_chunk_hours: int = 24 * 7  # history exported per transaction
     environment: str = "development"
 
     model_config = {"env_file": ".env", "extra": "ignore"}
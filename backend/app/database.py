@@ -1,20 +1,69 @@
+import asyncio
+import logging
+import time
 from collections.abc import AsyncGenerator
 
+from fastapi import Depends, Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.services.query_cache import query_cache_stats
 
-# Convert sync database URL to async
-database_url = settings.database_url
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-elif database_url.startswith("sqlite:///"):
-    database_url = database_url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+logger = logging.getLogger(__name__)
 
-engine = create_async_engine(database_url, echo=settings.environment == "development")
+# Set for read_replica_sticky_seconds after a successful write (see
+# app.middleware.replica); while present, reads stay on the primary
+READ_PRIMARY_COOKIE = "read_primary"
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def to_async_url(url: str) -> str:
+    """Convert a sync database URL to its async driver."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    return url
+
+
+def _pool_options(url: str, label: str) -> dict:
+    """With metrics on, queue-pooled engines time how long checkouts wait."""
+    if not settings.metrics_enabled:
+        return {}
+    parsed = make_url(url)
+    if not issubclass(parsed.get_dialect().get_pool_class(parsed), AsyncAdaptedQueuePool):
+        return {}
+    from app.services.metrics import metered_pool_class
+
+    return {"poolclass": metered_pool_class(label)}
+
+
+database_url = to_async_url(settings.database_url)
+
+engine = create_async_engine(
+    database_url,
+    echo=settings.environment == "development",
+    query_cache_size=settings.query_cache_size,
+    **_pool_options(database_url, "primary"),
+)
+query_cache_stats.attach(engine.sync_engine)
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+read_engine = (
+    create_async_engine(
+        to_async_url(settings.read_database_url),
+        echo=settings.environment == "development",
+        query_cache_size=settings.query_cache_size,
+        **_pool_options(to_async_url(settings.read_database_url), "replica"),
+    )
+    if settings.read_database_url
+    else None
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
@@ -24,3 +73,71 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+class ReadReplica:
+    """Hands out replica sessions to read-only requests.
+
+    A request stays on the primary when it is not a GET/HEAD, when it carries the
+    read-your-writes cookie, or while the replica is marked unavailable: a replica that
+    fails to connect within ``read_replica_timeout_seconds`` is skipped for
+    ``read_replica_retry_seconds`` before it is tried again.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None) -> None:
+        self.session_factory = session_factory
+        self.unavailable_until = 0.0
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def configure(self, session_factory: async_sessionmaker[AsyncSession] | None) -> None:
+        self.session_factory = session_factory
+        self.unavailable_until = 0.0
+
+    async def open_session(self, request: Request) -> AsyncSession | None:
+        """A connected replica session for ``request``, or None to use the primary."""
+        if (
+            self.session_factory is None
+            or request.method not in READ_METHODS
+            or READ_PRIMARY_COOKIE in request.cookies
+            or time.monotonic() < self.unavailable_until
+        ):
+            self.primary_reads += 1
+            return None
+        session = self.session_factory()
+        try:
+            await asyncio.wait_for(session.connection(), settings.read_replica_timeout_seconds)
+        except (DBAPIError, OSError, asyncio.TimeoutError):
+            await session.close()
+            self.unavailable_until = time.monotonic() + settings.read_replica_retry_seconds
+            self.primary_reads += 1
+            logger.warning(
+                "Read replica unavailable; using the primary for %ss",
+                settings.read_replica_retry_seconds,
+                exc_info=True,
+            )
+            return None
+        self.replica_reads += 1
+        return session
+
+
+read_replica = ReadReplica(
+    async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+
+
+async def get_read_db(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only handlers: the replica when one is configured and usable.
+
+    Falls back to the request's primary session, which only connects if it is used.
+    """
+    session = await read_replica.open_session(request)
+    if session is None:
+        yield db
+        return
+    async with session:
+        yield session
@@ -2,9 +2,39 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
-from app.routers import auth, coffee_options, colleagues, menu, orders, shared_orders, stats, teams
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.replica import ReadYourWritesMiddleware
+from app.routers import (
+    analytics,
+    auth,
+    coffee_options,
+    colleagues,
+    diagnostics,
+    menu,
+    metrics,
+    order_templates,
+    orders,
+    profiles,
+    shared_orders,
+    stats,
+    teams,
+)
+from app.services.analytics import export_orders
+from app.services.background import start_periodic_job, stop_periodic_jobs
+from app.services.idempotency import purge_expired_idempotency_keys
+from app.services.loop_watchdog import loop_watchdog
+from app.services.metrics import LoopLagProbe
+from app.services.partitions import manage_order_partitions
+from app.services.presence import update_presence_forecast
+from app.services.purge import purge_inactive_teams
+from app.services.query_cache import log_query_cache_stats
+from app.services.readiness import check_readiness
+from app.services.warmup import warm_up, warmup_status
 
 
 @asynccontextmanager
@@ -14,14 +44,81 @@ async def lifespan(app: FastAPI):
     # if settings.sentry_dsn:
     #     import sentry_sdk
     #     sentry_sdk.init(dsn=settings.sentry_dsn, environment=settings.environment)
+    if settings.startup_warmup:
+        await warm_up()
+    else:
+        warmup_status.done = True
+    if settings.loop_watchdog_threshold_ms > 0:
+        loop_watchdog.start()
+
+    background_jobs = []
+    if settings.team_purge_interval_seconds > 0:
+        background_jobs.append(
+            start_periodic_job(
+                "purge_inactive_teams",
+                settings.team_purge_interval_seconds,
+                purge_inactive_teams,
+            )
+        )
+    if settings.order_partition_interval_seconds > 0:
+        background_jobs.append(
+            start_periodic_job(
+                "manage_order_partitions",
+                settings.order_partition_interval_seconds,
+                manage_order_partitions,
+            )
+        )
+    if settings.idempotency_sweep_interval_seconds > 0:
+        background_jobs.append(
+            start_periodic_job(
+                "purge_expired_idempotency_keys",
+                settings.idempotency_sweep_interval_seconds,
+                purge_expired_idempotency_keys,
+            )
+        )
+    if settings.presence_forecast_interval_seconds > 0:
+        background_jobs.append(
+            start_periodic_job(
+                "update_presence_forecast",
+                settings.presence_forecast_interval_seconds,
+                update_presence_forecast,
+            )
+        )
+    if settings.query_cache_log_interval_seconds > 0:
+        background_jobs.append(
+            start_periodic_job(
+                "log_query_cache_stats",
+                settings.query_cache_log_interval_seconds,
+                log_query_cache_stats,
+            )
+        )
+    if settings.analytics_dir and settings.analytics_export_interval_seconds > 0:
+        background_jobs.append(
+            start_periodic_job(
+                "export_analytics",
+                settings.analytics_export_interval_seconds,
+                export_orders,
+            )
+        )
+    if settings.metrics_enabled and settings.metrics_sample_interval_seconds > 0:
+        background_jobs.append(
+            start_periodic_job(
+                "sample_metrics",
+                settings.metrics_sample_interval_seconds,
+                LoopLagProbe(settings.metrics_sample_interval_seconds),
+            )
+        )
     yield
     # Shutdown
+    await stop_periodic_jobs(background_jobs)
+    await loop_watchdog.stop()
 
 
 app = FastAPI(
     title="CoffeeRun API",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -34,8 +131,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+if settings.read_database_url:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.profiling_token:
+    app.add_middleware(ProfilingMiddleware)
+
+# Added last so it is outermost and times the whole middleware stack
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Mount routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(teams.router, prefix="/api/v1")
@@ -46,9 +157,31 @@ app.include_router(colleagues.router, prefix="/api/v1/teams/{team_id}")
 app.include_router(coffee_options.router, prefix="/api/v1/teams/{team_id}")
 app.include_router(menu.router, prefix="/api/v1/teams/{team_id}")
 app.include_router(orders.router, prefix="/api/v1/teams/{team_id}")
+app.include_router(order_templates.router, prefix="/api/v1/teams/{team_id}")
 app.include_router(stats.router, prefix="/api/v1/teams/{team_id}")
+if settings.analytics_dir:
+    app.include_router(analytics.router, prefix="/api/v1/teams/{team_id}")
+
+if settings.diagnostics_enabled:
+    app.include_router(diagnostics.router, prefix="/api")
+
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
+
+if settings.profiling_token:
+    app.include_router(profiles.router, prefix="/api")
 
 
 @app.get("/api/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/api/ready")
+async def ready():
+    """Whether this worker should receive traffic; 503 while warming up or degraded."""
+    readiness = await check_readiness()
+    return ORJSONResponse(
+        {"status": readiness.status, "checks": readiness.checks},
+        status_code=200 if readiness.ready else 503,
+    )
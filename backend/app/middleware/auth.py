@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Callable
 
 from fastapi import Depends, HTTPException, Request
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -26,7 +26,8 @@ class TeamMember:
     role: TeamRole
 
 
-async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> CurrentUser:
+async def get_current_user_id(request: Request) -> uuid.UUID:
+    """Validate the session cookie without touching the database."""
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
@@ -35,8 +36,28 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    user_id = uuid.UUID(payload["sub"])
-    result = await db.execute(select(User).where(User.id == user_id))
+    return uuid.UUID(payload["sub"])
+
+
+def _user_query(user_id: uuid.UUID):
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def _membership_query(team_id: uuid.UUID, user_id: uuid.UUID):
+    """Membership check run by every team-scoped request; compiled once, params bound."""
+    return lambda_stmt(
+        lambda: select(TeamMembership).where(
+            TeamMembership.team_id == team_id,
+            TeamMembership.user_id == user_id,
+        )
+    )
+
+
+async def get_current_user(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+) -> CurrentUser:
+    result = await db.execute(_user_query(user_id))
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
@@ -58,12 +79,7 @@ async def get_team_member(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid team_id format")
 
-    result = await db.execute(
-        select(TeamMembership).where(
-            TeamMembership.team_id == team_uuid,
-            TeamMembership.user_id == current_user.id,
-        )
-    )
+    result = await db.execute(_membership_query(team_uuid, current_user.id))
     membership = result.scalar_one_or_none()
     if not membership:
         raise HTTPException(status_code=403, detail="Not a member of this team")
@@ -0,0 +1,176 @@
+"""Response compression (gzip, or brotli when the ``brotli`` package is installed).
+
+Only complete, single-message responses are compressed: the body must be at least
+``compression_minimum_size`` bytes, its content type must be in the allowlist and it must
+not already carry a Content-Encoding. Routes opt out with ``@skip_compression``; routes
+whose payload is served repeatedly opt into ``@cache_compression``, which keeps the
+compressed bytes in an LRU keyed by a hash of the uncompressed body.
+"""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+_SKIP_ATTR = "_skip_compression"
+_CACHE_ATTR = "_cache_compression"
+
+
+def skip_compression(endpoint: Callable) -> Callable:
+    """Never compress this route's responses."""
+    setattr(endpoint, _SKIP_ATTR, True)
+    return endpoint
+
+
+def cache_compression(endpoint: Callable) -> Callable:
+    """Reuse the compressed body when this route returns the same payload again."""
+    setattr(endpoint, _CACHE_ATTR, True)
+    return endpoint
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick ``br`` or ``gzip`` from an Accept-Encoding header (q=0 means refused)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding)
+    if "br" in accepted and _brotli() is not None:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return _brotli().compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+class CompressionCache:
+    """Bounded LRU of compressed bodies keyed by (encoding, body digest)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_or_compress(self, body: bytes, encoding: str) -> bytes:
+        if self.maxsize <= 0:
+            return compress(body, encoding)
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        cached = self._data.get(key)
+        if cached is not None:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        compressed = compress(body, encoding)
+        self._data[key] = compressed
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return compressed
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+
+compression_cache = CompressionCache(settings.compression_cache_size)
+
+
+def _allowed_content_types() -> set[str]:
+    return {t.strip() for t in settings.compression_content_types.split(",") if t.strip()}
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, cache: CompressionCache = compression_cache):
+        self.app = app
+        self.cache = cache
+        self.content_types = _allowed_content_types()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if (
+                start is None
+                or message.get("more_body", False)
+                or not self._should_compress(scope, start, body)
+            ):
+                # Streaming or ineligible: forward untouched from here on
+                passthrough = True
+                if start is not None:
+                    await send(start)
+                await send(message)
+                return
+
+            endpoint = scope.get("endpoint")
+            if getattr(endpoint, _CACHE_ATTR, False):
+                compressed = self.cache.get_or_compress(body, encoding)
+            else:
+                compressed = compress(body, encoding)
+
+            headers = MutableHeaders(scope=start)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, scope: Scope, start: Message, body: bytes) -> bool:
+        if len(body) < settings.compression_minimum_size:
+            return False
+        if getattr(scope.get("endpoint"), _SKIP_ATTR, False):
+            return False
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.content_types
@@ -0,0 +1,87 @@
+"""Profile individual requests in place with pyinstrument's statistical profiler.
+
+A request is profiled when it carries ``X-Profile-Token`` matching ``PROFILING_TOKEN``
+(the response then names the profile in ``X-Profile-Id``), or at random with probability
+``profiling_sample_rate``. The profiler runs in async mode, so time a handler spends
+awaiting is attributed to the await rather than to whatever else the loop ran meanwhile.
+The middleware is only installed when ``PROFILING_TOKEN`` is set; pyinstrument is not
+even imported otherwise.
+"""
+
+import random
+import secrets
+import time
+from datetime import datetime, timezone
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.services.profiling import (
+    PROFILE_ID_HEADER,
+    PROFILE_TOKEN_HEADER,
+    ProfileStore,
+    RequestProfile,
+    profile_store,
+    token_matches,
+)
+
+# Fetching a profile should not record (and evict) another one
+_EXCLUDED_PREFIX = "/api/profiles"
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store) -> None:
+        from pyinstrument import Profiler
+
+        self.app = app
+        self.store = store
+        self._profiler_class = Profiler
+
+    def _trigger(self, scope: Scope) -> str | None:
+        if scope["path"].startswith(_EXCLUDED_PREFIX):
+            return None
+        if token_matches(Headers(scope=scope).get(PROFILE_TOKEN_HEADER)):
+            return "header"
+        if settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = secrets.token_hex(8)
+        status = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if trigger == "header":
+                    MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        profiler = self._profiler_class(
+            interval=settings.profiling_interval_ms / 1000, async_mode="enabled"
+        )
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session = profiler.stop()
+            await self.store.save(
+                RequestProfile(
+                    id=profile_id,
+                    method=scope["method"],
+                    path=scope["path"],
+                    status=status,
+                    duration_ms=round((time.perf_counter() - start) * 1000, 1),
+                    trigger=trigger,
+                    created_at=datetime.now(timezone.utc),
+                    session=session,
+                )
+            )
@@ -0,0 +1,37 @@
+"""Read-your-writes stickiness for the read replica.
+
+A replica applies the primary's writes with some lag, so a client that has just changed
+something and immediately reads it back could be served the old row. After every
+successful non-GET request this middleware sets a short-lived cookie, and
+``app.database.get_read_db`` keeps that client's reads on the primary until it expires.
+The cookie carries no data; its Max-Age is the sticky window, so every worker honours it.
+"""
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database import READ_METHODS, READ_PRIMARY_COOKIE
+
+
+def read_primary_cookie(max_age: int) -> str:
+    # Same attributes as the access_token cookie, so it reaches the API cross-site
+    return f"{READ_PRIMARY_COOKIE}=1; Max-Age={max_age}; Path=/; HttpOnly; SameSite=none; Secure"
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.cookie = read_primary_cookie(settings.read_replica_sticky_seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in READ_METHODS | {"OPTIONS"}:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -3,7 +3,14 @@ from app.models.team import Team, TeamMembership, TeamInvite
 from app.models.colleague import Colleague
 from app.models.coffee_option import CoffeeOption
 from app.models.menu import DrinkType, Size, MilkOption
+from app.models.drink_spec import DrinkSpec
 from app.models.order import Order, OrderItem
+from app.models.archive import OrderArchive, OrderItemArchive
+from app.models.idempotency import IdempotencyKey
+from app.models.order_template import OrderTemplate, OrderTemplateItem
+from app.models.presence import ColleaguePresence
+from app.models.watermark import JobWatermark
+from app.models.drink_frequency import DrinkFrequency
 
 __all__ = [
     "User",
@@ -16,6 +23,15 @@ __all__ = [
     "DrinkType",
     "Size",
     "MilkOption",
+    "DrinkSpec",
     "Order",
     "OrderItem",
+    "OrderArchive",
+    "OrderItemArchive",
+    "IdempotencyKey",
+    "OrderTemplate",
+    "OrderTemplateItem",
+    "ColleaguePresence",
+    "JobWatermark",
+    "DrinkFrequency",
 ]
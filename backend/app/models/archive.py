@@ -0,0 +1,41 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+# Cold copies of orders/order_items. No foreign keys, so archived history never pins
+# colleague, coffee option or menu rows in the hot tables.
+class OrderArchive(Base):
+    __tablename__ = "orders_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    team_id: Mapped[uuid.UUID] = mapped_column(nullable=False, index=True)
+    share_token: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_by: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class OrderItemArchive(Base):
+    __tablename__ = "order_items_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    order_id: Mapped[uuid.UUID] = mapped_column(nullable=False, index=True)
+    colleague_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    # Snapshot of the colleague's name, since the colleague row may be purged
+    colleague_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    coffee_option_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    drink_type_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    size_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    size_abbreviation: Mapped[str] = mapped_column(String(10), nullable=False)
+    milk_option_name: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    sugar: Mapped[int] = mapped_column(Integer, default=0)
+    notes: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
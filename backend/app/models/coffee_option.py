@@ -5,13 +5,14 @@ from typing import Optional
 from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.models.ids import uuid7
 from app.models.user import Base
 
 
 class CoffeeOption(Base):
     __tablename__ = "coffee_options"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     colleague_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("colleagues.id"), nullable=False)
     drink_type_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("drink_types.id"), nullable=False)
     size_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("sizes.id"), nullable=False)
@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+# Running order counts per colleague, coffee option and weekday, kept up to date in the
+# same transaction as every order write by app/services/drink_frequency.py.
+# weekday follows Python's date.weekday(): Monday is 0.
+class DrinkFrequency(Base):
+    __tablename__ = "drink_frequencies"
+    __table_args__ = (Index("ix_drink_frequencies_team", "team_id"),)
+
+    colleague_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("colleagues.id", ondelete="CASCADE"), primary_key=True
+    )
+    coffee_option_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("coffee_options.id", ondelete="CASCADE"), primary_key=True
+    )
+    weekday: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    team_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("teams.id"), nullable=False)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_ordered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+# Immutable, append-only dictionary of the drink details an order item snapshots. The
+# id is a hash of the content (app/services/drink_spec.py), so identical drinks share
+# one row across every order and team, and a row is never updated or deleted.
+class DrinkSpec(Base):
+    __tablename__ = "drink_specs"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    drink_type_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    size_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    size_abbreviation: Mapped[str] = mapped_column(String(10), nullable=False)
+    milk_option_name: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    sugar: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    notes: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,17 +1,28 @@
 import uuid
 from datetime import datetime
-from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.models.ids import uuid7
 from app.models.user import Base
 
 
+# On PostgreSQL migration 004 range-partitions orders and order_items by month on
+# created_at, and Postgres only enforces uniqueness that includes the partition key.
+# There the primary keys are (id, created_at), share_token is unique per created_at
+# (tokens are 384 random bits, so reuse is not a practical concern) and
+# order_items.order_id has no foreign key. These models describe the unpartitioned SQLite shape; alembic/env.py
+# leaves the differences out of autogenerate on PostgreSQL.
+PARTITIONED_TABLES = ("orders", "order_items")
+
+
 class Order(Base):
     __tablename__ = "orders"
+    # Also created by migration 004 on PostgreSQL and 009 on SQLite
+    __table_args__ = (Index("ix_orders_team_id_created_at", "team_id", "created_at"),)
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     team_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("teams.id"), nullable=False)
     share_token: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
     created_by: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -23,20 +34,18 @@ class Order(Base):
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (Index("ix_order_items_order_id", "order_id"),)
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     order_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("orders.id"), nullable=False)
     colleague_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("colleagues.id"), nullable=False)
     coffee_option_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("coffee_options.id"), nullable=False
     )
-    drink_type_name: Mapped[str] = mapped_column(String(100), nullable=False)
-    size_name: Mapped[str] = mapped_column(String(50), nullable=False)
-    size_abbreviation: Mapped[str] = mapped_column(String(10), nullable=False)
-    milk_option_name: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    sugar: Mapped[int] = mapped_column(Integer, default=0)
-    notes: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # Snapshot of the drink details at order time, shared with identical items
+    drink_spec_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("drink_specs.id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     order: Mapped["Order"] = relationship(back_populates="items")
     colleague: Mapped["Colleague"] = relationship(lazy="selectin")
+    spec: Mapped["DrinkSpec"] = relationship(lazy="joined", innerjoin=True)
@@ -0,0 +1,41 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.ids import uuid7
+from app.models.user import Base
+
+
+class OrderTemplate(Base):
+    __tablename__ = "order_templates"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
+    team_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("teams.id"), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    created_by: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    items: Mapped[list["OrderTemplateItem"]] = relationship(
+        back_populates="template", lazy="selectin", cascade="all, delete-orphan"
+    )
+
+
+# Only ids are stored: drink details are read from the coffee option when the template
+# is used, so edits to a colleague's option carry over. Deleting an option removes it.
+class OrderTemplateItem(Base):
+    __tablename__ = "order_template_items"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
+    template_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("order_templates.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    colleague_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("colleagues.id", ondelete="CASCADE"), nullable=False
+    )
+    coffee_option_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("coffee_options.id", ondelete="CASCADE"), nullable=False
+    )
+
+    template: Mapped["OrderTemplate"] = relationship(back_populates="items")
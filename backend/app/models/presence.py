@@ -0,0 +1,23 @@
+import uuid
+
+from sqlalchemy import ForeignKey, Index, Integer, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.user import Base
+
+
+# Running per-weekday attendance counts, maintained by app/services/presence.py.
+# weekday follows Python's date.weekday(): Monday is 0.
+class ColleaguePresence(Base):
+    __tablename__ = "colleague_presence"
+    __table_args__ = (Index("ix_colleague_presence_team_weekday", "team_id", "weekday"),)
+
+    colleague_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("colleagues.id", ondelete="CASCADE"), primary_key=True
+    )
+    weekday: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    team_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("teams.id"), nullable=False)
+    # Days on this weekday the team ordered since the colleague was added...
+    days_observed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # ...and how many of those orders included them
+    days_present: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
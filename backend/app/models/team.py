@@ -6,6 +6,7 @@ from typing import Optional
 from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.models.ids import uuid7
 from app.models.user import Base
 
 
@@ -18,10 +19,12 @@ class TeamRole(str, enum.Enum):
 class Team(Base):
     __tablename__ = "teams"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     created_by: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Set once the purge job has moved this (inactive) team's data out of the hot tables
+    purged_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -37,7 +40,7 @@ class TeamMembership(Base):
     __tablename__ = "team_memberships"
     __table_args__ = (UniqueConstraint("team_id", "user_id", name="uq_team_user"),)
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     team_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("teams.id"), nullable=False)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     role: Mapped[TeamRole] = mapped_column(Enum(TeamRole), nullable=False)
@@ -50,7 +53,7 @@ class TeamMembership(Base):
 class TeamInvite(Base):
     __tablename__ = "team_invites"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     team_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("teams.id"), nullable=False)
     email: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[TeamRole] = mapped_column(Enum(TeamRole), nullable=False)
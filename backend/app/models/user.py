@@ -2,33 +2,37 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from app.models.ids import CompactUUID, uuid7
+
 
 class Base(DeclarativeBase):
-    pass
+    type_annotation_map = {uuid.UUID: CompactUUID}
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     display_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    # Bumped whenever the user's visible team list changes; drives the /auth/me ETag
+    membership_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     magic_link_tokens: Mapped[list["MagicLinkToken"]] = relationship(back_populates="user")
-    team_memberships: Mapped[list["TeamMembership"]] = relationship(lazy="selectin")
+    team_memberships: Mapped[list["TeamMembership"]] = relationship()
 
 
 class MagicLinkToken(Base):
     __tablename__ = "magic_link_tokens"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     token_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
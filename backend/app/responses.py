@@ -0,0 +1,36 @@
+"""JSON response helpers.
+
+``ORJSONResponse`` is the app-wide default response class. Hot read endpoints go one step
+further: they build their response models once and serialize them straight to JSON bytes
+with a TypeAdapter compiled at import time, which skips FastAPI's second validation pass
+of the returned value and ``jsonable_encoder``. The route's ``response_model`` still
+drives the OpenAPI schema.
+"""
+
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class JSONSerializer:
+    """Pre-compiled serializer for one response type."""
+
+    def __init__(self, type_: Any):
+        self.adapter = TypeAdapter(type_)
+
+    def dump(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
+
+    def response(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        return Response(
+            content=self.dump(content),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+        )
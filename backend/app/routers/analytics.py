@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.middleware.auth import TeamMember, require_role
+from app.models.team import TeamRole
+from app.responses import JSONSerializer
+from app.schemas.order import CohortRetention, DrinkMixPoint, TrendPoint
+from app.services import analytics
+from app.services.analytics import AnalyticsStore
+
+# Mounted only when ANALYTICS_DIR is set; answered from the columnar store alone
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+trends_json = JSONSerializer(list[TrendPoint])
+drink_mix_json = JSONSerializer(list[DrinkMixPoint])
+retention_json = JSONSerializer(list[CohortRetention])
+
+
+def _store() -> AnalyticsStore:
+    store = analytics.serving_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Analytics are still being prepared")
+    return store
+
+
+@router.get("/trends", response_model=list[TrendPoint])
+async def stats_trends(
+    weeks: int = Query(12, ge=1, le=520),
+    team_member: TeamMember = Depends(require_role(TeamRole.owner, TeamRole.manager)),
+):
+    return trends_json.response(await analytics.trends(_store(), team_member.team_id, weeks))
+
+
+@router.get("/drink-mix", response_model=list[DrinkMixPoint])
+async def stats_drink_mix(
+    weeks: int = Query(12, ge=1, le=520),
+    team_member: TeamMember = Depends(require_role(TeamRole.owner, TeamRole.manager)),
+):
+    return drink_mix_json.response(await analytics.drink_mix(_store(), team_member.team_id, weeks))
+
+
+@router.get("/retention", response_model=list[CohortRetention])
+async def stats_retention(
+    months: int = Query(6, ge=1, le=120),
+    team_member: TeamMember = Depends(require_role(TeamRole.owner, TeamRole.manager)),
+):
+    return retention_json.response(await analytics.retention(_store(), team_member.team_id, months))
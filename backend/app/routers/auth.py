@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy import select
+import math
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import settings
 from app.database import get_db
-from app.middleware.auth import CurrentUser, get_current_user
+from app.middleware.auth import get_current_user_id
+from app.middleware.compression import skip_compression
 from app.models.team import Team, TeamMembership
 from app.models.user import User
+from app.responses import JSONSerializer
 from app.schemas.auth import (
     LoginRequest,
     MessageResponse,
@@ -21,19 +27,54 @@ from app.services.auth import (
     verify_magic_token,
 )
 from app.services.email import send_magic_link_email
+from app.services.rate_limit import RequestCoalescer, check_rate_limit
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+user_json = JSONSerializer(UserResponse)
+
+
+# Duplicate logins for one email within the window share a single token and email
+login_coalescer = RequestCoalescer(settings.login_coalesce_seconds)
+
+
+async def _enforce_login_rate_limit(key: str, capacity: int) -> None:
+    retry_after = await check_rate_limit(
+        f"login:{key}", capacity, settings.login_rate_limit_window_seconds
+    )
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts. Please try again later.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
 
 @router.post("/login", response_model=MessageResponse)
-async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
-    user = await get_or_create_user(db, request.email)
-    raw_token = await create_magic_link_token(db, user)
-    await send_magic_link_email(request.email, raw_token)
+async def login(
+    request: LoginRequest,
+    http_request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    client_ip = http_request.client.host if http_request.client else "unknown"
+    await _enforce_login_rate_limit(f"ip:{client_ip}", settings.login_rate_limit_per_ip)
+
+    email = request.email.lower()
+
+    async def _send_login_link() -> None:
+        await _enforce_login_rate_limit(f"email:{email}", settings.login_rate_limit_per_email)
+        user = await get_or_create_user(db, email)
+        raw_token = await create_magic_link_token(db, user)
+        await send_magic_link_email(request.email, raw_token)
+
+    await login_coalescer.run(email, _send_login_link)
     return MessageResponse(message="Check your email for a login link.")
 
 
+# Account responses carry personal data next to the session cookie; keep them out of
+# compression so they can't be used as a BREACH-style oracle
 @router.post("/verify", response_model=UserResponse)
+@skip_compression
 async def verify(request: VerifyRequest, response: Response, db: AsyncSession = Depends(get_db)):
     user = await verify_magic_token(db, request.token)
     if not user:
@@ -68,23 +109,67 @@ async def logout(response: Response):
 
 
 @router.get("/me", response_model=UserResponse)
+@skip_compression
 async def me(
-    current_user: CurrentUser = Depends(get_current_user),
+    request: Request,
+    user_id: uuid.UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    # Fetch full user for display_name and created_at
-    result = await db.execute(select(User).where(User.id == current_user.id))
-    user = result.scalar_one_or_none()
+    # One projection query: user columns outer-joined to active team memberships
+    result = await db.execute(
+        select(
+            User.email,
+            User.display_name,
+            User.created_at,
+            User.membership_version,
+            TeamMembership.team_id,
+            TeamMembership.role,
+            Team.name,
+        )
+        .outerjoin(TeamMembership, TeamMembership.user_id == User.id)
+        .outerjoin(
+            Team,
+            and_(
+                Team.id == TeamMembership.team_id,
+                Team.is_active == True,  # noqa: E712
+            ),
+        )
+        .where(User.id == user_id)
+    )
+    rows = result.all()
+    if not rows:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    email, display_name, created_at, membership_version = rows[0][:4]
+    etag = _me_etag(user_id, membership_version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in _parse_if_none_match(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    return user_json.response(
+        UserResponse(
+            id=user_id,
+            email=email,
+            display_name=display_name,
+            teams=[
+                UserTeamMembership(team_id=team_id, team_name=team_name, role=role.value)
+                for *_, team_id, role, team_name in rows
+                if team_name is not None
+            ],
+            created_at=created_at,
+        ),
+        headers=headers,
+    )
 
-    teams = await _get_user_teams(db, current_user.id)
 
-    return UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        display_name=user.display_name if user else None,
-        teams=teams,
-        created_at=user.created_at if user else None,
-    )
+def _me_etag(user_id: uuid.UUID, membership_version: int) -> str:
+    return f'W/"{user_id.hex}-{membership_version}"'
+
+
+def _parse_if_none_match(header: str | None) -> list[str]:
+    if not header:
+        return []
+    return [tag.strip() for tag in header.split(",")]
 
 
 async def _get_user_teams(db: AsyncSession, user_id) -> list[UserTeamMembership]:
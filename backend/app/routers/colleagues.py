@@ -1,24 +1,35 @@
 import uuid
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.middleware.auth import TeamMember, get_team_member, require_role
-from app.models.colleague import Colleague
+from app.models.colleague import Colleague, ColleagueType
 from app.models.coffee_option import CoffeeOption
+from app.models.presence import ColleaguePresence
 from app.models.team import TeamRole
+from app.responses import JSONSerializer
 from app.schemas.colleague import (
     CoffeeOptionCreate,
     CoffeeOptionResponse,
     ColleagueCreate,
     ColleagueResponse,
     ColleagueUpdate,
+    DrinkPrediction,
+    PresenceForecast,
+    UsualDrinks,
 )
+from app.services.drink_frequency import usual_drinks_query
+from app.services.projections import ColleagueRow, colleague_rows
 
 router = APIRouter(prefix="/colleagues", tags=["colleagues"])
 
+colleague_list_json = JSONSerializer(list[ColleagueRow])
+
 
 def _coffee_option_to_response(opt: CoffeeOption) -> CoffeeOptionResponse:
     return CoffeeOptionResponse(
@@ -60,16 +71,96 @@ async def list_colleagues(
     db: AsyncSession = Depends(get_db),
     team_member: TeamMember = Depends(get_team_member),
 ):
-    query = select(Colleague).where(
-        Colleague.team_id == team_member.team_id,
-        Colleague.is_active == True,  # noqa: E712
-    )
-    if colleague_type is not None:
-        query = query.where(Colleague.colleague_type == colleague_type)
-    query = query.order_by(Colleague.display_order, Colleague.name)
-    result = await db.execute(query)
-    colleagues = result.scalars().all()
-    return [_colleague_to_response(c) for c in colleagues]
+    rows = await colleague_rows(db, team_member.team_id, colleague_type)
+    return colleague_list_json.response(rows)
+
+
+@router.get("/presence-forecast", response_model=list[PresenceForecast])
+async def presence_forecast(
+    weekday: int | None = Query(None, description="0 = Monday; defaults to today (UTC)"),
+    db: AsyncSession = Depends(get_db),
+    team_member: TeamMember = Depends(get_team_member),
+):
+    if weekday is None:
+        weekday = datetime.now(timezone.utc).weekday()
+    elif not 0 <= weekday <= 6:
+        raise HTTPException(status_code=400, detail="weekday must be between 0 and 6")
+
+    rows = (
+        await db.execute(
+            select(
+                Colleague.id,
+                Colleague.usually_in,
+                ColleaguePresence.days_observed,
+                ColleaguePresence.days_present,
+            )
+            .outerjoin(
+                ColleaguePresence,
+                and_(
+                    ColleaguePresence.colleague_id == Colleague.id,
+                    ColleaguePresence.weekday == weekday,
+                ),
+            )
+            .where(
+                Colleague.team_id == team_member.team_id,
+                Colleague.is_active == True,  # noqa: E712
+                Colleague.colleague_type == ColleagueType.colleague,
+            )
+            .order_by(Colleague.display_order, Colleague.name)
+        )
+    ).all()
+
+    forecasts = []
+    for colleague_id, usually_in, observed, present in rows:
+        observed = observed or 0
+        probability = present / observed if observed else None
+        # Too little history to trust: keep the manually set usually_in flag
+        if observed < settings.presence_min_days:
+            likely_in = usually_in
+        else:
+            likely_in = probability >= settings.presence_threshold
+        forecasts.append(
+            PresenceForecast(
+                colleague_id=colleague_id,
+                weekday=weekday,
+                days_observed=observed,
+                probability=round(probability, 3) if probability is not None else None,
+                likely_in=likely_in,
+            )
+        )
+    return forecasts
+
+
+@router.get("/usual-drinks", response_model=list[UsualDrinks])
+async def usual_drinks(
+    weekday: int | None = Query(None, description="0 = Monday; defaults to today (UTC)"),
+    top: int = Query(1, description="Predicted options per colleague"),
+    db: AsyncSession = Depends(get_db),
+    team_member: TeamMember = Depends(get_team_member),
+):
+    if weekday is None:
+        weekday = datetime.now(timezone.utc).weekday()
+    elif not 0 <= weekday <= 6:
+        raise HTTPException(status_code=400, detail="weekday must be between 0 and 6")
+    if not 1 <= top <= 10:
+        raise HTTPException(status_code=400, detail="top must be between 1 and 10")
+
+    rows = (await db.execute(usual_drinks_query(team_member.team_id, weekday, top))).all()
+    by_colleague: dict[uuid.UUID, UsualDrinks] = {}
+    for row in rows:
+        usual = by_colleague.get(row.colleague_id)
+        if usual is None:
+            usual = by_colleague[row.colleague_id] = UsualDrinks(
+                colleague_id=row.colleague_id, weekday=weekday, predictions=[]
+            )
+        usual.predictions.append(
+            DrinkPrediction(
+                coffee_option_id=row.coffee_option_id,
+                weekday_count=row.weekday_count,
+                total_count=row.total_count,
+            )
+        )
+    return list(by_colleague.values())
 
 
 @router.post("", response_model=ColleagueResponse, status_code=201)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.services.loop_watchdog import loop_watchdog
+from app.services.query_cache import query_cache_stats
+
+# Mounted only when DIAGNOSTICS_ENABLED is set; every figure is for the worker that answers
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/query-cache")
+async def query_cache():
+    return query_cache_stats.snapshot()
+
+
+@router.get("/loop-stalls")
+async def loop_stalls():
+    """Recent event-loop stalls caught by LOOP_WATCHDOG_THRESHOLD_MS, with stacks."""
+    return loop_watchdog.snapshot()
@@ -1,10 +1,10 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import TeamMember, get_team_member, require_role
 from app.models.menu import DrinkType, MilkOption, Size
 from app.models.team import TeamRole
@@ -23,20 +23,24 @@ from app.schemas.menu import (
 router = APIRouter(prefix="/menu", tags=["menu"])
 
 
+def _active_items_query(model: type[DrinkType | Size | MilkOption], team_id: uuid.UUID):
+    """Active menu items in display order; one cached statement per model."""
+    return lambda_stmt(
+        lambda: (
+            select(model)
+            .where(model.team_id == team_id, model.is_active == True)  # noqa: E712
+            .order_by(model.display_order, model.name)
+        )
+    )
+
+
 # --- Drink Types ---
 @router.get("/drink-types", response_model=list[DrinkTypeResponse])
 async def list_drink_types(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     team_member: TeamMember = Depends(get_team_member),
 ):
-    result = await db.execute(
-        select(DrinkType)
-        .where(
-            DrinkType.team_id == team_member.team_id,
-            DrinkType.is_active == True,  # noqa: E712
-        )
-        .order_by(DrinkType.display_order, DrinkType.name)
-    )
+    result = await db.execute(_active_items_query(DrinkType, team_member.team_id))
     return result.scalars().all()
 
 
@@ -99,17 +103,10 @@ async def delete_drink_type(
 # --- Sizes ---
 @router.get("/sizes", response_model=list[SizeResponse])
 async def list_sizes(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     team_member: TeamMember = Depends(get_team_member),
 ):
-    result = await db.execute(
-        select(Size)
-        .where(
-            Size.team_id == team_member.team_id,
-            Size.is_active == True,  # noqa: E712
-        )
-        .order_by(Size.display_order, Size.name)
-    )
+    result = await db.execute(_active_items_query(Size, team_member.team_id))
     return result.scalars().all()
 
 
@@ -172,17 +169,10 @@ async def delete_size(
 # --- Milk Options ---
 @router.get("/milk-options", response_model=list[MilkOptionResponse])
 async def list_milk_options(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     team_member: TeamMember = Depends(get_team_member),
 ):
-    result = await db.execute(
-        select(MilkOption)
-        .where(
-            MilkOption.team_id == team_member.team_id,
-            MilkOption.is_active == True,  # noqa: E712
-        )
-        .order_by(MilkOption.display_order, MilkOption.name)
-    )
+    result = await db.execute(_active_items_query(MilkOption, team_member.team_id))
     return result.scalars().all()
 
 
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+
+from app.middleware.compression import skip_compression
+from app.services.metrics import render_metrics
+
+# Mounted only when METRICS_ENABLED is set; keep it off the public proxy
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+@skip_compression
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
@@ -0,0 +1,99 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.middleware.auth import TeamMember, get_team_member
+from app.models.coffee_option import CoffeeOption
+from app.models.colleague import Colleague
+from app.models.order_template import OrderTemplate, OrderTemplateItem
+from app.schemas.order_template import OrderTemplateCreate, OrderTemplateResponse
+
+router = APIRouter(prefix="/order-templates", tags=["order templates"])
+
+
+@router.get("", response_model=list[OrderTemplateResponse])
+async def list_order_templates(
+    db: AsyncSession = Depends(get_db),
+    team_member: TeamMember = Depends(get_team_member),
+):
+    result = await db.execute(
+        select(OrderTemplate)
+        .where(OrderTemplate.team_id == team_member.team_id)
+        .order_by(OrderTemplate.name)
+    )
+    return result.scalars().all()
+
+
+@router.post("", response_model=OrderTemplateResponse, status_code=201)
+async def create_order_template(
+    data: OrderTemplateCreate,
+    db: AsyncSession = Depends(get_db),
+    team_member: TeamMember = Depends(get_team_member),
+):
+    name = data.name.strip()
+    if not name:
+        raise HTTPException(status_code=400, detail="Template name is required")
+    if not data.items:
+        raise HTTPException(status_code=400, detail="Template needs at least one item")
+
+    # Validate once here so using the template later needs no per-item checks
+    pairs = {(item.colleague_id, item.coffee_option_id) for item in data.items}
+    valid = set(
+        (
+            await db.execute(
+                select(CoffeeOption.colleague_id, CoffeeOption.id)
+                .join(Colleague, Colleague.id == CoffeeOption.colleague_id)
+                .where(
+                    Colleague.team_id == team_member.team_id,
+                    Colleague.is_active == True,  # noqa: E712
+                    CoffeeOption.id.in_([option_id for _, option_id in pairs]),
+                )
+            )
+        ).all()
+    )
+    invalid = pairs - valid
+    if invalid:
+        colleague_id, option_id = sorted(invalid)[0]
+        raise HTTPException(
+            status_code=400,
+            detail=f"Coffee option {option_id} does not belong to colleague {colleague_id}",
+        )
+
+    template = OrderTemplate(
+        team_id=team_member.team_id,
+        name=name,
+        created_by=team_member.id,
+        items=[
+            OrderTemplateItem(
+                colleague_id=item.colleague_id, coffee_option_id=item.coffee_option_id
+            )
+            for item in data.items
+        ],
+    )
+    db.add(template)
+    await db.flush()
+    await db.refresh(template)
+    return template
+
+
+@router.delete("/{template_id}")
+async def delete_order_template(
+    template_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    team_member: TeamMember = Depends(get_team_member),
+):
+    result = await db.execute(
+        select(OrderTemplate).where(
+            OrderTemplate.id == template_id,
+            OrderTemplate.team_id == team_member.team_id,
+        )
+    )
+    template = result.scalar_one_or_none()
+    if not template:
+        raise HTTPException(status_code=404, detail="Order template not found")
+    await db.delete(template)
+    await db.flush()
+    return {"message": "Order template deleted"}
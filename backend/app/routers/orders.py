@@ -1,16 +1,19 @@
 import secrets
 import uuid
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.auth import TeamMember, get_team_member
 from app.models.colleague import Colleague
 from app.models.coffee_option import CoffeeOption
+from app.models.idempotency import IdempotencyKey
 from app.models.order import Order, OrderItem
+from app.models.order_template import OrderTemplate
 from app.schemas.order import (
     OrderCreate,
     OrderItemResponse,
@@ -18,19 +21,65 @@ from app.schemas.order import (
     OrderResponse,
     OrderUpdateRequest,
 )
+from app.responses import JSONSerializer
+from app.services.drink_frequency import record_order_items
+from app.services.drink_spec import SPEC_FIELDS, ensure_specs, spec_for_option
+from app.services.idempotency import replay_or_claim, request_fingerprint, store_response
+from app.services.order_template import (
+    clone_items_into_order,
+    last_order_id,
+    order_items,
+    template_items,
+)
 from app.services.order import consolidate_order_items
+from app.services.projections import OrderRow, order_row
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+order_json = JSONSerializer(OrderResponse)
+order_list_json = JSONSerializer(list[OrderListResponse])
+order_row_json = JSONSerializer(OrderRow)
+
 
 def _order_query():
-    """Base query for loading an order with all nested relationships."""
-    return select(Order).options(
-        selectinload(Order.items).selectinload(OrderItem.colleague),
-        selectinload(Order.creator),
+    """Base query for loading an order with all nested relationships.
+
+    A lambda statement: the select and its loader options are built once and cached
+    by code location. Extend it with ``+ (lambda s: s.where(...))``; values closed over
+    by those lambdas become bound parameters, so the compiled SQL is reused.
+    """
+    return lambda_stmt(
+        lambda: select(Order).options(
+            selectinload(Order.items).selectinload(OrderItem.colleague),
+            selectinload(Order.creator),
+        )
     )
 
 
+async def _claim_idempotency_key(
+    request: Request,
+    idempotency_key: str | None,
+    payload: object,
+    db: AsyncSession,
+    team_member: TeamMember,
+) -> Response | IdempotencyKey | None:
+    """Stored response to replay, the claimed key, or None when no key was sent."""
+    if idempotency_key is None:
+        return None
+    fingerprint = request_fingerprint("POST", request.url.path, payload)
+    return await replay_or_claim(db, team_member.id, idempotency_key, fingerprint)
+
+
+async def _created_order_response(
+    db: AsyncSession, order_id: uuid.UUID, claimed_key: IdempotencyKey | None
+) -> Response:
+    result = await db.execute(_order_query() + (lambda s: s.where(Order.id == order_id)))
+    body = order_json.dump(await _build_order_response(result.scalar_one()))
+    if claimed_key is not None:
+        store_response(claimed_key, 201, body)
+    return Response(content=body, status_code=201, media_type="application/json")
+
+
 async def _build_order_response(order: Order) -> OrderResponse:
     items_data = []
     item_responses = []
@@ -41,25 +90,16 @@ async def _build_order_response(order: Order) -> OrderResponse:
             colleague_id=item.colleague_id,
             colleague_name=item.colleague.name if item.colleague else None,
             coffee_option_id=item.coffee_option_id,
-            drink_type_name=item.drink_type_name,
-            size_name=item.size_name,
-            size_abbreviation=item.size_abbreviation,
-            milk_option_name=item.milk_option_name,
-            sugar=item.sugar,
-            notes=item.notes,
+            drink_type_name=item.spec.drink_type_name,
+            size_name=item.spec.size_name,
+            size_abbreviation=item.spec.size_abbreviation,
+            milk_option_name=item.spec.milk_option_name,
+            sugar=item.spec.sugar,
+            notes=item.spec.notes,
             created_at=item.created_at,
         )
         item_responses.append(resp)
-        items_data.append(
-            {
-                "drink_type_name": item.drink_type_name,
-                "size_name": item.size_name,
-                "size_abbreviation": item.size_abbreviation,
-                "milk_option_name": item.milk_option_name,
-                "sugar": item.sugar,
-                "notes": item.notes,
-            }
-        )
+        items_data.append({field: getattr(item.spec, field) for field in SPEC_FIELDS})
 
     consolidated = consolidate_order_items(items_data)
     return OrderResponse(
@@ -75,9 +115,18 @@ async def _build_order_response(order: Order) -> OrderResponse:
 @router.post("", response_model=OrderResponse, status_code=201)
 async def create_order(
     data: OrderCreate,
+    request: Request,
+    idempotency_key: str | None = Header(None, min_length=1, max_length=255),
     db: AsyncSession = Depends(get_db),
     team_member: TeamMember = Depends(get_team_member),
 ):
+    # A retry after a dropped connection must not create a second order
+    claimed_key = await _claim_idempotency_key(
+        request, idempotency_key, data.model_dump(mode="json"), db, team_member
+    )
+    if isinstance(claimed_key, Response):
+        return claimed_key
+
     order = Order(
         team_id=team_member.team_id,
         share_token=secrets.token_urlsafe(48),
@@ -86,6 +135,7 @@ async def create_order(
     db.add(order)
     await db.flush()
 
+    specs, new_items = [], []
     for item_data in data.items:
         # Verify colleague belongs to team
         colleague_result = await db.execute(
@@ -111,41 +161,96 @@ async def create_order(
                 detail=f"Coffee option {item_data.coffee_option_id} not found",
             )
 
-        order_item = OrderItem(
-            order_id=order.id,
-            colleague_id=item_data.colleague_id,
-            coffee_option_id=item_data.coffee_option_id,
-            drink_type_name=coffee_opt.drink_type.name,
-            size_name=coffee_opt.size.name,
-            size_abbreviation=coffee_opt.size.abbreviation,
-            milk_option_name=coffee_opt.milk_option.name if coffee_opt.milk_option else None,
-            sugar=coffee_opt.sugar,
-            notes=coffee_opt.notes,
+        spec = spec_for_option(coffee_opt)
+        specs.append(spec)
+        new_items.append(
+            OrderItem(
+                order_id=order.id,
+                colleague_id=item_data.colleague_id,
+                coffee_option_id=item_data.coffee_option_id,
+                drink_spec_id=spec["id"],
+            )
         )
-        db.add(order_item)
 
+    # Specs first: the items reference them
+    await ensure_specs(db, specs)
+    db.add_all(new_items)
     await db.flush()
+    await record_order_items(db, order.id, team_member.team_id, datetime.now(timezone.utc))
 
     # Re-query with eager loading to avoid lazy-load issues in async
-    result = await db.execute(_order_query().where(Order.id == order.id))
-    order = result.scalar_one()
-    return await _build_order_response(order)
+    return await _created_order_response(db, order.id, claimed_key)
+
+
+@router.post("/from-template/{template_id}", response_model=OrderResponse, status_code=201)
+async def create_order_from_template(
+    template_id: str,
+    request: Request,
+    idempotency_key: str | None = Header(None, min_length=1, max_length=255),
+    db: AsyncSession = Depends(get_db),
+    team_member: TeamMember = Depends(get_team_member),
+):
+    """Create an order from a saved template, or from the team's last order with ``last``.
+
+    Items whose colleague has been deactivated or whose coffee option has been deleted
+    are skipped; drink details come from the current coffee options.
+    """
+    if template_id == "last":
+        previous_order_id = await last_order_id(db, team_member.team_id)
+        if previous_order_id is None:
+            raise HTTPException(status_code=404, detail="No previous order to repeat")
+        source = order_items(previous_order_id)
+    else:
+        try:
+            template_uuid = uuid.UUID(template_id)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Order template not found")
+        template_exists = await db.scalar(
+            select(OrderTemplate.id).where(
+                OrderTemplate.id == template_uuid,
+                OrderTemplate.team_id == team_member.team_id,
+            )
+        )
+        if not template_exists:
+            raise HTTPException(status_code=404, detail="Order template not found")
+        source = template_items(template_uuid)
+
+    claimed_key = await _claim_idempotency_key(request, idempotency_key, {}, db, team_member)
+    if isinstance(claimed_key, Response):
+        return claimed_key
+
+    order = Order(
+        team_id=team_member.team_id,
+        share_token=secrets.token_urlsafe(48),
+        created_by=team_member.id,
+    )
+    db.add(order)
+    await db.flush()
+
+    if await clone_items_into_order(db, order.id, team_member.team_id, source) == 0:
+        raise HTTPException(status_code=400, detail="No active items to order")
+    await record_order_items(db, order.id, team_member.team_id, datetime.now(timezone.utc))
+    return await _created_order_response(db, order.id, claimed_key)
 
 
 @router.get("", response_model=list[OrderListResponse])
 async def list_orders(
     skip: int = 0,
     limit: int = 20,
-    db: AsyncSession = Depends(get_db),
+    created_after: datetime | None = Query(None, description="Only orders at or after this"),
+    created_before: datetime | None = Query(None, description="Only orders before this"),
+    db: AsyncSession = Depends(get_read_db),
     team_member: TeamMember = Depends(get_team_member),
 ):
-    result = await db.execute(
-        _order_query()
-        .where(Order.team_id == team_member.team_id)
-        .order_by(Order.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
+    # Date bounds on the partition key let PostgreSQL skip whole monthly partitions
+    team_id = team_member.team_id
+    query = _order_query() + (lambda s: s.where(Order.team_id == team_id))
+    if created_after is not None:
+        query += lambda s: s.where(Order.created_at >= created_after)
+    if created_before is not None:
+        query += lambda s: s.where(Order.created_at < created_before)
+    query += lambda s: s.order_by(Order.created_at.desc()).offset(skip).limit(limit)
+    result = await db.execute(query)
     orders = result.scalars().all()
     responses = []
     for order in orders:
@@ -157,25 +262,19 @@ async def list_orders(
                 item_count=len(order.items),
             )
         )
-    return responses
+    return order_list_json.response(responses)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     team_member: TeamMember = Depends(get_team_member),
 ):
-    result = await db.execute(
-        _order_query().where(
-            Order.id == order_id,
-            Order.team_id == team_member.team_id,
-        )
-    )
-    order = result.scalar_one_or_none()
-    if not order:
+    order = await order_row(db, order_id, team_member.team_id)
+    if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
-    return await _build_order_response(order)
+    return order_row_json.response(order)
 
 
 @router.put("/{order_id}", response_model=OrderResponse)
@@ -196,8 +295,10 @@ async def update_order(
         raise HTTPException(status_code=404, detail="Order not found")
 
     oid = order.id  # save before expiring
+    ordered_at = order.created_at
 
-    # Delete existing items
+    # Delete existing items, taking them out of the usual-drink counts first
+    await record_order_items(db, oid, team_member.team_id, ordered_at, delta=-1)
     items_result = await db.execute(select(OrderItem).where(OrderItem.order_id == oid))
     for item in items_result.scalars().all():
         await db.delete(item)
@@ -205,6 +306,7 @@ async def update_order(
     db.expire(order)
 
     # Add new items
+    specs, new_items = [], []
     for item_data in data.items:
         result = await db.execute(
             select(CoffeeOption).where(CoffeeOption.id == item_data.coffee_option_id)
@@ -216,21 +318,22 @@ async def update_order(
                 detail=f"Coffee option {item_data.coffee_option_id} not found",
             )
 
-        order_item = OrderItem(
-            order_id=oid,
-            colleague_id=item_data.colleague_id,
-            coffee_option_id=item_data.coffee_option_id,
-            drink_type_name=coffee_opt.drink_type.name,
-            size_name=coffee_opt.size.name,
-            size_abbreviation=coffee_opt.size.abbreviation,
-            milk_option_name=coffee_opt.milk_option.name if coffee_opt.milk_option else None,
-            sugar=coffee_opt.sugar,
-            notes=coffee_opt.notes,
+        spec = spec_for_option(coffee_opt)
+        specs.append(spec)
+        new_items.append(
+            OrderItem(
+                order_id=oid,
+                colleague_id=item_data.colleague_id,
+                coffee_option_id=item_data.coffee_option_id,
+                drink_spec_id=spec["id"],
+            )
         )
-        db.add(order_item)
 
+    await ensure_specs(db, specs)
+    db.add_all(new_items)
     await db.flush()
+    await record_order_items(db, oid, team_member.team_id, ordered_at)
 
-    result = await db.execute(_order_query().where(Order.id == oid))
+    result = await db.execute(_order_query() + (lambda s: s.where(Order.id == oid)))
     order = result.scalar_one()
     return await _build_order_response(order)
@@ -0,0 +1,38 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from app.services.profiling import profile_store, token_matches
+
+
+async def require_profiling_token(x_profile_token: str | None = Header(default=None)) -> None:
+    if not token_matches(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+# Mounted only when PROFILING_TOKEN is set; without PROFILING_DIR every profile is for the
+# worker that answers
+router = APIRouter(
+    prefix="/profiles",
+    tags=["profiling"],
+    dependencies=[Depends(require_profiling_token)],
+)
+
+
+@router.get("")
+async def list_profiles():
+    return profile_store.summaries()
+
+
+@router.get("/{profile_id}")
+async def get_profile(profile_id: str):
+    """The profile as speedscope JSON, ready to open at https://www.speedscope.app."""
+    profile = await asyncio.to_thread(profile_store.get, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    body = await asyncio.to_thread(profile.speedscope)
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'},
+    )
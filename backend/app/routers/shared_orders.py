@@ -1,18 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
+from app.middleware.compression import cache_compression
 from app.models.order import Order
-from app.routers.orders import _build_order_response, _order_query
+from app.routers.orders import _build_order_response, _order_query, order_json
 from app.schemas.order import OrderResponse
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
+def _shared_order_query(share_token: str):
+    return _order_query() + (lambda s: s.where(Order.share_token == share_token))
+
+
+# The same order is fetched by everyone at the table; reuse its compressed body
 @router.get("/share/{share_token}", response_model=OrderResponse)
-async def get_shared_order(share_token: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(_order_query().where(Order.share_token == share_token))
+@cache_compression
+async def get_shared_order(share_token: str, db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(_shared_order_query(share_token))
     order = result.scalar_one_or_none()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return await _build_order_response(order)
+    return order_json.response(await _build_order_response(order))
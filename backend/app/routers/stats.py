@@ -4,15 +4,22 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
 from app.middleware.auth import TeamMember, require_role
 from app.models.colleague import Colleague
+from app.models.drink_spec import DrinkSpec
 from app.models.order import Order, OrderItem
 from app.models.team import TeamRole
+from app.responses import JSONSerializer
 from app.schemas.order import ColleagueStat, DrinkStat, StatsOverview
+from app.services import analytics
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
+overview_json = JSONSerializer(StatsOverview)
+drink_stats_json = JSONSerializer(list[DrinkStat])
+colleague_stats_json = JSONSerializer(list[ColleagueStat])
+
 
 def _get_date_filter(days: int | None):
     if days is None:
@@ -23,9 +30,12 @@ def _get_date_filter(days: int | None):
 @router.get("/overview", response_model=StatsOverview)
 async def stats_overview(
     days: int | None = Query(None, description="Filter to last N days"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     team_member: TeamMember = Depends(require_role(TeamRole.owner, TeamRole.manager)),
 ):
+    if store := analytics.serving_store():
+        return overview_json.response(await analytics.overview(store, team_member.team_id, days))
+
     date_from = _get_date_filter(days)
     base_query = select(Order).where(Order.team_id == team_member.team_id)
     if date_from:
@@ -40,7 +50,10 @@ async def stats_overview(
         select(func.count(OrderItem.id)).join(Order).where(Order.team_id == team_member.team_id)
     )
     if date_from:
-        items_query = items_query.where(Order.created_at >= date_from)
+        # Bound both sides of the join so PostgreSQL prunes order_items partitions too
+        items_query = items_query.where(
+            Order.created_at >= date_from, OrderItem.created_at >= date_from
+        )
     result = await db.execute(items_query)
     total_coffees = result.scalar() or 0
 
@@ -81,12 +94,14 @@ async def stats_overview(
     day_names = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
     busiest_day = day_names[int(row[0])] if row else None
 
-    return StatsOverview(
-        total_orders=total_orders,
-        total_coffees=total_coffees,
-        busiest_day=busiest_day,
-        orders_this_week=orders_this_week,
-        orders_this_month=orders_this_month,
+    return overview_json.response(
+        StatsOverview(
+            total_orders=total_orders,
+            total_coffees=total_coffees,
+            busiest_day=busiest_day,
+            orders_this_week=orders_this_week,
+            orders_this_month=orders_this_month,
+        )
     )
 
 
@@ -94,32 +109,50 @@ async def stats_overview(
 async def stats_drinks(
     days: int | None = Query(None),
     limit: int = Query(10),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     team_member: TeamMember = Depends(require_role(TeamRole.owner, TeamRole.manager)),
 ):
-    query = (
-        select(
-            OrderItem.drink_type_name,
-            func.count().label("cnt"),
+    if store := analytics.serving_store():
+        return drink_stats_json.response(
+            await analytics.drinks(store, team_member.team_id, days, limit)
         )
+
+    # Count by the compact spec key first, then resolve and merge names per spec
+    per_spec = (
+        select(OrderItem.drink_spec_id, func.count().label("cnt"))
         .join(Order)
         .where(Order.team_id == team_member.team_id)
     )
     if days:
         date_from = _get_date_filter(days)
-        query = query.where(Order.created_at >= date_from)
-    query = query.group_by(OrderItem.drink_type_name).order_by(func.count().desc()).limit(limit)
+        per_spec = per_spec.where(Order.created_at >= date_from, OrderItem.created_at >= date_from)
+    per_spec = per_spec.group_by(OrderItem.drink_spec_id).subquery()
+    total = func.sum(per_spec.c.cnt)
+    query = (
+        select(DrinkSpec.drink_type_name, total)
+        .join(per_spec, per_spec.c.drink_spec_id == DrinkSpec.id)
+        .group_by(DrinkSpec.drink_type_name)
+        .order_by(total.desc())
+        .limit(limit)
+    )
 
     result = await db.execute(query)
-    return [DrinkStat(drink_name=row[0], count=row[1]) for row in result.all()]
+    return drink_stats_json.response(
+        [DrinkStat(drink_name=row[0], count=row[1]) for row in result.all()]
+    )
 
 
 @router.get("/colleagues", response_model=list[ColleagueStat])
 async def stats_colleagues(
     days: int | None = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     team_member: TeamMember = Depends(require_role(TeamRole.owner, TeamRole.manager)),
 ):
+    if store := analytics.serving_store():
+        return colleague_stats_json.response(
+            await analytics.colleagues(store, team_member.team_id, days)
+        )
+
     # Count orders per colleague
     query = (
         select(
@@ -136,7 +169,7 @@ async def stats_colleagues(
 
     if days:
         date_from = _get_date_filter(days)
-        query = query.where(Order.created_at >= date_from)
+        query = query.where(Order.created_at >= date_from, OrderItem.created_at >= date_from)
 
     query = query.group_by(Colleague.name).order_by(func.count(OrderItem.id).desc())
     result = await db.execute(query)
@@ -146,14 +179,16 @@ async def stats_colleagues(
     for name, count in colleague_counts:
         # Get favourite drink for each colleague
         fav_query = (
-            select(OrderItem.drink_type_name, func.count().label("cnt"))
+            select(DrinkSpec.drink_type_name, func.count().label("cnt"))
+            .select_from(OrderItem)
+            .join(DrinkSpec, OrderItem.drink_spec_id == DrinkSpec.id)
             .join(Colleague, OrderItem.colleague_id == Colleague.id)
             .join(Order, OrderItem.order_id == Order.id)
             .where(
                 Colleague.name == name,
                 Order.team_id == team_member.team_id,
             )
-            .group_by(OrderItem.drink_type_name)
+            .group_by(DrinkSpec.drink_type_name)
             .order_by(func.count().desc())
             .limit(1)
         )
@@ -168,4 +203,4 @@ async def stats_colleagues(
             )
         )
 
-    return stats
+    return colleague_stats_json.response(stats)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -28,11 +28,20 @@ from app.schemas.team import (
     TeamResponse,
     TeamUpdate,
 )
+from app.responses import JSONSerializer
 from app.services.email import send_team_invite_email
-from app.services.team import generate_invite_token, seed_team_menu, verify_invite_token
+from app.services.projections import MemberRow, member_rows
+from app.services.team import (
+    bump_membership_version,
+    generate_invite_token,
+    seed_team_menu,
+    verify_invite_token,
+)
 
 router = APIRouter(tags=["teams"])
 
+member_list_json = JSONSerializer(list[MemberRow])
+
 
 # ---------------------------------------------------------------------------
 # Team CRUD
@@ -54,6 +63,7 @@ async def create_team(
     await db.flush()
 
     await seed_team_menu(db, team.id)
+    await bump_membership_version(db, user_ids=[current_user.id])
 
     return TeamResponse(
         id=team.id,
@@ -141,6 +151,7 @@ async def update_team(
 
     if body.name is not None:
         team.name = body.name
+        await bump_membership_version(db, team_id=team_id)
     await db.flush()
 
     count_result = await db.execute(select(func.count()).where(TeamMembership.team_id == team_id))
@@ -168,6 +179,7 @@ async def delete_team(
         raise HTTPException(status_code=404, detail="Team not found")
 
     team.is_active = False
+    await bump_membership_version(db, team_id=team_id)
     await db.flush()
     return {"message": "Team deleted"}
 
@@ -183,28 +195,7 @@ async def list_members(
     team_member: TeamMember = Depends(get_team_member),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(TeamMembership)
-        .where(TeamMembership.team_id == team_id)
-        .options(selectinload(TeamMembership.user))
-    )
-    memberships = result.scalars().all()
-
-    # Sort: owner first, then manager, then member; within same role by email
-    role_order = {TeamRole.owner: 0, TeamRole.manager: 1, TeamRole.member: 2}
-    memberships = sorted(memberships, key=lambda m: (role_order.get(m.role, 3), m.user.email))
-
-    return [
-        TeamMemberResponse(
-            id=m.id,
-            user_id=m.user_id,
-            email=m.user.email,
-            display_name=m.user.display_name,
-            role=m.role.value,
-            created_at=m.created_at,
-        )
-        for m in memberships
-    ]
+    return member_list_json.response(await member_rows(db, team_id))
 
 
 @router.put("/teams/{team_id}/members/{user_id}", response_model=TeamMemberResponse)
@@ -263,8 +254,10 @@ async def update_member_role(
         current_owner = current_owner_result.scalar_one_or_none()
         if current_owner:
             current_owner.role = TeamRole.manager
+            await bump_membership_version(db, user_ids=[current_owner.user_id])
 
     target.role = new_role
+    await bump_membership_version(db, user_ids=[user_id])
     await db.flush()
     await db.refresh(target)
 
@@ -307,6 +300,14 @@ async def remove_member(
         raise HTTPException(status_code=403, detail="Managers cannot remove other Managers")
 
     await db.delete(target)
+    # Unlink the departing user's colleague profiles in one statement
+    await db.execute(
+        update(Colleague)
+        .where(Colleague.team_id == team_id, Colleague.user_id == user_id)
+        .values(user_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    await bump_membership_version(db, user_ids=[user_id])
     await db.flush()
     return {"message": "Member removed"}
 
@@ -549,6 +550,7 @@ async def accept_invite(
             colleague.user_id = current_user.id
 
     invite.accepted = True
+    await bump_membership_version(db, user_ids=[current_user.id])
     await db.flush()
 
     # Get team name for response
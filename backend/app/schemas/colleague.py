@@ -70,3 +70,23 @@ class ColleagueResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class PresenceForecast(BaseModel):
+    colleague_id: uuid.UUID
+    weekday: int
+    days_observed: int
+    probability: float | None = None
+    likely_in: bool
+
+
+class DrinkPrediction(BaseModel):
+    coffee_option_id: uuid.UUID
+    weekday_count: int
+    total_count: int
+
+
+class UsualDrinks(BaseModel):
+    colleague_id: uuid.UUID
+    weekday: int
+    predictions: list[DrinkPrediction]
@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel
 
@@ -82,3 +82,22 @@ class ColleagueStat(BaseModel):
     colleague_name: str
     order_count: int
     favourite_drink: str | None
+
+
+class TrendPoint(BaseModel):
+    week_start: date  # Monday
+    orders: int
+    coffees: int
+
+
+class DrinkMixPoint(BaseModel):
+    week_start: date
+    drink_name: str
+    count: int
+    share: float  # of that week's coffees
+
+
+class CohortRetention(BaseModel):
+    cohort: date  # first day of the month of each colleague's first coffee
+    colleagues: int
+    retention: list[float]  # share still ordering 0, 1, 2... months later
@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.order import OrderItemCreate
+
+
+class OrderTemplateCreate(BaseModel):
+    name: str
+    items: list[OrderItemCreate]
+
+
+class OrderTemplateItemResponse(BaseModel):
+    colleague_id: uuid.UUID
+    coffee_option_id: uuid.UUID
+
+    model_config = {"from_attributes": True}
+
+
+class OrderTemplateResponse(BaseModel):
+    id: uuid.UUID
+    name: str
+    created_by: uuid.UUID
+    created_at: datetime
+    items: list[OrderTemplateItemResponse] = []
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,170 @@
+"""Gunicorn settings derived from the container's CPU and memory limits.
+
+Read by ``gunicorn.conf.py``. Every derived value can be pinned with an environment
+variable:
+
+    WEB_CONCURRENCY                 worker processes (default: from CPUs and memory)
+    GUNICORN_MAX_WORKERS            upper bound for the derived worker count (8)
+    GUNICORN_WORKER_MEMORY_MB       expected RSS per worker, used for the memory bound (160)
+    GUNICORN_BIND                   listen address (0.0.0.0:8000)
+    GUNICORN_KEEPALIVE              idle keep-alive seconds; keep above Caddy's 2m (130)
+    GUNICORN_TIMEOUT                seconds before a silent worker is killed (30)
+    GUNICORN_GRACEFUL_TIMEOUT       seconds a recycled worker gets to finish requests (30)
+    GUNICORN_MAX_REQUESTS           recycle a worker after this many requests, 0 = never (2000)
+    GUNICORN_MAX_REQUESTS_JITTER    random extra requests so workers don't recycle together
+    GUNICORN_PRELOAD                import the app once in the master before forking (true)
+    FORWARDED_ALLOW_IPS             proxy IPs/CIDRs whose X-Forwarded-For is trusted (localhost)
+    SERVER_FAST_LOOP                uvloop + httptools when installed (true), else asyncio + h11
+    RUN_MIGRATIONS                  upgrade the schema in the master if behind head (true)
+"""
+
+import math
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+FAST_WORKER = "uvicorn.workers.UvicornWorker"  # loop/http "auto": uvloop + httptools if present
+PURE_PYTHON_WORKER = "uvicorn.workers.UvicornH11Worker"  # asyncio + h11
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    bind: str
+    workers: int
+    worker_class: str
+    keepalive: int
+    timeout: int
+    graceful_timeout: int
+    max_requests: int
+    max_requests_jitter: int
+    preload_app: bool
+    forwarded_allow_ips: str
+    run_migrations: bool
+    cpus: float
+    memory_mb: int | None
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def available_cpus() -> float:
+    """CPUs this process may use: cgroup quota if set, else the affinity mask."""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+
+    quota = _read("/sys/fs/cgroup/cpu.max")  # cgroup v2: "<quota> <period>" or "max <period>"
+    if quota:
+        limit, _, period = quota.partition(" ")
+        if limit != "max" and period:
+            cpus = min(cpus, int(limit) / int(period))
+    else:
+        limit, period = (
+            _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us"),
+            _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us"),
+        )
+        if limit and period and int(limit) > 0:
+            cpus = min(cpus, int(limit) / int(period))
+    return cpus
+
+
+def available_memory_mb() -> int | None:
+    """Memory limit in MiB: cgroup limit if set, else MemTotal; None if unknown."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        value = _read(path)
+        # Unlimited cgroups report "max" or a huge sentinel close to 2**63
+        if value and value != "max" and int(value) < 2**60:
+            return int(value) // (1024 * 1024)
+
+    meminfo = _read("/proc/meminfo")
+    if meminfo:
+        for line in meminfo.splitlines():
+            if line.startswith("MemTotal:"):
+                return int(line.split()[1]) // 1024
+    return None
+
+
+def _int(env: Mapping[str, str], name: str, default: int) -> int:
+    value = env.get(name, "").strip()
+    return int(value) if value else default
+
+
+def _bool(env: Mapping[str, str], name: str, default: bool) -> bool:
+    value = env.get(name, "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes", "on")
+
+
+def default_workers(cpus: float, memory_mb: int | None, worker_memory_mb: int, cap: int) -> int:
+    """One async worker per CPU, bounded by how many fit in memory (half kept as headroom)."""
+    workers = max(1, math.ceil(cpus))
+    if memory_mb is not None:
+        workers = min(workers, max(1, memory_mb // 2 // worker_memory_mb))
+    return max(1, min(workers, cap))
+
+
+def build_server_config(
+    env: Mapping[str, str] | None = None,
+    cpus: float | None = None,
+    memory_mb: int | None = None,
+) -> ServerConfig:
+    env = os.environ if env is None else env
+    cpus = available_cpus() if cpus is None else cpus
+    memory_mb = available_memory_mb() if memory_mb is None else memory_mb
+
+    max_requests = _int(env, "GUNICORN_MAX_REQUESTS", 2000)
+    return ServerConfig(
+        bind=env.get("GUNICORN_BIND", "0.0.0.0:8000"),
+        workers=_int(
+            env,
+            "WEB_CONCURRENCY",
+            default_workers(
+                cpus,
+                memory_mb,
+                _int(env, "GUNICORN_WORKER_MEMORY_MB", 160),
+                _int(env, "GUNICORN_MAX_WORKERS", 8),
+            ),
+        ),
+        worker_class=(FAST_WORKER if _bool(env, "SERVER_FAST_LOOP", True) else PURE_PYTHON_WORKER),
+        keepalive=_int(env, "GUNICORN_KEEPALIVE", 130),
+        timeout=_int(env, "GUNICORN_TIMEOUT", 30),
+        graceful_timeout=_int(env, "GUNICORN_GRACEFUL_TIMEOUT", 30),
+        max_requests=max_requests,
+        max_requests_jitter=_int(env, "GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10),
+        preload_app=_bool(env, "GUNICORN_PRELOAD", True),
+        # The client address behind Caddy; per-IP login limits depend on it
+        forwarded_allow_ips=env.get("FORWARDED_ALLOW_IPS", "").strip() or "127.0.0.1,::1",
+        run_migrations=_bool(env, "RUN_MIGRATIONS", True),
+        cpus=cpus,
+        memory_mb=memory_mb,
+    )
+
+
+def _installed(module: str) -> bool:
+    import importlib.util
+
+    return importlib.util.find_spec(module) is not None
+
+
+def startup_report(config: ServerConfig) -> str:
+    fast = config.worker_class == FAST_WORKER
+    loop = "uvloop" if fast and _installed("uvloop") else "asyncio"
+    http = "httptools" if fast and _installed("httptools") else "h11"
+    memory = f"{config.memory_mb} MiB" if config.memory_mb is not None else "unknown"
+    lines = [
+        f"cpus={config.cpus:g} memory={memory}",
+        f"workers={config.workers} worker_class={config.worker_class} loop={loop} http={http}",
+        f"keepalive={config.keepalive}s timeout={config.timeout}s "
+        f"graceful_timeout={config.graceful_timeout}s",
+        f"max_requests={config.max_requests} (+jitter {config.max_requests_jitter}) "
+        f"preload_app={config.preload_app} bind={config.bind}",
+        f"forwarded_allow_ips={config.forwarded_allow_ips}",
+    ]
+    return "Server config: " + "; ".join(lines)
@@ -0,0 +1,522 @@
+"""Columnar copy of order history for the stats endpoints.
+
+The stats aggregations scan every order a team has placed. When they run against the
+OLTP tables they compete with order writes at peak. With ``ANALYTICS_DIR`` set, a
+background job copies orders and their items into Parquet files, a directory per team.
+The stats endpoints, and the trend, drink-mix and retention reports, query those files
+with an in-process DuckDB and never touch the database.
+
+The export is incremental. A watermark file in the directory records how far it has
+got by ``created_at``. Each window reads the orders created, or given new items, since
+the watermark, and appends their current rows to each affected team as a new part file.
+Editing an order replaces its items, so an edited order is exported again, and readers
+take each order's rows from the newest part that has it. Once a team has more than
+``_MAX_PARTS`` parts the recent ones are merged, so existing history is not rewritten
+on every run. Windows end ``analytics_export_lag_seconds`` before now, so orders still
+being written are not skipped.
+
+Every worker must see the same directory. Parts are written and merged under temporary
+names and renamed into place, so readers never see a partial file. A lock file lets one
+process export at a time. The watermark and the ``.ready`` marker live next to the parts,
+so a lost or freshly mounted directory starts again from the beginning of history, and
+hosts with directories of their own each export everything. Workers serve stats from the
+store while its marker says an export has caught up with history, and from the database
+otherwise.
+"""
+
+import asyncio
+import csv
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import func, select, union
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session
+from app.models.colleague import Colleague
+from app.models.drink_spec import DrinkSpec
+from app.models.order import Order, OrderItem
+from app.schemas.order import (
+    CohortRetention,
+    ColleagueStat,
+    DrinkMixPoint,
+    DrinkStat,
+    StatsOverview,
+    TrendPoint,
+)
+from app.services.background import exclusive_lock
+
+logger = logging.getLogger(__name__)
+
+# One row per order item; an order without items keeps one row with NULL item columns
+COLUMNS = {
+    "order_id": "UUID",
+    "ordered_at": "TIMESTAMP",  # UTC
+    "item_id": "UUID",
+    "colleague_id": "UUID",
+    "colleague_name": "VARCHAR",
+    "drink_type_name": "VARCHAR",
+    "size_name": "VARCHAR",
+    "milk_option_name": "VARCHAR",
+}
+
+_READY_MARKER = ".ready"
+_WATERMARK_FILE = ".watermark"
+_LOCK_FILE = ".export.lock"
+_PART_GLOB = "part-*.parquet"
+_MAX_PARTS = 16  # per team, before the recent ones are merged
+_DAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes, which are UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """DuckDB TIMESTAMP values are naive; the store keeps everything in UTC."""
+    return _utc(value).replace(tzinfo=None)
+
+
+def _sql_string(value: object) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class AnalyticsStore:
+    """Per-team directories of Parquet part files in ``directory``, read through DuckDB."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self._reader = None
+        self._reader_lock = threading.Lock()
+
+    def team_dir(self, team_id: uuid.UUID) -> Path:
+        return self.directory / str(team_id)
+
+    def parts(self, team_id: uuid.UUID) -> list[Path]:
+        """The team's part files, oldest first."""
+        return sorted(self.team_dir(team_id).glob(_PART_GLOB))
+
+    @property
+    def ready(self) -> bool:
+        """Whether an export into this directory has caught up with history.
+
+        Checked on every call, so a deleted or replaced directory stops serving at once.
+        """
+        return (self.directory / _READY_MARKER).exists()
+
+    def mark_ready(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / _READY_MARKER).touch()
+
+    @property
+    def watermark(self) -> datetime | None:
+        """How far the export into this directory has got; None before its first window."""
+        try:
+            return datetime.fromisoformat((self.directory / _WATERMARK_FILE).read_text())
+        except FileNotFoundError:
+            return None
+
+    def save_watermark(self, watermark: datetime) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = self.directory / f"{_WATERMARK_FILE}.tmp"
+        staging.write_text(_utc(watermark).isoformat())
+        os.replace(staging, self.directory / _WATERMARK_FILE)
+
+    def export_lock(self):
+        """Hold the exporter's lock; yields False when another process has it."""
+        return exclusive_lock(self.directory / _LOCK_FILE)
+
+    def write_part(self, team_id: uuid.UUID, window_end: datetime, rows: list[tuple]) -> None:
+        """Add ``rows`` (in ``COLUMNS`` order) as the part for the window ending then.
+
+        The rows of an order in this part supersede those in earlier parts. Rewriting a
+        window, after a run that failed to advance the watermark, replaces its part.
+        Parts are only merged once the watermark is past them (see ``compact``), so the
+        part replaced is never a merged one.
+        """
+        import duckdb
+
+        team_dir = self.team_dir(team_id)
+        team_dir.mkdir(parents=True, exist_ok=True)
+        path = team_dir / f"part-{_utc(window_end):%Y%m%dT%H%M%S%f}.parquet"
+        with tempfile.TemporaryDirectory(dir=team_dir) as tmp:
+            # Staging through CSV is far faster than binding Python values row by row
+            staged, written = Path(tmp) / "rows.csv", Path(tmp) / "part.parquet"
+            with open(staged, "w", newline="") as handle:
+                csv.writer(handle).writerows(rows)
+            columns = ", ".join(f"'{name}': '{type_}'" for name, type_ in COLUMNS.items())
+            with duckdb.connect() as con:
+                con.execute(
+                    f"COPY (SELECT * FROM read_csv({_sql_string(staged)}, header = false, "
+                    f"columns = {{{columns}}}) ORDER BY ordered_at) TO {_sql_string(written)} "
+                    "(FORMAT parquet, COMPRESSION zstd)"
+                )
+            os.replace(written, path)
+
+    def compact(self, team_id: uuid.UUID) -> None:
+        """Merge the team's recent parts, dropping the rows later parts superseded.
+
+        Leading parts at least as large as all the parts after them are kept, so older
+        history is rewritten only when the newer parts have grown as large as it; a row
+        is copied O(log n) times over the store's life rather than once per window.
+        """
+        import duckdb
+
+        parts = self.parts(team_id)
+        sizes = [part.stat().st_size for part in parts]
+        first = 0
+        while first < len(parts) - 1 and sizes[first] >= sum(sizes[first + 1 :]):
+            first += 1
+        merged = parts[first:] if len(parts) - first > 1 else parts
+        if len(merged) < 2:
+            return
+        with tempfile.TemporaryDirectory(dir=self.team_dir(team_id)) as tmp:
+            written = Path(tmp) / "part.parquet"
+            with duckdb.connect() as con:
+                con.execute(
+                    f"COPY ({_latest_rows(merged)} ORDER BY ordered_at) "
+                    f"TO {_sql_string(written)} (FORMAT parquet, COMPRESSION zstd)"
+                )
+            # Takes the newest merged part's name, so it still supersedes the parts kept
+            os.replace(written, merged[-1])
+        for part in merged[:-1]:
+            part.unlink()
+
+    def drop_team(self, team_id: uuid.UUID) -> None:
+        shutil.rmtree(self.team_dir(team_id), ignore_errors=True)
+
+    def _connection(self):
+        with self._reader_lock:
+            if self._reader is None:
+                import duckdb
+
+                self._reader = duckdb.connect()
+            return self._reader
+
+    def query(self, team_id: uuid.UUID, sql: str, params: list | None = None) -> list[tuple]:
+        """Run ``sql`` over the team's rows, which it reads as ``items``.
+
+        ``sql`` follows a ``WITH items AS (...)`` clause, so it may add its own common
+        table expressions by starting with ``, name AS (...)``. A team with no parts yet
+        has no rows.
+        """
+        import duckdb
+
+        for attempt in range(2):
+            parts = self.parts(team_id)
+            if not parts:
+                return []
+            cursor = self._connection().cursor()
+            try:
+                return cursor.execute(
+                    f"WITH items AS ({_latest_rows(parts)}) {sql}", params or []
+                ).fetchall()
+            except duckdb.IOException:
+                # A compaction removed a part after it was listed; list them again
+                if attempt:
+                    raise
+            finally:
+                cursor.close()
+
+    async def fetch(self, team_id: uuid.UUID, sql: str, params: list | None = None):
+        # DuckDB releases the GIL while it scans; keep the event loop free meanwhile
+        return await asyncio.to_thread(self.query, team_id, sql, params)
+
+
+def _latest_rows(parts: list[Path]) -> str:
+    """SQL selecting each order's rows from the newest of ``parts`` that has the order."""
+    if len(parts) == 1:
+        return f"SELECT * FROM read_parquet({_sql_string(parts[0])})"
+    files = ", ".join(_sql_string(part) for part in parts)
+    # Part names sort by window end, and so do their full paths within a team's directory
+    return (
+        f"SELECT * EXCLUDE (filename) FROM read_parquet([{files}], filename = true) "
+        "QUALIFY filename = max(filename) OVER (PARTITION BY order_id)"
+    )
+
+
+analytics_store = AnalyticsStore(settings.analytics_dir) if settings.analytics_dir else None
+
+
+def serving_store() -> AnalyticsStore | None:
+    """The store, once it can answer stats queries; None means use the database."""
+    if analytics_store is not None and analytics_store.ready:
+        return analytics_store
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+
+async def _changed_orders(
+    db: AsyncSession, lo: datetime, hi: datetime
+) -> dict[uuid.UUID, list[tuple]]:
+    """Team id -> current rows of every order created or given items in [lo, hi)."""
+    changed = union(
+        select(Order.id).where(Order.created_at >= lo, Order.created_at < hi),
+        select(OrderItem.order_id).where(OrderItem.created_at >= lo, OrderItem.created_at < hi),
+    ).subquery()
+    result = await db.execute(
+        select(
+            Order.team_id,
+            Order.id,
+            Order.created_at,
+            OrderItem.id,
+            OrderItem.colleague_id,
+            Colleague.name,
+            DrinkSpec.drink_type_name,
+            DrinkSpec.size_name,
+            DrinkSpec.milk_option_name,
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .outerjoin(Colleague, Colleague.id == OrderItem.colleague_id)
+        .outerjoin(DrinkSpec, DrinkSpec.id == OrderItem.drink_spec_id)
+        .where(Order.id.in_(select(changed.c[0])))
+    )
+    teams: dict[uuid.UUID, list[tuple]] = defaultdict(list)
+    for team_id, order_id, ordered_at, *item in result:
+        teams[team_id].append((order_id, _naive_utc(ordered_at), *item))
+    return teams
+
+
+def _write_teams(
+    store: AnalyticsStore, window_end: datetime, teams: dict[uuid.UUID, list[tuple]]
+) -> None:
+    for team_id, rows in teams.items():
+        store.write_part(team_id, window_end, rows)
+
+
+def _compact_teams(store: AnalyticsStore, teams: dict[uuid.UUID, list[tuple]]) -> None:
+    for team_id in teams:
+        if len(store.parts(team_id)) > _MAX_PARTS:
+            store.compact(team_id)
+
+
+async def export_orders(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    store: AnalyticsStore | None = None,
+    now: datetime | None = None,
+) -> int:
+    """Copy orders changed since the watermark into the store. Returns orders exported."""
+    store = store or analytics_store
+    with store.export_lock() as locked:
+        if not locked:
+            return 0
+        return await _export(session_factory, store, now)
+
+
+async def _export(
+    session_factory: async_sessionmaker[AsyncSession], store: AnalyticsStore, now: datetime | None
+) -> int:
+    end = _utc(now or datetime.now(timezone.utc)) - timedelta(
+        seconds=settings.analytics_export_lag_seconds
+    )
+    exported = 0
+    while True:
+        previous = store.watermark
+        start = previous
+        if start is None:
+            async with session_factory() as db:
+                start = await db.scalar(select(func.min(Order.created_at))) or end
+        start = _utc(start)
+        if start >= end:
+            if previous is None:
+                store.save_watermark(end)
+            store.mark_ready()
+            return exported
+
+        hi = min(start + timedelta(hours=settings.analytics_export_chunk_hours), end)
+        async with session_factory() as db:
+            teams = await _changed_orders(db, start, hi)
+        await asyncio.to_thread(_write_teams, store, hi, teams)
+        if store.watermark != previous:
+            continue  # The directory was deleted meanwhile; export into it from scratch
+        store.save_watermark(hi)
+        await asyncio.to_thread(_compact_teams, store, teams)
+        exported += sum(len({row[0] for row in rows}) for rows in teams.values())
+        logger.info("Analytics exported through %s", hi.isoformat())
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def _since(days: int | None) -> datetime:
+    """Start of the last ``days`` days; None means all history."""
+    if days is None:
+        return datetime(1970, 1, 1)
+    return _naive_utc(datetime.now(timezone.utc) - timedelta(days=days))
+
+
+def _week_start(today: date, weeks_back: int) -> date:
+    return today - timedelta(days=today.weekday(), weeks=weeks_back)
+
+
+async def overview(store: AnalyticsStore, team_id: uuid.UUID, days: int | None) -> StatsOverview:
+    counts = await store.fetch(
+        team_id,
+        """
+        SELECT
+            count(DISTINCT order_id) FILTER (WHERE ordered_at >= ?),
+            count(item_id) FILTER (WHERE ordered_at >= ?),
+            count(DISTINCT order_id) FILTER (WHERE ordered_at >= ?),
+            count(DISTINCT order_id) FILTER (WHERE ordered_at >= ?),
+            (
+                SELECT dayofweek(ordered_at) AS dow FROM items
+                GROUP BY dow ORDER BY count(DISTINCT order_id) DESC, dow LIMIT 1
+            )
+        FROM items
+        """,
+        [_since(days), _since(days), _since(7), _since(30)],
+    )
+    total_orders, total_coffees, this_week, this_month, dow = (
+        counts[0] if counts else (0, 0, 0, 0, None)
+    )
+    return StatsOverview(
+        total_orders=total_orders,
+        total_coffees=total_coffees,
+        busiest_day=_DAY_NAMES[dow] if dow is not None else None,
+        orders_this_week=this_week,
+        orders_this_month=this_month,
+    )
+
+
+async def drinks(
+    store: AnalyticsStore, team_id: uuid.UUID, days: int | None, limit: int
+) -> list[DrinkStat]:
+    rows = await store.fetch(
+        team_id,
+        """
+        SELECT drink_type_name, count(*) AS n FROM items
+        WHERE item_id IS NOT NULL AND ordered_at >= ?
+        GROUP BY drink_type_name ORDER BY n DESC, drink_type_name LIMIT ?
+        """,
+        # The database path reads days=0 as all history here, but not in the overview
+        [_since(days or None), limit],
+    )
+    return [DrinkStat(drink_name=name, count=count) for name, count in rows]
+
+
+async def colleagues(
+    store: AnalyticsStore, team_id: uuid.UUID, days: int | None
+) -> list[ColleagueStat]:
+    # As in the database path, the favourite drink is over all history
+    rows = await store.fetch(
+        team_id,
+        """
+        , per_drink AS (
+            SELECT colleague_name, drink_type_name, count(*) AS n FROM items
+            WHERE item_id IS NOT NULL GROUP BY ALL
+        ), favourite AS (
+            SELECT colleague_name, arg_max(drink_type_name, n) AS drink FROM per_drink
+            GROUP BY colleague_name
+        ), counts AS (
+            SELECT colleague_name, count(*) AS n FROM items
+            WHERE item_id IS NOT NULL AND ordered_at >= ? GROUP BY colleague_name
+        )
+        SELECT counts.colleague_name, counts.n, favourite.drink
+        FROM counts LEFT JOIN favourite USING (colleague_name)
+        ORDER BY counts.n DESC, counts.colleague_name
+        """,
+        [_since(days or None)],  # days=0 is all history, as for drinks
+    )
+    return [
+        ColleagueStat(colleague_name=name, order_count=count, favourite_drink=drink)
+        for name, count, drink in rows
+    ]
+
+
+async def trends(store: AnalyticsStore, team_id: uuid.UUID, weeks: int) -> list[TrendPoint]:
+    """Orders and coffees per week for the last ``weeks`` weeks, this one included."""
+    first = _week_start(datetime.now(timezone.utc).date(), weeks - 1)
+    rows = await store.fetch(
+        team_id,
+        """
+        SELECT date_trunc('week', ordered_at)::DATE AS week,
+               count(DISTINCT order_id), count(item_id)
+        FROM items WHERE ordered_at >= ? GROUP BY week
+        """,
+        [first],
+    )
+    by_week = {week: (orders, coffees) for week, orders, coffees in rows}
+    points = []
+    for n in range(weeks):
+        week = first + timedelta(weeks=n)
+        orders, coffees = by_week.get(week, (0, 0))
+        points.append(TrendPoint(week_start=week, orders=orders, coffees=coffees))
+    return points
+
+
+async def drink_mix(store: AnalyticsStore, team_id: uuid.UUID, weeks: int) -> list[DrinkMixPoint]:
+    """Each drink's share of the week's coffees, for weeks with orders."""
+    first = _week_start(datetime.now(timezone.utc).date(), weeks - 1)
+    rows = await store.fetch(
+        team_id,
+        """
+        SELECT date_trunc('week', ordered_at)::DATE AS week, drink_type_name, count(*) AS n,
+               count(*) / sum(count(*)) OVER (PARTITION BY week) AS share
+        FROM items WHERE item_id IS NOT NULL AND ordered_at >= ?
+        GROUP BY week, drink_type_name
+        ORDER BY week, n DESC, drink_type_name
+        """,
+        [first],
+    )
+    return [
+        DrinkMixPoint(week_start=week, drink_name=name, count=count, share=round(share, 4))
+        for week, name, count, share in rows
+    ]
+
+
+async def retention(
+    store: AnalyticsStore, team_id: uuid.UUID, months: int
+) -> list[CohortRetention]:
+    """Monthly cohorts by first coffee, and the share still ordering each month after."""
+    today = datetime.now(timezone.utc).date()
+    first_cohort = today.replace(day=1)
+    for _ in range(months - 1):
+        first_cohort = (first_cohort - timedelta(days=1)).replace(day=1)
+    rows = await store.fetch(
+        team_id,
+        """
+        , active AS (
+            SELECT DISTINCT colleague_id, date_trunc('month', ordered_at)::DATE AS month
+            FROM items WHERE item_id IS NOT NULL
+        ), cohorts AS (
+            SELECT colleague_id, min(month) AS cohort FROM active GROUP BY colleague_id
+        )
+        SELECT cohort, datediff('month', cohort, month) AS age, count(*)
+        FROM active JOIN cohorts USING (colleague_id)
+        WHERE cohort >= ?
+        GROUP BY cohort, age ORDER BY cohort, age
+        """,
+        [first_cohort],
+    )
+    active: dict[date, dict[int, int]] = defaultdict(dict)
+    for cohort, age, count in rows:
+        active[cohort][age] = count
+    report = []
+    for cohort, by_age in active.items():
+        size = by_age[0]
+        ages = (today.year - cohort.year) * 12 + today.month - cohort.month
+        report.append(
+            CohortRetention(
+                cohort=cohort,
+                colleagues=size,
+                retention=[round(by_age.get(age, 0) / size, 4) for age in range(ages + 1)],
+            )
+        )
+    return report
@@ -1,6 +1,8 @@
 import hashlib
 import secrets
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 from jose import JWTError, jwt
@@ -34,13 +36,76 @@ def create_jwt(user_id: uuid.UUID, email: str) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=ALGORITHM)
 
 
-def decode_jwt(token: str) -> dict | None:
+class ClaimsCache:
+    """Bounded LRU of verified token -> claims that honours each token's ``exp``."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> dict | None:
+        claims = self._entries.get(token)
+        if claims is None:
+            self.misses += 1
+            return None
+        if claims.get("exp", 0) <= time.time():
+            del self._entries[token]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return dict(claims)
+
+    def put(self, token: str, claims: dict) -> None:
+        if self.maxsize <= 0 or "exp" not in claims:
+            return
+        self._entries[token] = claims
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+claims_cache = ClaimsCache(settings.jwt_cache_size)
+
+
+def verify_jwt(token: str) -> dict | None:
+    """Verify signature and expiry with the configured backend, bypassing the cache."""
+    if settings.jwt_backend == "pyjwt":
+        import jwt as pyjwt
+
+        try:
+            return pyjwt.decode(token, settings.jwt_secret, algorithms=[ALGORITHM])
+        except pyjwt.PyJWTError:
+            return None
+
     try:
         return jwt.decode(token, settings.jwt_secret, algorithms=[ALGORITHM])
     except JWTError:
         return None
 
 
+def decode_jwt(token: str) -> dict | None:
+    claims = claims_cache.get(token)
+    if claims is not None:
+        return claims
+
+    claims = verify_jwt(token)
+    if claims is not None:
+        claims_cache.put(token, claims)
+        return dict(claims)
+    return None
+
+
 async def get_or_create_user(db: AsyncSession, email: str) -> User:
     result = await db.execute(select(User).where(User.email == email.lower()))
     user = result.scalar_one_or_none()
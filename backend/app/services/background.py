@@ -0,0 +1,54 @@
+import asyncio
+import fcntl
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_periodically(
+    name: str, interval_seconds: float, job: Callable[[], Awaitable[object]]
+) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Background job %s failed", name)
+
+
+def start_periodic_job(
+    name: str, interval_seconds: float, job: Callable[[], Awaitable[object]]
+) -> asyncio.Task:
+    """Run ``job`` every ``interval_seconds`` on this worker's event loop until cancelled."""
+    return asyncio.create_task(_run_periodically(name, interval_seconds, job), name=name)
+
+
+async def stop_periodic_jobs(tasks: list[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@contextmanager
+def exclusive_lock(path: Path):
+    """Hold an exclusive lock on ``path``; yields False when another process has it.
+
+    Every worker schedules the same periodic jobs. Jobs that only one process should do
+    take a lock first, and the workers that find it held skip the run.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
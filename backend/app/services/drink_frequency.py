@@ -0,0 +1,124 @@
+"""Per-colleague "usual drink" predictions from incrementally maintained order counts.
+
+Every order write adds its items to ``drink_frequencies`` (one row per colleague,
+coffee option and weekday) with a single upsert in the same transaction, and an edit
+subtracts the replaced items first. Predictions then rank a team's counts directly, so
+no order history is scanned at request time.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Select, SmallInteger, and_, case, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coffee_option import CoffeeOption
+from app.models.colleague import Colleague
+from app.models.drink_frequency import DrinkFrequency
+from app.models.ids import CompactUUID
+from app.models.order import OrderItem
+
+
+async def record_order_items(
+    db: AsyncSession,
+    order_id: uuid.UUID,
+    team_id: uuid.UUID,
+    ordered_at: datetime,
+    delta: int = 1,
+) -> None:
+    """Add the order's items to the counts; ``delta=-1`` takes them back out.
+
+    Call after the items are flushed (or, for removal, before they are deleted).
+    """
+    counts = (
+        select(
+            OrderItem.colleague_id,
+            OrderItem.coffee_option_id,
+            literal(ordered_at.weekday(), SmallInteger()),
+            literal(team_id, CompactUUID()),
+            func.count() * delta,
+            literal(ordered_at, DateTime(timezone=True)),
+        )
+        .where(OrderItem.order_id == order_id)
+        .group_by(OrderItem.colleague_id, OrderItem.coffee_option_id)
+    )
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(DrinkFrequency).from_select(
+        [
+            "colleague_id",
+            "coffee_option_id",
+            "weekday",
+            "team_id",
+            "order_count",
+            "last_ordered_at",
+        ],
+        counts,
+    )
+    updates = {"order_count": DrinkFrequency.order_count + statement.excluded.order_count}
+    if delta > 0:
+        updates["last_ordered_at"] = statement.excluded.last_ordered_at
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["colleague_id", "coffee_option_id", "weekday"], set_=updates
+        ).execution_options(synchronize_session=False)
+    )
+
+
+def usual_drinks_query(team_id: uuid.UUID, weekday: int, top: int) -> Select:
+    """The ``top`` most likely coffee options of each active colleague in the team.
+
+    Options are ranked by how often they were ordered on ``weekday``, then overall,
+    then by recency. Rows are (colleague_id, coffee_option_id, weekday_count,
+    total_count, rank), ordered by colleague and rank.
+    """
+    totals = (
+        select(
+            DrinkFrequency.colleague_id,
+            DrinkFrequency.coffee_option_id,
+            func.sum(
+                case((DrinkFrequency.weekday == weekday, DrinkFrequency.order_count), else_=0)
+            ).label("weekday_count"),
+            func.sum(DrinkFrequency.order_count).label("total_count"),
+            func.max(DrinkFrequency.last_ordered_at).label("last_ordered_at"),
+        )
+        .where(DrinkFrequency.team_id == team_id)
+        .group_by(DrinkFrequency.colleague_id, DrinkFrequency.coffee_option_id)
+        .subquery()
+    )
+    ranked = (
+        select(
+            totals.c.colleague_id,
+            totals.c.coffee_option_id,
+            totals.c.weekday_count,
+            totals.c.total_count,
+            func.row_number()
+            .over(
+                partition_by=totals.c.colleague_id,
+                order_by=(
+                    totals.c.weekday_count.desc(),
+                    totals.c.total_count.desc(),
+                    totals.c.last_ordered_at.desc(),
+                ),
+            )
+            .label("rank"),
+        )
+        .join(
+            Colleague,
+            and_(
+                Colleague.id == totals.c.colleague_id,
+                Colleague.is_active == True,  # noqa: E712
+            ),
+        )
+        # Only options the colleague still has on file can be preselected for them
+        .join(
+            CoffeeOption,
+            and_(
+                CoffeeOption.id == totals.c.coffee_option_id,
+                CoffeeOption.colleague_id == totals.c.colleague_id,
+            ),
+        )
+        .where(totals.c.total_count > 0)
+        .subquery()
+    )
+    return select(ranked).where(ranked.c.rank <= top).order_by(ranked.c.colleague_id, ranked.c.rank)
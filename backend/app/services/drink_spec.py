@@ -0,0 +1,73 @@
+"""Content-keyed drink specs for order items.
+
+An order item stores only the id of a ``drink_specs`` row holding its drink details.
+The id is the MD5 of a canonical encoding of those details, so the same drink always
+maps to the same id: writers compute it locally and insert the spec with ON CONFLICT
+DO NOTHING instead of looking it up first. Migration 010 computes the same key for
+existing rows, so the encoding in ``spec_key`` must never change.
+"""
+
+import hashlib
+import uuid
+from collections.abc import Iterable
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coffee_option import CoffeeOption
+from app.models.drink_spec import DrinkSpec
+
+SPEC_FIELDS = (
+    "drink_type_name",
+    "size_name",
+    "size_abbreviation",
+    "milk_option_name",
+    "sugar",
+    "notes",
+)
+
+
+def spec_key(
+    drink_type_name: str,
+    size_name: str,
+    size_abbreviation: str,
+    milk_option_name: str | None,
+    sugar: int,
+    notes: str | None,
+) -> uuid.UUID:
+    # Fields joined with the ASCII unit separator, each prefixed with 1, or a bare 0
+    # when NULL, so that NULL and "" hash differently
+    values = (drink_type_name, size_name, size_abbreviation, milk_option_name, sugar, notes)
+    canonical = "\x1f".join("0" if value is None else f"1{value}" for value in values)
+    return uuid.UUID(hashlib.md5(canonical.encode()).hexdigest())
+
+
+def spec_from_values(**values) -> dict:
+    """A ``drink_specs`` row (id included) for the given ``SPEC_FIELDS`` values."""
+    row = {field: values[field] for field in SPEC_FIELDS}
+    return {"id": spec_key(**row), **row}
+
+
+def spec_for_option(option: CoffeeOption) -> dict:
+    """The spec an item ordered from ``option`` snapshots; menu relationships must be loaded."""
+    return spec_from_values(
+        drink_type_name=option.drink_type.name,
+        size_name=option.size.name,
+        size_abbreviation=option.size.abbreviation,
+        milk_option_name=option.milk_option.name if option.milk_option else None,
+        sugar=option.sugar,
+        notes=option.notes,
+    )
+
+
+async def ensure_specs(db: AsyncSession, specs: Iterable[dict]) -> None:
+    """Insert any of ``specs`` not stored yet.
+
+    Runs as a Core statement, which autoflushes the session first: call it before
+    adding the order items that reference these specs.
+    """
+    rows = list({spec["id"]: spec for spec in specs}.values())
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    await db.execute(dialect.insert(DrinkSpec).values(rows).on_conflict_do_nothing())
@@ -0,0 +1,126 @@
+"""Idempotency-Key support for retried writes.
+
+A client that retries a request sends the same ``Idempotency-Key`` header again. The
+first request claims the key in the same transaction as its write and stores the
+response it produced, so the key and the write commit or roll back together. A retry
+with the same key and payload gets the stored response back without re-running the
+write; reusing a key for a different payload is rejected. Keys expire after
+``idempotency_key_ttl_hours`` and are swept by a periodic job.
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException, Response
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session
+from app.models.idempotency import IdempotencyKey
+from app.services.background import exclusive_lock
+
+logger = logging.getLogger(__name__)
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+LOCK_PATH = Path(tempfile.gettempdir()) / "coffeerun-idempotency-sweep.lock"
+
+
+def _cutoff(ttl_hours: int | None = None) -> datetime:
+    if ttl_hours is None:
+        ttl_hours = settings.idempotency_key_ttl_hours
+    return datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
+
+
+def request_fingerprint(method: str, path: str, payload: Any) -> str:
+    """Stable hash of a request; ``payload`` must be JSON-serializable."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{method} {path}\n{body}".encode()).hexdigest()
+
+
+async def replay_or_claim(
+    db: AsyncSession, user_id: uuid.UUID, key: str, fingerprint: str
+) -> Response | IdempotencyKey:
+    """Return the stored response for a completed request with this key, or claim the key.
+
+    The claimed row is flushed but not committed; the caller's transaction decides
+    whether it survives. Raises 422 if the key was used for a different request and
+    409 if another request holding the key has not finished yet.
+    """
+    record = (
+        await db.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at > _cutoff(),
+            )
+        )
+    ).scalar_one_or_none()
+    if record is not None:
+        if record.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key has already been used for a different request",
+            )
+        if record.response_body is None:
+            raise HTTPException(
+                status_code=409, detail="A request with this Idempotency-Key is in progress"
+            )
+        return Response(
+            content=record.response_body,
+            status_code=record.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    # An expired row not yet swept would otherwise block the key's reuse
+    await db.execute(
+        delete(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .execution_options(synchronize_session=False)
+    )
+    record = IdempotencyKey(user_id=user_id, key=key, fingerprint=fingerprint)
+    db.add(record)
+    try:
+        await db.flush()
+    except IntegrityError:
+        # A concurrent request claimed the key first; its transaction is still open
+        raise HTTPException(
+            status_code=409, detail="A request with this Idempotency-Key is in progress"
+        )
+    return record
+
+
+def store_response(record: IdempotencyKey, status_code: int, body: bytes) -> None:
+    record.status_code = status_code
+    record.response_body = body
+
+
+async def purge_expired_idempotency_keys(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    ttl_hours: int | None = None,
+) -> int:
+    """Delete keys older than the TTL. Returns the number of rows removed.
+
+    A lock file lets one process per host run it; the others skip and return 0.
+    """
+    with exclusive_lock(LOCK_PATH) as locked:
+        if not locked:
+            return 0
+        async with session_factory() as db:
+            result = await db.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.created_at <= _cutoff(ttl_hours))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+    if result.rowcount:
+        logger.info("Purged %d expired idempotency keys", result.rowcount)
+    return result.rowcount
@@ -0,0 +1,136 @@
+"""Event-loop stall detection for development and tests.
+
+Every coroutine on a worker shares one event loop, so a synchronous call inside an
+``async def`` (a blocking HTTP client, a slow ``print`` to a piped stdout, password
+hashing) holds up every other request on that worker for as long as it runs.
+
+``LoopWatchdog`` keeps a heartbeat task on the loop and a daemon thread beside it. When
+the heartbeat has not run for ``threshold_seconds`` the thread captures the loop
+thread's stack *while it is still blocked*, so the report names the offending call
+rather than whatever ran afterwards. Enable it with ``LOOP_WATCHDOG_THRESHOLD_MS``; the
+``loop_watchdog`` test fixture uses it to fail tests whose handlers block the loop.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stall:
+    stack: str  # loop thread's stack when the stall was detected
+    seconds: float  # how long the loop went without running the heartbeat
+
+    def describe(self) -> str:
+        return f"Event loop blocked for {self.seconds * 1000:.0f} ms at:\n{self.stack}"
+
+
+class EventLoopBlocked(AssertionError):
+    pass
+
+
+class LoopWatchdog:
+    def __init__(
+        self,
+        threshold_seconds: float,
+        interval_seconds: float | None = None,
+        max_stalls: int = 20,
+    ) -> None:
+        self.threshold_seconds = threshold_seconds
+        # Detection is at most one interval late; a quarter of the threshold is plenty
+        self.interval_seconds = interval_seconds or threshold_seconds / 4
+        self.stalls: deque[Stall] = deque(maxlen=max_stalls)
+        self._lock = threading.Lock()
+        self._beat = 0.0
+        self._open: Stall | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start watching the running loop; call from a coroutine on that loop."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._stopped.set()
+        await asyncio.to_thread(self._thread.join)
+        self._task = self._thread = None
+
+    async def __aenter__(self) -> "LoopWatchdog":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            now = time.monotonic()
+            with self._lock:
+                if self._open is not None:
+                    # The loop is back: record how long it was really gone
+                    self._open.seconds = now - self._beat - self.interval_seconds
+                    self._open = None
+                self._beat = now
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            with self._lock:
+                behind = time.monotonic() - self._beat - self.interval_seconds
+                if self._open is not None or behind < self.threshold_seconds:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+                self._open = Stall(stack=stack, seconds=behind)
+                self.stalls.append(self._open)
+            logger.warning(
+                "Event loop blocked for over %.0f ms; loop thread stack:\n%s",
+                behind * 1000,
+                stack,
+            )
+
+    def raise_for_stalls(self) -> None:
+        """Raise ``EventLoopBlocked`` describing every stall seen so far."""
+        if self.stalls:
+            raise EventLoopBlocked("\n\n".join(stall.describe() for stall in self.stalls))
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self.running,
+            "threshold_ms": round(self.threshold_seconds * 1000),
+            "stalls": [
+                {"ms": round(stall.seconds * 1000), "stack": stall.stack} for stall in self.stalls
+            ],
+        }
+
+
+loop_watchdog = LoopWatchdog(settings.loop_watchdog_threshold_ms / 1000 or 0.1)
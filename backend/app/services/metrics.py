@@ -0,0 +1,208 @@
+"""Prometheus metrics, served at ``/metrics`` when METRICS_ENABLED is set.
+
+Request latency and in-flight requests are recorded by ``MetricsMiddleware`` as they
+happen. Figures each worker already keeps for itself (connection pool state, the query,
+JWT and compression cache counters, replica routing) are copied into the metrics by
+``sample_metrics``, which every worker runs periodically alongside its event-loop lag
+probe, and the worker answering a scrape runs once more before rendering.
+
+Under gunicorn, ``gunicorn.conf.py`` points PROMETHEUS_MULTIPROC_DIR at a fresh directory
+before the app is imported: every worker then writes its values to memory-mapped files
+there and a scrape served by any worker aggregates all of them.
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+REQUEST_LATENCY = Histogram(
+    "coffeerun_http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "coffeerun_http_requests_in_flight",
+    "Requests being handled",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "coffeerun_db_pool_checked_out",
+    "Pooled connections in use",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "coffeerun_db_pool_overflow",
+    "Connections open beyond the pool size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "coffeerun_db_pool_size",
+    "Configured pool size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "coffeerun_db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_QUERIES = Counter(
+    "coffeerun_db_queries_total",
+    "Statements executed on the primary, by compiled-statement cache outcome",
+    ["compiled_cache"],
+)
+DB_READS = Counter(
+    "coffeerun_db_read_sessions_total",
+    "Read-only request sessions by the database that served them",
+    ["target"],
+)
+CACHE_LOOKUPS = Counter(
+    "coffeerun_cache_lookups_total",
+    "In-process cache lookups; hit ratio = hit / (hit + miss)",
+    ["cache", "result"],
+)
+EMAILS_IN_FLIGHT = Gauge(
+    "coffeerun_email_sends_in_flight",
+    "Emails waiting on the email provider",
+    multiprocess_mode="livesum",
+)
+EMAILS_SENT = Counter("coffeerun_emails_total", "Emails sent", ["kind", "result"])
+EVENT_LOOP_LAG = Histogram(
+    "coffeerun_event_loop_lag_seconds",
+    "How late the event loop woke the metrics sampler",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """The async queue pool, timing how long each checkout waits for a connection."""
+
+    metrics_label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_label).observe(time.perf_counter() - start)
+
+
+def metered_pool_class(label: str) -> type[MeteredQueuePool]:
+    return type(f"MeteredQueuePool_{label}", (MeteredQueuePool,), {"metrics_label": label})
+
+
+class _CounterSync:
+    """Advances Prometheus counters to match the running totals a component keeps."""
+
+    def __init__(self) -> None:
+        self._last: dict[tuple, int] = {}
+
+    def update(self, counter: Counter, labels: tuple[str, ...], total: int) -> None:
+        key = (counter, labels)
+        delta = total - self._last.get(key, 0)
+        if delta < 0:
+            # The component reset its totals (tests, cache clears): count afresh
+            delta = total
+        if delta:
+            counter.labels(*labels).inc(delta)
+        self._last[key] = total
+
+
+_counters = _CounterSync()
+
+
+def _sample_pool(label: str, engine: AsyncEngine | None) -> None:
+    pool = engine.sync_engine.pool if engine is not None else None
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return  # NullPool/StaticPool (SQLite) keep no pool state
+    DB_POOL_CHECKED_OUT.labels(label).set(pool.checkedout())
+    DB_POOL_OVERFLOW.labels(label).set(max(pool.overflow(), 0))
+    DB_POOL_SIZE.labels(label).set(pool.size())
+
+
+def sample_metrics() -> None:
+    """Copy this worker's pool state and cache counters into the metrics."""
+    from app import database
+    from app.middleware.compression import compression_cache
+    from app.services.auth import claims_cache
+    from app.services.query_cache import query_cache_stats
+
+    _sample_pool("primary", database.engine)
+    _sample_pool("replica", database.read_engine)
+
+    _counters.update(DB_QUERIES, ("hit",), query_cache_stats.hits)
+    _counters.update(DB_QUERIES, ("miss",), query_cache_stats.misses)
+    _counters.update(DB_QUERIES, ("uncached",), query_cache_stats.uncached)
+    _counters.update(DB_READS, ("replica",), database.read_replica.replica_reads)
+    _counters.update(DB_READS, ("primary",), database.read_replica.primary_reads)
+    for name, cache in (
+        ("query_compile", query_cache_stats),
+        ("jwt_claims", claims_cache),
+        ("compression", compression_cache),
+    ):
+        _counters.update(CACHE_LOOKUPS, (name, "hit"), cache.hits)
+        _counters.update(CACHE_LOOKUPS, (name, "miss"), cache.misses)
+
+
+@contextmanager
+def track_email(kind: str) -> Iterator[None]:
+    """Count an email send while it waits on the provider, and its outcome."""
+    EMAILS_IN_FLIGHT.inc()
+    try:
+        yield
+    except Exception:
+        EMAILS_SENT.labels(kind, "error").inc()
+        raise
+    else:
+        EMAILS_SENT.labels(kind, "sent").inc()
+    finally:
+        EMAILS_IN_FLIGHT.dec()
+
+
+class LoopLagProbe:
+    """Periodic job measuring how late the event loop runs it.
+
+    ``start_periodic_job`` sleeps for the interval between runs, so any time past the
+    expected wake-up was spent by callbacks that held the loop.
+    """
+
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval = interval_seconds
+        self._expected: float | None = None
+
+    async def __call__(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._expected is not None:
+            EVENT_LOOP_LAG.observe(max(loop.time() - self._expected, 0.0))
+        sample_metrics()
+        self._expected = loop.time() + self.interval
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """The exposition for every worker (multiprocess mode) or just this process."""
+    sample_metrics()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,102 @@
+"""Orders cloned from a saved template or from the team's last order.
+
+One SELECT reads the current drink details of every source item, so no per-item
+validation round trips are needed; the items and any drink specs not stored yet are
+then written with one statement each. Joining through the active colleague and their
+coffee option drops items whose colleague has been deactivated (or moved team) or
+whose option has been deleted.
+"""
+
+import uuid
+
+from sqlalchemy import Select, and_, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coffee_option import CoffeeOption
+from app.models.colleague import Colleague
+from app.models.ids import uuid7
+from app.models.menu import DrinkType, MilkOption, Size
+from app.models.order import Order, OrderItem
+from app.models.order_template import OrderTemplateItem
+from app.services.drink_spec import ensure_specs, spec_from_values
+
+
+async def last_order_id(db: AsyncSession, team_id: uuid.UUID) -> uuid.UUID | None:
+    """The team's most recent order; resolve it before creating the new one."""
+    return await db.scalar(
+        select(Order.id).where(Order.team_id == team_id).order_by(Order.created_at.desc()).limit(1)
+    )
+
+
+def order_items(order_id: uuid.UUID) -> Select:
+    return select(OrderItem.colleague_id, OrderItem.coffee_option_id).where(
+        OrderItem.order_id == order_id
+    )
+
+
+def template_items(template_id: uuid.UUID) -> Select:
+    return select(OrderTemplateItem.colleague_id, OrderTemplateItem.coffee_option_id).where(
+        OrderTemplateItem.template_id == template_id
+    )
+
+
+async def clone_items_into_order(
+    db: AsyncSession, order_id: uuid.UUID, team_id: uuid.UUID, source: Select
+) -> int:
+    """Insert ``source``'s (colleague_id, coffee_option_id) pairs as items of the order.
+
+    Returns the number of items inserted; skipped items are simply not selected.
+    """
+    src = source.subquery()
+    rows = (
+        await db.execute(
+            select(
+                src.c.colleague_id,
+                src.c.coffee_option_id,
+                DrinkType.name.label("drink_type_name"),
+                Size.name.label("size_name"),
+                Size.abbreviation.label("size_abbreviation"),
+                MilkOption.name.label("milk_option_name"),
+                CoffeeOption.sugar,
+                CoffeeOption.notes,
+            )
+            .select_from(src)
+            .join(
+                Colleague,
+                and_(
+                    Colleague.id == src.c.colleague_id,
+                    Colleague.team_id == team_id,
+                    Colleague.is_active == True,  # noqa: E712
+                ),
+            )
+            .join(
+                CoffeeOption,
+                and_(
+                    CoffeeOption.id == src.c.coffee_option_id,
+                    CoffeeOption.colleague_id == src.c.colleague_id,
+                ),
+            )
+            .join(DrinkType, DrinkType.id == CoffeeOption.drink_type_id)
+            .join(Size, Size.id == CoffeeOption.size_id)
+            .outerjoin(MilkOption, MilkOption.id == CoffeeOption.milk_option_id)
+        )
+    ).all()
+    if not rows:
+        return 0
+
+    items, specs = [], []
+    for row in rows:
+        spec = spec_from_values(**row._mapping)
+        specs.append(spec)
+        items.append(
+            {
+                "id": uuid7(),
+                "order_id": order_id,
+                "colleague_id": row.colleague_id,
+                "coffee_option_id": row.coffee_option_id,
+                "drink_spec_id": spec["id"],
+            }
+        )
+    await ensure_specs(db, specs)
+    await db.execute(insert(OrderItem).execution_options(synchronize_session=False), items)
+    return len(items)
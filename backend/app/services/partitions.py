@@ -0,0 +1,189 @@
+"""Hot/cold management of order history.
+
+PostgreSQL: ``orders`` and ``order_items`` are range-partitioned by month on
+``created_at`` (migration 004). Upcoming partitions are created ahead of time and
+partitions older than the hot window are detached, leaving them as standalone cold
+tables named ``<table>_pYYYYMM``.
+
+SQLite: orders older than the hot window are moved into ``orders_archive`` /
+``order_items_archive`` in bounded chunks.
+
+Either way the API only serves orders inside the hot window.
+"""
+
+import logging
+import re
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session
+from app.models.order import Order
+from app.services.background import exclusive_lock
+from app.services.purge import move_orders_chunk
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("orders", "order_items")
+LOCK_PATH = Path(tempfile.gettempdir()) / "coffeerun-partitions.lock"
+_PARTITION_NAME = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def month_start(year: int, month: int) -> datetime:
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def hot_cutoff(now: datetime | None = None, hot_months: int | None = None) -> datetime:
+    """First instant of the oldest month still kept hot."""
+    now = now or datetime.now(timezone.utc)
+    hot_months = settings.order_hot_months if hot_months is None else hot_months
+    return month_start(*add_months(now.year, now.month, -hot_months))
+
+
+def partition_name(table: str, year: int, month: int) -> str:
+    return f"{table}_p{year:04d}{month:02d}"
+
+
+async def create_month_partition(conn: AsyncConnection, table: str, year: int, month: int) -> bool:
+    """Create one monthly partition if missing; returns True when created.
+
+    Rows for that month already sitting in the default partition are moved across in
+    the same transaction (PostgreSQL refuses to attach over them otherwise).
+    """
+    name = partition_name(table, year, month)
+    exists = await conn.scalar(text("SELECT to_regclass(:name)"), {"name": name})
+    if exists is not None:
+        return False
+
+    lo = month_start(year, month)
+    hi = month_start(*add_months(year, month, 1))
+    # Utility statements can't take bind parameters, so the (generated) bounds are inlined
+    in_range = f"created_at >= '{lo.isoformat()}' AND created_at < '{hi.isoformat()}'"
+    default = f"{table}_default"
+    await conn.execute(
+        text(f"CREATE TEMP TABLE _moved_rows AS SELECT * FROM {default} WHERE {in_range}")
+    )
+    await conn.execute(text(f"DELETE FROM {default} WHERE {in_range}"))
+    await conn.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}')"
+        )
+    )
+    await conn.execute(text(f"INSERT INTO {table} SELECT * FROM _moved_rows"))
+    await conn.execute(text("DROP TABLE _moved_rows"))
+    return True
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> list[str]:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return list(result.scalars().all())
+
+
+async def _manage_postgres(
+    session_factory: async_sessionmaker[AsyncSession],
+    months_ahead: int,
+    cutoff: datetime,
+) -> dict:
+    report = {"created": [], "detached": []}
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        conn = await db.connection()
+        for table in PARTITIONED_TABLES:
+            for offset in range(months_ahead + 1):
+                year, month = add_months(now.year, now.month, offset)
+                if await create_month_partition(conn, table, year, month):
+                    report["created"].append(partition_name(table, year, month))
+
+            for name in await list_partitions(conn, table):
+                match = _PARTITION_NAME.search(name)
+                if not match:
+                    continue  # the default partition
+                upper = month_start(*add_months(int(match[1]), int(match[2]), 1))
+                if upper <= cutoff:
+                    await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                    report["detached"].append(name)
+        await db.commit()
+    return report
+
+
+async def _manage_sqlite(
+    session_factory: async_sessionmaker[AsyncSession],
+    cutoff: datetime,
+    chunk_size: int,
+) -> dict:
+    archived = 0
+    while True:
+        async with session_factory() as db:
+            order_ids = (
+                (
+                    await db.execute(
+                        select(Order.id).where(Order.created_at < cutoff).limit(chunk_size)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            if not order_ids:
+                break
+            await move_orders_chunk(db, list(order_ids), archive=True)
+            await db.commit()
+            archived += len(order_ids)
+    return {"archived_orders": archived}
+
+
+async def manage_order_partitions(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    months_ahead: int | None = None,
+    hot_months: int | None = None,
+    chunk_size: int | None = None,
+) -> dict:
+    """Create upcoming partitions and retire data older than the hot window.
+
+    A lock file lets one process per host run it, so workers do not queue DDL on
+    ``orders`` behind each other; the others skip and return an empty report.
+    """
+    with exclusive_lock(LOCK_PATH) as locked:
+        if not locked:
+            return {}
+        return await _manage_partitions(session_factory, months_ahead, hot_months, chunk_size)
+
+
+async def _manage_partitions(
+    session_factory: async_sessionmaker[AsyncSession],
+    months_ahead: int | None,
+    hot_months: int | None,
+    chunk_size: int | None,
+) -> dict:
+    if months_ahead is None:
+        months_ahead = settings.order_partition_months_ahead
+    cutoff = hot_cutoff(hot_months=hot_months)
+
+    async with session_factory() as db:
+        dialect = db.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        report = await _manage_postgres(session_factory, months_ahead, cutoff)
+    else:
+        report = await _manage_sqlite(
+            session_factory, cutoff, chunk_size or settings.team_purge_chunk_size
+        )
+    logger.info("Order partition maintenance (cutoff %s): %s", cutoff.date(), report)
+    return report
@@ -0,0 +1,180 @@
+"""Per-colleague, per-weekday attendance forecast built incrementally from order history.
+
+For every completed UTC day on which a team placed at least one order, each of the
+team's colleagues who existed that day is "observed" once for that weekday, and
+"present" if any of the day's orders had an item for them. The counts live in
+``colleague_presence``; the probability is ``days_present / days_observed``.
+
+The job runs nightly and only reads days after its watermark, so a run after the first
+one touches a single day of orders. A lock file lets one worker per host run it; the
+others skip. Runs on different hosts are still safe: the watermark is advanced with a
+compare-and-set in the same transaction as the counts, and a run that loses the race
+rolls back instead of counting the day twice.
+"""
+
+import logging
+import tempfile
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import async_session
+from app.models.colleague import Colleague, ColleagueType
+from app.models.order import Order, OrderItem
+from app.models.presence import ColleaguePresence
+from app.models.watermark import JobWatermark
+from app.services.background import exclusive_lock
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "colleague_presence"
+_CHUNK_DAYS = 31
+LOCK_PATH = Path(tempfile.gettempdir()) / "coffeerun-presence.lock"
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _as_date(value) -> date:
+    # SQLite returns date() results as 'YYYY-MM-DD' strings, PostgreSQL as dates
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+async def _start_of_history(db: AsyncSession) -> datetime | None:
+    first = await db.scalar(select(func.min(Order.created_at)))
+    return _midnight(first.date()) if first is not None else None
+
+
+async def _count_window(
+    db: AsyncSession, lo: datetime, hi: datetime
+) -> dict[tuple[uuid.UUID, uuid.UUID, int], list[int]]:
+    """(colleague_id, team_id, weekday) -> [days_observed, days_present] for [lo, hi)."""
+    attendance = (
+        await db.execute(
+            select(Order.team_id, func.date(Order.created_at), OrderItem.colleague_id)
+            .join(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.created_at >= lo, Order.created_at < hi)
+            .distinct()
+        )
+    ).all()
+
+    present: dict[uuid.UUID, set[tuple[date, uuid.UUID]]] = defaultdict(set)
+    for team_id, day, colleague_id in attendance:
+        present[team_id].add((_as_date(day), colleague_id))
+    if not present:
+        return {}
+
+    colleagues = (
+        await db.execute(
+            select(Colleague.id, Colleague.team_id, Colleague.created_at).where(
+                Colleague.team_id.in_(present),
+                Colleague.is_active == True,  # noqa: E712
+                Colleague.colleague_type == ColleagueType.colleague,
+            )
+        )
+    ).all()
+
+    counts: dict[tuple[uuid.UUID, uuid.UUID, int], list[int]] = defaultdict(lambda: [0, 0])
+    for colleague_id, team_id, created_at in colleagues:
+        added = created_at.date() if created_at is not None else date.min
+        for day in {day for day, _ in present[team_id]}:
+            if day < added:
+                continue
+            key = (colleague_id, team_id, day.weekday())
+            counts[key][0] += 1
+            if (day, colleague_id) in present[team_id]:
+                counts[key][1] += 1
+    return counts
+
+
+async def _apply_counts(
+    db: AsyncSession, counts: dict[tuple[uuid.UUID, uuid.UUID, int], list[int]]
+) -> None:
+    if not counts:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(ColleaguePresence).values(
+        [
+            {
+                "colleague_id": colleague_id,
+                "team_id": team_id,
+                "weekday": weekday,
+                "days_observed": observed,
+                "days_present": present,
+            }
+            for (colleague_id, team_id, weekday), (observed, present) in counts.items()
+        ]
+    )
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["colleague_id", "weekday"],
+            set_={
+                "days_observed": ColleaguePresence.days_observed + statement.excluded.days_observed,
+                "days_present": ColleaguePresence.days_present + statement.excluded.days_present,
+            },
+        )
+    )
+
+
+async def update_presence_forecast(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    now: datetime | None = None,
+) -> int:
+    """Fold every completed day since the last run into the counts. Returns days processed."""
+    with exclusive_lock(LOCK_PATH) as locked:
+        if not locked:
+            return 0
+        return await _fold_days(session_factory, now)
+
+
+async def _fold_days(
+    session_factory: async_sessionmaker[AsyncSession], now: datetime | None
+) -> int:
+    end = _midnight((now or datetime.now(timezone.utc)).date())
+    processed = 0
+    while True:
+        async with session_factory() as db:
+            previous = await db.scalar(
+                select(JobWatermark.watermark).where(JobWatermark.name == WATERMARK_NAME)
+            )
+            start = previous
+            if start is None:
+                start = await _start_of_history(db) or end
+            start = _midnight(start.date())  # SQLite hands back naive datetimes
+            if start >= end:
+                if previous is None:
+                    db.add(JobWatermark(name=WATERMARK_NAME, watermark=end))
+                    await db.commit()
+                return processed
+
+            hi = min(start + timedelta(days=_CHUNK_DAYS), end)
+            await _apply_counts(db, await _count_window(db, start, hi))
+
+            if previous is None:
+                db.add(JobWatermark(name=WATERMARK_NAME, watermark=hi))
+                try:
+                    await db.flush()
+                except IntegrityError:
+                    # Another worker ran the first window concurrently
+                    await db.rollback()
+                    return processed
+            else:
+                advanced = await db.execute(
+                    update(JobWatermark)
+                    .where(JobWatermark.name == WATERMARK_NAME, JobWatermark.watermark == previous)
+                    .values(watermark=hi)
+                )
+                if advanced.rowcount != 1:
+                    # Another worker processed this window first
+                    await db.rollback()
+                    return processed
+            await db.commit()
+            processed += (hi - start).days
+            logger.info("Presence forecast updated through %s", hi.date())
@@ -0,0 +1,163 @@
+"""Request profiles captured by ``app.middleware.profiling`` and served at /api/profiles.
+
+Profiles are kept in a bounded buffer; the oldest is dropped when a new one arrives.
+Each holds the pyinstrument session and is rendered to speedscope JSON (open it at
+https://www.speedscope.app) only when it is fetched. With ``profiling_dir`` set (under
+gunicorn it defaults to a temp directory) the buffer is a directory of files shared by
+every worker, so whichever worker answers can serve a profile another one recorded;
+otherwise it lives in this process's memory.
+"""
+
+import asyncio
+import hmac
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from app.config import settings
+
+PROFILE_TOKEN_HEADER = "x-profile-token"
+PROFILE_ID_HEADER = "x-profile-id"
+
+_PROFILE_ID = re.compile(r"[0-9a-f]{16}")
+_SUFFIX = ".profile"
+
+
+def token_matches(value: str | None) -> bool:
+    if not settings.profiling_token or not value:
+        return False
+    return hmac.compare_digest(value.encode(), settings.profiling_token.encode())
+
+
+@dataclass
+class RequestProfile:
+    id: str
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    trigger: str  # "header" or "sample"
+    created_at: datetime
+    session: object  # pyinstrument.session.Session
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "trigger": self.trigger,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    def speedscope(self) -> str:
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        return SpeedscopeRenderer().render(self.session)
+
+
+class ProfileStore:
+    """Ring buffer of the most recent ``maxsize`` profiles, by id."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, RequestProfile] = OrderedDict()
+
+    def add(self, profile: RequestProfile) -> None:
+        self._data[profile.id] = profile
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        return self._data.get(profile_id)
+
+    def summaries(self) -> list[dict]:
+        """Newest first."""
+        return [profile.summary() for profile in reversed(self._data.values())]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def save(self, profile: RequestProfile) -> None:
+        """``add`` from the event loop."""
+        self.add(profile)
+
+
+class SharedProfileStore(ProfileStore):
+    """The same ring buffer kept as files in ``directory``, which every worker shares.
+
+    Each profile is one file holding its summary on the first line and the pyinstrument
+    session on the second, named so that sorting the names sorts the profiles by age.
+    """
+
+    def __init__(self, maxsize: int, directory: Path):
+        super().__init__(maxsize)
+        self.directory = directory
+
+    def _paths(self) -> list[Path]:
+        return sorted(self.directory.glob(f"*{_SUFFIX}"))
+
+    def add(self, profile: RequestProfile) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{time.time_ns():020d}-{profile.id}{_SUFFIX}"
+        staging = self.directory / f".{name}.tmp"
+        staging.write_text(
+            json.dumps(profile.summary()) + "\n" + json.dumps(profile.session.to_json())
+        )
+        os.replace(staging, self.directory / name)
+        paths = self._paths()
+        for stale in paths[: max(len(paths) - self.maxsize, 0)]:
+            stale.unlink(missing_ok=True)
+
+    def get(self, profile_id: str) -> RequestProfile | None:
+        if not _PROFILE_ID.fullmatch(profile_id):
+            return None
+        for path in self.directory.glob(f"*-{profile_id}{_SUFFIX}"):
+            try:
+                summary, session = path.read_text().split("\n", 1)
+            except FileNotFoundError:
+                return None  # evicted by another worker meanwhile
+            from pyinstrument.session import Session
+
+            fields = json.loads(summary)
+            fields["created_at"] = datetime.fromisoformat(fields["created_at"])
+            return RequestProfile(**fields, session=Session.from_json(json.loads(session)))
+        return None
+
+    def summaries(self) -> list[dict]:
+        """Newest first."""
+        summaries = []
+        for path in reversed(self._paths()):
+            try:
+                with path.open() as handle:
+                    summaries.append(json.loads(handle.readline()))
+            except FileNotFoundError:
+                continue
+        return summaries
+
+    def clear(self) -> None:
+        for path in self._paths():
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._paths())
+
+    async def save(self, profile: RequestProfile) -> None:
+        """``add`` on a thread, so serializing the session does not block the loop."""
+        await asyncio.to_thread(self.add, profile)
+
+
+profile_store = (
+    SharedProfileStore(settings.profiling_buffer_size, Path(settings.profiling_dir))
+    if settings.profiling_dir
+    else ProfileStore(settings.profiling_buffer_size)
+)
@@ -0,0 +1,249 @@
+"""Column projections for the hot read endpoints.
+
+Loading ``Colleague``, ``TeamMembership`` or ``Order`` objects pulls their relationship
+graphs into the session's identity map: an order's items load their colleagues, which
+load every coffee option and its menu rows. Building response models from those objects
+then holds a second copy. For large teams that made peak memory per request scale with
+colleagues times options.
+
+These queries select only the columns a response needs, and each row becomes a
+``__slots__`` dataclass whose fields mirror the response schema. The route's
+``JSONSerializer`` dumps them directly and nothing is added to the session.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.coffee_option import CoffeeOption
+from app.models.colleague import Colleague
+from app.models.drink_spec import DrinkSpec
+from app.models.menu import DrinkType, MilkOption, Size
+from app.models.order import Order, OrderItem
+from app.models.team import TeamMembership, TeamRole
+from app.models.user import User
+from app.schemas.order import ConsolidatedItem
+from app.services.drink_spec import SPEC_FIELDS
+from app.services.order import consolidate_order_items
+
+
+@dataclass(slots=True)
+class CoffeeOptionRow:
+    """Fields of ``CoffeeOptionResponse``."""
+
+    id: uuid.UUID
+    colleague_id: uuid.UUID
+    drink_type_id: uuid.UUID
+    drink_type_name: str | None
+    size_id: uuid.UUID
+    size_name: str | None
+    size_abbreviation: str | None
+    milk_option_id: uuid.UUID | None
+    milk_option_name: str | None
+    sugar: int
+    notes: str | None
+    is_default: bool
+    display_order: int
+    created_at: datetime
+
+
+@dataclass(slots=True, kw_only=True)
+class ColleagueRow:
+    """Fields of ``ColleagueResponse``."""
+
+    id: uuid.UUID
+    name: str
+    usually_in: bool
+    display_order: int
+    is_active: bool
+    colleague_type: str
+    user_id: uuid.UUID | None
+    coffee_options: list[CoffeeOptionRow] = field(default_factory=list)
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(slots=True)
+class MemberRow:
+    """Fields of ``TeamMemberResponse``."""
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    email: str
+    display_name: str | None
+    role: str
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class OrderItemRow:
+    """Fields of ``OrderItemResponse``."""
+
+    id: uuid.UUID
+    order_id: uuid.UUID
+    colleague_id: uuid.UUID
+    colleague_name: str | None
+    coffee_option_id: uuid.UUID
+    drink_type_name: str
+    size_name: str
+    size_abbreviation: str
+    milk_option_name: str | None
+    sugar: int
+    notes: str | None
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class OrderRow:
+    """Fields of ``OrderResponse``."""
+
+    id: uuid.UUID
+    share_token: str
+    created_by: uuid.UUID
+    created_at: datetime
+    items: list[OrderItemRow]
+    consolidated: list[ConsolidatedItem]
+
+
+async def colleague_rows(
+    db: AsyncSession, team_id: uuid.UUID, colleague_type: str | None = None
+) -> list[ColleagueRow]:
+    """Active colleagues of a team with their coffee options, in display order."""
+    conditions = [Colleague.team_id == team_id, Colleague.is_active == True]  # noqa: E712
+    if colleague_type is not None:
+        conditions.append(Colleague.colleague_type == colleague_type)
+
+    colleagues: dict[uuid.UUID, ColleagueRow] = {}
+    result = await db.execute(
+        select(
+            Colleague.id,
+            Colleague.name,
+            Colleague.usually_in,
+            Colleague.display_order,
+            Colleague.is_active,
+            Colleague.colleague_type,
+            Colleague.user_id,
+            Colleague.created_at,
+            Colleague.updated_at,
+        )
+        .where(*conditions)
+        .order_by(Colleague.display_order, Colleague.name)
+    )
+    for row in result:
+        colleagues[row.id] = ColleagueRow(
+            id=row.id,
+            name=row.name,
+            usually_in=row.usually_in,
+            display_order=row.display_order,
+            is_active=row.is_active,
+            colleague_type=row.colleague_type.value,
+            user_id=row.user_id,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+    if not colleagues:
+        return []
+
+    options = await db.execute(
+        select(
+            CoffeeOption.id,
+            CoffeeOption.colleague_id,
+            CoffeeOption.drink_type_id,
+            DrinkType.name,
+            CoffeeOption.size_id,
+            Size.name,
+            Size.abbreviation,
+            CoffeeOption.milk_option_id,
+            MilkOption.name,
+            CoffeeOption.sugar,
+            CoffeeOption.notes,
+            CoffeeOption.is_default,
+            CoffeeOption.display_order,
+            CoffeeOption.created_at,
+        )
+        .join(Colleague, Colleague.id == CoffeeOption.colleague_id)
+        .join(DrinkType, DrinkType.id == CoffeeOption.drink_type_id)
+        .join(Size, Size.id == CoffeeOption.size_id)
+        .outerjoin(MilkOption, MilkOption.id == CoffeeOption.milk_option_id)
+        .where(*conditions)
+        .order_by(CoffeeOption.display_order, CoffeeOption.created_at, CoffeeOption.id)
+    )
+    # Every row arrives with fresh copies of ids and names most options share: reuse the
+    # colleague's id, and one object per distinct menu value
+    shared: dict = {}
+    for row in options:
+        colleague = colleagues[row[1]]
+        menu = [shared.setdefault(value, value) for value in row[2:9]]
+        colleague.coffee_options.append(CoffeeOptionRow(row[0], colleague.id, *menu, *row[9:]))
+    return list(colleagues.values())
+
+
+_ROLE_ORDER = {TeamRole.owner: 0, TeamRole.manager: 1, TeamRole.member: 2}
+
+
+async def member_rows(db: AsyncSession, team_id: uuid.UUID) -> list[MemberRow]:
+    """Members of a team: owner first, then managers, then members, each by email."""
+    result = await db.execute(
+        select(
+            TeamMembership.id,
+            TeamMembership.user_id,
+            User.email,
+            User.display_name,
+            TeamMembership.role,
+            TeamMembership.created_at,
+        )
+        .join(User, User.id == TeamMembership.user_id)
+        .where(TeamMembership.team_id == team_id)
+    )
+    rows = sorted(result, key=lambda row: (_ROLE_ORDER.get(row.role, 3), row.email))
+    return [
+        MemberRow(row.id, row.user_id, row.email, row.display_name, row.role.value, row.created_at)
+        for row in rows
+    ]
+
+
+async def order_row(db: AsyncSession, order_id: uuid.UUID, team_id: uuid.UUID) -> OrderRow | None:
+    """One of the team's orders with its items and consolidated summary, or None."""
+    order = (
+        await db.execute(
+            select(Order.id, Order.share_token, Order.created_by, Order.created_at).where(
+                Order.id == order_id, Order.team_id == team_id
+            )
+        )
+    ).one_or_none()
+    if order is None:
+        return None
+
+    result = await db.execute(
+        select(
+            OrderItem.id,
+            OrderItem.order_id,
+            OrderItem.colleague_id,
+            Colleague.name,
+            OrderItem.coffee_option_id,
+            *(getattr(DrinkSpec, name) for name in SPEC_FIELDS),
+            OrderItem.created_at,
+        )
+        .join(DrinkSpec, DrinkSpec.id == OrderItem.drink_spec_id)
+        .outerjoin(Colleague, Colleague.id == OrderItem.colleague_id)
+        .where(OrderItem.order_id == order_id)
+        .order_by(OrderItem.created_at, OrderItem.id)
+    )
+    shared: dict = {}
+    items = [
+        OrderItemRow(
+            row[0],
+            order.id,
+            *row[2:5],
+            *(shared.setdefault(value, value) for value in row[5:11]),
+            row[11],
+        )
+        for row in result
+    ]
+    consolidated = consolidate_order_items(
+        [{name: getattr(item, name) for name in SPEC_FIELDS} for item in items]
+    )
+    return OrderRow(*order, items=items, consolidated=consolidated)
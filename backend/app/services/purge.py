@@ -0,0 +1,208 @@
+import logging
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session
+from app.models.archive import OrderArchive, OrderItemArchive
+from app.models.coffee_option import CoffeeOption
+from app.models.colleague import Colleague
+from app.models.menu import DrinkType, MilkOption, Size
+from app.models.order import Order, OrderItem
+from app.models.order_template import OrderTemplate, OrderTemplateItem
+from app.models.drink_frequency import DrinkFrequency
+from app.models.drink_spec import DrinkSpec
+from app.models.presence import ColleaguePresence
+from app.models.team import Team, TeamInvite, TeamMembership
+from app.services import analytics
+from app.services.background import exclusive_lock
+
+logger = logging.getLogger(__name__)
+
+LOCK_PATH = Path(tempfile.gettempdir()) / "coffeerun-team-purge.lock"
+
+_ARCHIVED_ORDER_COLUMNS = ["id", "team_id", "share_token", "created_by", "created_at"]
+_ARCHIVED_ITEM_COLUMNS = [
+    "id",
+    "order_id",
+    "colleague_id",
+    "colleague_name",
+    "coffee_option_id",
+    "drink_type_name",
+    "size_name",
+    "size_abbreviation",
+    "milk_option_name",
+    "sugar",
+    "notes",
+    "created_at",
+]
+
+
+async def move_orders_chunk(
+    db: AsyncSession,
+    order_ids: list[uuid.UUID],
+    archive: bool = True,
+) -> None:
+    """Copy the given orders and their items to the archive tables (INSERT ... SELECT),
+    then delete them from the hot tables."""
+    if archive:
+        await db.execute(
+            insert(OrderArchive).from_select(
+                _ARCHIVED_ORDER_COLUMNS,
+                select(
+                    Order.id, Order.team_id, Order.share_token, Order.created_by, Order.created_at
+                ).where(Order.id.in_(order_ids)),
+            )
+        )
+        await db.execute(
+            insert(OrderItemArchive).from_select(
+                _ARCHIVED_ITEM_COLUMNS,
+                select(
+                    OrderItem.id,
+                    OrderItem.order_id,
+                    OrderItem.colleague_id,
+                    Colleague.name,
+                    OrderItem.coffee_option_id,
+                    DrinkSpec.drink_type_name,
+                    DrinkSpec.size_name,
+                    DrinkSpec.size_abbreviation,
+                    DrinkSpec.milk_option_name,
+                    DrinkSpec.sugar,
+                    DrinkSpec.notes,
+                    OrderItem.created_at,
+                )
+                .join(DrinkSpec, OrderItem.drink_spec_id == DrinkSpec.id)
+                .outerjoin(Colleague, OrderItem.colleague_id == Colleague.id)
+                .where(OrderItem.order_id.in_(order_ids)),
+            )
+        )
+
+    await db.execute(
+        delete(OrderItem)
+        .where(OrderItem.order_id.in_(order_ids))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        delete(Order).where(Order.id.in_(order_ids)).execution_options(synchronize_session=False)
+    )
+
+
+async def purge_team(
+    session_factory: async_sessionmaker[AsyncSession],
+    team_id: uuid.UUID,
+    chunk_size: int | None = None,
+    archive: bool | None = None,
+) -> int:
+    """Remove an inactive team's rows from every hot table.
+
+    Orders are moved in chunks of ``chunk_size``, one transaction per chunk, so the job
+    never holds long locks. Returns the number of orders moved.
+    """
+    chunk_size = chunk_size or settings.team_purge_chunk_size
+    if archive is None:
+        archive = settings.team_purge_mode == "archive"
+
+    moved = 0
+    while True:
+        async with session_factory() as db:
+            order_ids = (
+                (
+                    await db.execute(
+                        select(Order.id).where(Order.team_id == team_id).limit(chunk_size)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            if not order_ids:
+                break
+            await move_orders_chunk(db, list(order_ids), archive=archive)
+            await db.commit()
+            moved += len(order_ids)
+
+    # Everything else is small per team; clear it in one transaction, children first
+    async with session_factory() as db:
+        team_colleagues = select(Colleague.id).where(Colleague.team_id == team_id)
+        team_templates = select(OrderTemplate.id).where(OrderTemplate.team_id == team_id)
+        statements = [
+            delete(OrderTemplateItem).where(OrderTemplateItem.template_id.in_(team_templates)),
+            delete(OrderTemplate).where(OrderTemplate.team_id == team_id),
+            delete(ColleaguePresence).where(ColleaguePresence.team_id == team_id),
+            delete(DrinkFrequency).where(DrinkFrequency.team_id == team_id),
+            delete(CoffeeOption).where(CoffeeOption.colleague_id.in_(team_colleagues)),
+            delete(TeamInvite).where(TeamInvite.team_id == team_id),
+            delete(Colleague).where(Colleague.team_id == team_id),
+            delete(DrinkType).where(DrinkType.team_id == team_id),
+            delete(Size).where(Size.team_id == team_id),
+            delete(MilkOption).where(MilkOption.team_id == team_id),
+            delete(TeamMembership).where(TeamMembership.team_id == team_id),
+        ]
+        for statement in statements:
+            await db.execute(statement.execution_options(synchronize_session=False))
+
+        team = (await db.execute(select(Team).where(Team.id == team_id))).scalar_one()
+        team.purged_at = datetime.now(timezone.utc)
+        await db.commit()
+
+    if analytics.analytics_store is not None:
+        # The columnar copy of the team's order history goes too
+        analytics.analytics_store.drop_team(team_id)
+    return moved
+
+
+async def purge_inactive_teams(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    chunk_size: int | None = None,
+    archive: bool | None = None,
+    grace_days: int | None = None,
+) -> int:
+    """Purge every team deleted more than ``grace_days`` ago. Returns teams purged.
+
+    A lock file lets one process per host run it; the others skip and return 0.
+    """
+    with exclusive_lock(LOCK_PATH) as locked:
+        if not locked:
+            return 0
+        return await _purge_inactive_teams(session_factory, chunk_size, archive, grace_days)
+
+
+async def _purge_inactive_teams(
+    session_factory: async_sessionmaker[AsyncSession],
+    chunk_size: int | None,
+    archive: bool | None,
+    grace_days: int | None,
+) -> int:
+    if grace_days is None:
+        grace_days = settings.team_purge_grace_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=grace_days)
+
+    async with session_factory() as db:
+        team_ids = (
+            (
+                await db.execute(
+                    select(Team.id).where(
+                        Team.is_active == False,  # noqa: E712
+                        Team.purged_at.is_(None),
+                        Team.updated_at <= cutoff,
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    purged = 0
+    for team_id in team_ids:
+        try:
+            moved = await purge_team(session_factory, team_id, chunk_size, archive)
+        except Exception:
+            logger.exception("Failed to purge team %s", team_id)
+            continue
+        logger.info("Purged team %s (%d orders moved)", team_id, moved)
+        purged += 1
+    return purged
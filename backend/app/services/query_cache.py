@@ -0,0 +1,98 @@
+"""Hit/miss counters for SQLAlchemy's compiled-statement cache.
+
+SQLAlchemy compiles each distinct statement shape once per engine and reuses the SQL
+string while the statement's cache key stays the same. A statement whose key changes on
+every call (an inlined literal, a per-request construct the cache can't key) shows up
+here as repeated misses for the same SQL text.
+"""
+
+import logging
+import os
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+logger = logging.getLogger(__name__)
+
+# Distinct SQL strings tracked for repeat misses; beyond this only totals are counted
+_MAX_TRACKED_STATEMENTS = 500
+
+
+class QueryCacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self._misses_by_statement: Counter[str] = Counter()
+        self._engine: Engine | None = None
+
+    def attach(self, engine: Engine) -> None:
+        self._engine = engine
+        event.listen(engine, "after_cursor_execute", self._record)
+
+    def detach(self) -> None:
+        if self._engine is not None:
+            event.remove(self._engine, "after_cursor_execute", self._record)
+            self._engine = None
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CACHE_HIT:
+            self.hits += 1
+        elif cache_hit is CACHE_MISS:
+            self.misses += 1
+            if (
+                statement in self._misses_by_statement
+                or len(self._misses_by_statement) < _MAX_TRACKED_STATEMENTS
+            ):
+                self._misses_by_statement[statement] += 1
+        else:
+            # Driver-level SQL, DDL, or a construct that produced no cache key
+            self.uncached += 1
+
+    def hit_ratio(self) -> float | None:
+        cacheable = self.hits + self.misses
+        return self.hits / cacheable if cacheable else None
+
+    def snapshot(self, top: int = 10) -> dict:
+        compiled_cache = getattr(self._engine, "_compiled_cache", None)
+        ratio = self.hit_ratio()
+        return {
+            "pid": os.getpid(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_ratio": round(ratio, 4) if ratio is not None else None,
+            "cache_entries": len(compiled_cache) if compiled_cache is not None else None,
+            "cache_capacity": getattr(compiled_cache, "capacity", None),
+            # Compiled more than once: evicted, or its cache key is not stable
+            "repeat_misses": [
+                {"statement": statement[:200], "misses": count}
+                for statement, count in self._misses_by_statement.most_common(top)
+                if count > 1
+            ],
+        }
+
+    def reset(self) -> None:
+        self.hits = self.misses = self.uncached = 0
+        self._misses_by_statement.clear()
+
+
+query_cache_stats = QueryCacheStats()
+
+
+async def log_query_cache_stats() -> None:
+    snapshot = query_cache_stats.snapshot(top=3)
+    logger.info(
+        "Compiled query cache: hit_ratio=%s hits=%d misses=%d uncached=%d entries=%s/%s "
+        "repeat_misses=%s",
+        snapshot["hit_ratio"],
+        snapshot["hits"],
+        snapshot["misses"],
+        snapshot["uncached"],
+        snapshot["cache_entries"],
+        snapshot["cache_capacity"],
+        snapshot["repeat_misses"],
+    )
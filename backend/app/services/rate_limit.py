@@ -0,0 +1,167 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol
+
+from app.config import settings
+
+
+class RateLimitBackend(Protocol):
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Consume one token from ``key``'s bucket.
+
+        Returns 0 when the call is allowed, otherwise the seconds until a token is free.
+        """
+        ...
+
+    async def reset(self) -> None: ...
+
+
+class InMemoryRateLimitBackend:
+    """Token buckets held in this worker's memory (LRU-bounded by key count)."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (float(capacity), now))
+        tokens = min(float(capacity), tokens + (now - updated_at) * refill_per_second)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    async def reset(self) -> None:
+        self._buckets.clear()
+
+
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill)
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry = (1 - tokens) / refill
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill))
+return tostring(retry)
+"""
+
+
+class RedisRateLimitBackend:
+    """Token buckets shared by every worker through Redis (atomic via a Lua script)."""
+
+    def __init__(self, url: str, prefix: str = "coffeerun:ratelimit:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        retry_after = await self._script(
+            keys=[self.prefix + key],
+            args=[capacity, refill_per_second, time.time()],
+        )
+        return float(retry_after)
+
+    async def reset(self) -> None:
+        async for key in self._client.scan_iter(match=self.prefix + "*"):
+            await self._client.delete(key)
+
+
+_backend: RateLimitBackend | None = None
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        if settings.rate_limit_backend == "redis":
+            _backend = RedisRateLimitBackend(settings.redis_url)
+        else:
+            _backend = InMemoryRateLimitBackend()
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend | None) -> None:
+    """Plug in a custom shared backend (or None to fall back to the configured one)."""
+    global _backend
+    _backend = backend
+
+
+async def check_rate_limit(key: str, capacity: int, window_seconds: float) -> float:
+    """Take a token from a bucket of ``capacity`` that fully refills over ``window_seconds``.
+
+    Returns 0 when allowed, otherwise the number of seconds the caller should wait.
+    """
+    if capacity <= 0:
+        return 0.0
+    return await get_rate_limit_backend().take(key, capacity, capacity / window_seconds)
+
+
+class RequestCoalescer:
+    """Collapse repeated calls for the same key within a window into the first call.
+
+    Callers arriving while the first call is in flight wait for it; callers arriving
+    after it finished (but inside the window) return its result immediately. If the
+    first call fails, the next caller runs the work itself.
+    """
+
+    def __init__(self, window_seconds: float, max_keys: int = 10_000):
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._entries: dict[str, tuple[float, asyncio.Future]] = {}
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """Return ``(result, coalesced)``; ``coalesced`` is True when ``fn`` was skipped."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.window_seconds:
+            ok, result = await asyncio.shield(entry[1])
+            if ok:
+                return result, True
+
+        self._prune(now)
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (now, future)
+        try:
+            result = await fn()
+        except BaseException:
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            future.set_result((False, None))
+            raise
+        future.set_result((True, result))
+        return result, False
+
+    def reset(self) -> None:
+        self._entries.clear()
+
+    def _prune(self, now: float) -> None:
+        if len(self._entries) < self.max_keys:
+            return
+        expired = [
+            key
+            for key, (started_at, future) in self._entries.items()
+            if future.done() and now - started_at >= self.window_seconds
+        ]
+        for key in expired:
+            del self._entries[key]
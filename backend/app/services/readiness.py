@@ -0,0 +1,123 @@
+"""Readiness checks behind ``GET /api/ready``.
+
+``/api/health`` only says the process is alive. ``/api/ready`` says whether this worker
+should be sent traffic: it is not ready while the lifespan warm-up is still running, when
+the database does not answer within ``ready_db_timeout_seconds``, when every pooled
+connection is checked out, when the schema is not at the migration head, or when the
+event loop is too busy to run a callback within ``ready_max_loop_lag_seconds``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+from app.database import engine
+from app.services.warmup import WarmupStatus, warmup_status
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+@dataclass
+class Readiness:
+    status: str = "ready"  # "ready", "warming" or "not_ready"
+    checks: dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def add(self, name: str, ok: bool, **detail) -> None:
+        self.checks[name] = {"ok": ok, **detail}
+        if not ok and self.status == "ready":
+            self.status = "not_ready"
+
+
+@lru_cache(maxsize=1)
+def migration_heads() -> frozenset[str]:
+    """Head revisions of the migration scripts shipped with this code."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(_BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(_BACKEND_DIR / "alembic"))
+    return frozenset(ScriptDirectory.from_config(config).get_heads())
+
+
+def _current_heads(connection) -> set[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+def pool_usage(engine: AsyncEngine) -> dict | None:
+    """Checked-out connections against the pool's limit; None for unpooled engines."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    limit = pool.size() + max(pool._max_overflow, 0)
+    return {"checked_out": pool.checkedout(), "limit": limit}
+
+
+async def loop_lag() -> float:
+    """Seconds the loop took to come back to this task after yielding once."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.sleep(0)
+    return loop.time() - start
+
+
+async def check_readiness(
+    engine: AsyncEngine = engine,
+    status: WarmupStatus = warmup_status,
+    check_migrations: bool | None = None,
+) -> Readiness:
+    if check_migrations is None:
+        check_migrations = settings.ready_check_migrations
+    result = Readiness()
+    if not status.done:
+        # Not worth probing further: the warm-up is opening connections right now
+        result.status = "warming"
+        return result
+
+    usage = pool_usage(engine)
+    if usage is not None:
+        result.add("pool", usage["checked_out"] < usage["limit"], **usage)
+    if usage is None or result.checks["pool"]["ok"]:
+        await _check_database(result, engine, check_migrations)
+
+    lag = await loop_lag()
+    result.add(
+        "event_loop",
+        lag <= settings.ready_max_loop_lag_seconds,
+        lag_ms=round(lag * 1000, 1),
+    )
+    return result
+
+
+async def _check_database(result: Readiness, engine: AsyncEngine, check_migrations: bool):
+    async def _probe() -> set[str] | None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            return await conn.run_sync(_current_heads) if check_migrations else None
+
+    started = time.perf_counter()
+    try:
+        current = await asyncio.wait_for(_probe(), settings.ready_db_timeout_seconds)
+    except asyncio.TimeoutError:
+        result.add("database", False, error="timeout")
+        return
+    except Exception as exc:
+        result.add("database", False, error=type(exc).__name__)
+        return
+    result.add("database", True, latency_ms=round((time.perf_counter() - started) * 1000, 1))
+
+    if check_migrations:
+        heads = migration_heads()
+        result.add("migrations", current == heads, current=sorted(current), head=sorted(heads))
@@ -1,11 +1,12 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.menu import DrinkType, MilkOption, Size
-from app.models.team import TeamInvite
+from app.models.team import TeamInvite, TeamMembership
+from app.models.user import User
 from app.services.auth import generate_magic_token, hash_token
 
 SEED_DRINK_TYPES = [
@@ -74,3 +75,26 @@ async def verify_invite_token(db: AsyncSession, token: str) -> TeamInvite | None
         )
     )
     return result.scalar_one_or_none()
+
+
+async def bump_membership_version(
+    db: AsyncSession,
+    user_ids: list[uuid.UUID] | None = None,
+    team_id: uuid.UUID | None = None,
+) -> None:
+    """Invalidate the /auth/me ETag for the given users and/or every member of a team."""
+    conditions = []
+    if user_ids:
+        conditions.append(User.id.in_(user_ids))
+    if team_id is not None:
+        conditions.append(
+            User.id.in_(select(TeamMembership.user_id).where(TeamMembership.team_id == team_id))
+        )
+    if not conditions:
+        return
+    await db.execute(
+        update(User)
+        .where(or_(*conditions))
+        .values(membership_version=User.membership_version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,128 @@
+"""Worker warm-up, run from the lifespan before the worker accepts traffic.
+
+Pays the one-off costs a cold worker would otherwise charge to its first requests:
+lazily imported optional dependencies, opening pooled database connections and the
+first compile of the hot statements (SQLAlchemy caches compiled SQL per engine, so
+executing each statement once with a key that matches nothing fills the cache).
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session, engine
+from app.middleware.auth import _membership_query, _user_query
+from app.models.menu import DrinkType, MilkOption, Size
+from app.models.user import MagicLinkToken
+from app.routers.menu import _active_items_query
+from app.routers.shared_orders import _shared_order_query
+from app.services.auth import create_jwt, verify_jwt
+from app.services.projections import colleague_rows, member_rows, order_row
+
+logger = logging.getLogger(__name__)
+
+_NO_MATCH = uuid.UUID(int=0)
+
+
+@dataclass
+class WarmupStatus:
+    done: bool = False
+    duration_ms: float | None = None
+    steps: dict[str, float] = field(default_factory=dict)
+
+
+warmup_status = WarmupStatus()
+
+
+def optional_modules() -> list[str]:
+    """Lazily imported dependencies the current configuration will use."""
+    modules = []
+    if settings.resend_api_key:
+        modules.append("resend")
+    if settings.jwt_backend == "pyjwt":
+        modules.append("jwt")
+    if settings.rate_limit_backend == "redis":
+        modules.append("redis.asyncio")
+    if settings.compression_enabled:
+        modules.append("brotli")
+    if settings.profiling_token:
+        modules.append("pyinstrument.renderers")
+    if settings.analytics_dir:
+        modules.append("duckdb")
+    return modules
+
+
+def preimport_modules(modules: list[str]) -> list[str]:
+    """Import what is installed; returns the modules actually imported."""
+    imported = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        imported.append(name)
+    return imported
+
+
+async def prime_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` pooled connections concurrently so they are ready for reuse."""
+
+    async def _open() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_open() for _ in range(max(connections, 0))))
+
+
+async def compile_hot_queries(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    statements = [
+        _user_query(_NO_MATCH),
+        select(MagicLinkToken).where(MagicLinkToken.token_hash == ""),
+        _membership_query(_NO_MATCH, _NO_MATCH),
+        *(_active_items_query(model, _NO_MATCH) for model in (DrinkType, Size, MilkOption)),
+        _shared_order_query(""),
+    ]
+    async with session_factory() as db:
+        for statement in statements:
+            await db.execute(statement)
+        # Projections behind the colleague, member and order reads
+        await colleague_rows(db, _NO_MATCH)
+        await member_rows(db, _NO_MATCH)
+        await order_row(db, _NO_MATCH, _NO_MATCH)
+
+
+async def warm_up(
+    engine: AsyncEngine = engine,
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    status: WarmupStatus = warmup_status,
+) -> WarmupStatus:
+    """Run every warm-up step; a failing step is logged and skipped, never fatal."""
+    started = time.perf_counter()
+
+    async def _step(name: str, coro_or_fn) -> None:
+        step_started = time.perf_counter()
+        try:
+            result = coro_or_fn()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception:
+            logger.exception("Warm-up step %s failed", name)
+        status.steps[name] = round((time.perf_counter() - step_started) * 1000, 1)
+
+    await _step("imports", lambda: preimport_modules(optional_modules()))
+    # First JWT round trip loads the crypto backend
+    await _step("jwt", lambda: verify_jwt(create_jwt(_NO_MATCH, "warmup@example.com")))
+    await _step("pool", lambda: prime_pool(engine, settings.warmup_pool_connections))
+    await _step("queries", lambda: compile_hot_queries(session_factory))
+
+    status.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    status.done = True
+    logger.info("Warm-up finished in %.1fms: %s", status.duration_ms, status.steps)
+    return status
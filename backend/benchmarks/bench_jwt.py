@@ -0,0 +1,52 @@
+"""Microbenchmark: per-request JWT verification cost, uncached vs cached.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_jwt.py [--iterations 20000]
+"""
+
+import argparse
+import json
+import timeit
+import uuid
+
+from app.config import settings
+from app.services.auth import claims_cache, create_jwt, decode_jwt, verify_jwt
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    return timeit.timeit(fn, number=iterations) / iterations * 1e6
+
+
+def run(iterations: int) -> dict:
+    token = create_jwt(uuid.uuid4(), "bench@example.com")
+    results = {}
+
+    settings.jwt_backend = "jose"
+    results["jose_uncached_us"] = _per_call_us(lambda: verify_jwt(token), iterations)
+
+    try:
+        import jwt  # noqa: F401
+
+        settings.jwt_backend = "pyjwt"
+        results["pyjwt_uncached_us"] = _per_call_us(lambda: verify_jwt(token), iterations)
+    except ImportError:
+        results["pyjwt_uncached_us"] = None
+    finally:
+        settings.jwt_backend = "jose"
+
+    claims_cache.clear()
+    decode_jwt(token)
+    results["cached_us"] = _per_call_us(lambda: decode_jwt(token), iterations)
+    results["speedup_vs_jose"] = results["jose_uncached_us"] / results["cached_us"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Microbenchmark: response serialization cost for a 100-colleague dashboard list.
+
+Compares FastAPI's default path (validate the returned value against response_model,
+serialize to Python objects, render with json or orjson) with the JSONSerializer fast
+path used by hot endpoints (one compiled TypeAdapter.dump_json call).
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_serialization.py [--iterations 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.responses import JSONSerializer
+from app.schemas.colleague import CoffeeOptionResponse, ColleagueResponse
+
+
+def _colleagues(count: int) -> list[ColleagueResponse]:
+    now = datetime.now(timezone.utc)
+    colleagues = []
+    for i in range(count):
+        colleague_id = uuid.uuid4()
+        options = [
+            CoffeeOptionResponse(
+                id=uuid.uuid4(),
+                colleague_id=colleague_id,
+                drink_type_id=uuid.uuid4(),
+                drink_type_name="Flat White",
+                size_id=uuid.uuid4(),
+                size_name="Regular",
+                size_abbreviation="Reg",
+                milk_option_id=uuid.uuid4(),
+                milk_option_name="Oat",
+                sugar=1,
+                notes=None,
+                is_default=o == 0,
+                display_order=o,
+                created_at=now,
+            )
+            for o in range(2)
+        ]
+        colleagues.append(
+            ColleagueResponse(
+                id=colleague_id,
+                name=f"Colleague {i}",
+                usually_in=True,
+                display_order=i,
+                is_active=True,
+                coffee_options=options,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+    return colleagues
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    return timeit.timeit(fn, number=iterations) / iterations * 1e6
+
+
+def run(iterations: int, count: int = 100) -> dict:
+    content = _colleagues(count)
+    field = create_model_field(name="Response", type_=list[ColleagueResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default(response_class):
+        def render():
+            value = loop.run_until_complete(
+                serialize_response(field=field, response_content=content)
+            )
+            return response_class(value).body
+
+        return render
+
+    serializer = JSONSerializer(list[ColleagueResponse])
+    results = {
+        "fastapi_json_us": _per_call_us(fastapi_default(JSONResponse), iterations),
+        "fastapi_orjson_us": _per_call_us(fastapi_default(ORJSONResponse), iterations),
+        "compiled_dump_json_us": _per_call_us(lambda: serializer.response(content), iterations),
+    }
+    loop.close()
+    results["speedup_vs_json"] = results["fastapi_json_us"] / results["compiled_dump_json_us"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Cold-start benchmark: import, lifespan and first-request latency of a fresh worker.
+
+Each run starts a new interpreter, so nothing is shared between runs. The child times
+``import app.main``, the lifespan startup (warm-up included when enabled) and the first
+two requests to a database-backed route. Runs alternate STARTUP_WARMUP=true/false so the
+cost the warm-up moves from the first request to startup is visible side by side.
+
+Usage (from backend/, against an already migrated database):
+    PYTHONPATH=. python benchmarks/bench_startup.py --database-url sqlite:///./bench.db \\
+        [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_CHILD = """
+import asyncio, json, time
+import httpx
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def main():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=app.main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            t0 = time.perf_counter()
+            await client.get("/api/v1/orders/share/does-not-exist")
+            t1 = time.perf_counter()
+            await client.get("/api/v1/orders/share/does-not-exist")
+            t2 = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "lifespan_ms": (ready - imported) * 1000,
+        "first_request_ms": (t1 - t0) * 1000,
+        "second_request_ms": (t2 - t1) * 1000,
+        "ready_to_first_response_ms": (t1 - started) * 1000,
+    }))
+
+asyncio.run(main())
+"""
+
+
+def run_once(database_url: str, warmup: bool) -> dict[str, float]:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "ENVIRONMENT": "benchmark",
+        "STARTUP_WARMUP": "true" if warmup else "false",
+        "PYTHONPATH": ".",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmark(database_url: str, runs: int) -> dict[str, dict[str, float]]:
+    samples: dict[str, list[dict[str, float]]] = {"warmup": [], "no_warmup": []}
+    for _ in range(runs):
+        samples["warmup"].append(run_once(database_url, warmup=True))
+        samples["no_warmup"].append(run_once(database_url, warmup=False))
+    return {
+        mode: {key: round(statistics.median(r[key] for r in results), 1) for key in results[0]}
+        for mode, results in samples.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", ""))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    results = run_benchmark(args.database_url, args.runs)
+    keys = list(results["warmup"])
+    print(f"{'median ms':<28}{'warm-up':>10}{'no warm-up':>12}")
+    for key in keys:
+        print(f"{key:<28}{results['warmup'][key]:>10}{results['no_warmup'][key]:>12}")
+
+
+if __name__ == "__main__":
+    main()
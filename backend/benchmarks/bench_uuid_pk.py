@@ -0,0 +1,163 @@
+"""Insert throughput and primary-key index size: random uuid4 vs time-ordered uuid7 keys.
+
+Each key kind gets its own scratch table shaped like ``order_items`` (UUID primary key,
+an indexed UUID foreign key column, a few payload columns). Rows are inserted in
+batches through Core executemany, the way the API and the seed script write, and the
+final size of the primary-key index and the table is read from the database:
+``pg_relation_size`` on PostgreSQL, the ``dbstat`` virtual table on SQLite. Random keys
+spread inserts over every leaf page of the index, so as the index outgrows the page
+cache the late batches slow down; the ``last_batches_rows_per_s`` column shows that.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_uuid_pk.py --database-url sqlite:///./bench.db
+    PYTHONPATH=. python benchmarks/bench_uuid_pk.py --database-url postgresql://... \\
+        [--rows 1000000] [--batch 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Uuid,
+    insert,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.models.ids import uuid7
+from benchmarks.seed import to_async_url
+
+KEY_KINDS: dict[str, Callable[[], uuid.UUID]] = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+# Share of batches, at the end of the run, reported separately
+_TAIL = 0.1
+
+
+def _table(kind: str) -> Table:
+    name = f"bench_pk_{kind}"
+    return Table(
+        name,
+        MetaData(),
+        Column("id", Uuid, primary_key=True),
+        Column("order_id", Uuid, nullable=False),
+        Column("drink_type_name", String(100), nullable=False),
+        Column("sugar", Integer, nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False),
+        Index(f"ix_{name}_order_id", "order_id"),
+    )
+
+
+async def _sizes(engine: AsyncEngine, table: Table) -> dict:
+    async with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            row = (
+                await conn.execute(
+                    text(
+                        "SELECT pg_relation_size(:pk), pg_relation_size(:fk), "
+                        "pg_relation_size(:table)"
+                    ),
+                    {
+                        "pk": f"{table.name}_pkey",
+                        "fk": f"ix_{table.name}_order_id",
+                        "table": table.name,
+                    },
+                )
+            ).one()
+        else:
+            # dbstat needs SQLITE_ENABLE_DBSTAT_VTAB, which the CPython builds ship with
+            sizes = dict(
+                (
+                    await conn.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+                ).all()
+            )
+            row = (
+                sizes.get(f"sqlite_autoindex_{table.name}_1"),
+                sizes.get(f"ix_{table.name}_order_id"),
+                sizes.get(table.name),
+            )
+    pk_bytes, fk_bytes, table_bytes = row
+    return {
+        "pk_index_mb": round(pk_bytes / 2**20, 2),
+        "order_id_index_mb": round(fk_bytes / 2**20, 2),
+        "table_mb": round(table_bytes / 2**20, 2),
+    }
+
+
+async def run_kind(engine: AsyncEngine, kind: str, rows: int, batch: int) -> dict:
+    new_id = KEY_KINDS[kind]
+    table = _table(kind)
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop, checkfirst=True)
+        await conn.run_sync(table.create)
+
+    batch_seconds = []
+    order_id = new_id()
+    for start in range(0, rows, batch):
+        now = datetime.now(timezone.utc)
+        values = []
+        for i in range(start, min(start + batch, rows)):
+            if i % 8 == 0:
+                order_id = new_id()
+            values.append(
+                {
+                    "id": new_id(),
+                    "order_id": order_id,
+                    "drink_type_name": "Flat White",
+                    "sugar": i % 3,
+                    "created_at": now,
+                }
+            )
+        t0 = time.perf_counter()
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), values)
+        batch_seconds.append((time.perf_counter() - t0, len(values)))
+
+    total_seconds = sum(seconds for seconds, _ in batch_seconds)
+    tail = batch_seconds[-max(1, int(len(batch_seconds) * _TAIL)) :]
+    result = {
+        "rows": rows,
+        "rows_per_s": round(rows / total_seconds),
+        "last_batches_rows_per_s": round(
+            sum(n for _, n in tail) / sum(seconds for seconds, _ in tail)
+        ),
+        **await _sizes(engine, table),
+    }
+    async with engine.begin() as conn:
+        await conn.run_sync(table.drop)
+    return result
+
+
+async def run(database_url: str, rows: int, batch: int) -> dict:
+    engine = create_async_engine(to_async_url(database_url))
+    try:
+        return {
+            "dialect": engine.dialect.name,
+            **{kind: await run_kind(engine, kind, rows, batch) for kind in KEY_KINDS},
+        }
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.database_url, args.rows, args.batch)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""SQLite database size and join latency: UUIDs as 16-byte BLOBs vs 32-character hex.
+
+Takes a seeded, migrated SQLite database (see seed.py), makes two copies of it, one
+with UUIDs as BLOBs (the current storage) and one converted back to hex text the way
+migration 009's downgrade does, and VACUUMs both. It reports the file size, the size of
+``order_items`` and its indexes, and the median latency of the statistics joins
+(order_items -> orders -> colleagues for one team) on each copy. The queries are run
+through the sqlite3 module directly so only storage differs between the two runs.
+PostgreSQL stores ``uuid`` natively in 16 bytes, so there is nothing to compare there.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/seed.py --database-url sqlite:///./bench.db --scale full
+    PYTHONPATH=. python benchmarks/bench_uuid_storage.py --database-url sqlite:///./bench.db \\
+        [--repeat 20]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+_MIGRATION = Path(__file__).parent.parent / "alembic" / "versions" / "009_binary_uuids.py"
+
+# Shapes of GET /stats/drinks and GET /stats/colleagues for one team
+QUERIES = {
+    "stats_drinks": """
+        SELECT ds.drink_type_name, SUM(per_spec.n) AS total FROM (
+            SELECT oi.drink_spec_id, COUNT(*) AS n FROM order_items oi
+            JOIN orders o ON oi.order_id = o.id
+            WHERE o.team_id = ?
+            GROUP BY oi.drink_spec_id
+        ) per_spec JOIN drink_specs ds ON ds.id = per_spec.drink_spec_id
+        GROUP BY ds.drink_type_name ORDER BY total DESC LIMIT 10
+    """,
+    "stats_colleagues": """
+        SELECT c.name, COUNT(oi.id) FROM order_items oi
+        JOIN colleagues c ON oi.colleague_id = c.id
+        JOIN orders o ON oi.order_id = o.id
+        WHERE o.team_id = ? AND c.is_active = 1
+        GROUP BY c.name ORDER BY COUNT(oi.id) DESC
+    """,
+}
+
+
+def _uuid_columns() -> dict[str, list[str]]:
+    spec = importlib.util.spec_from_file_location("binary_uuids_migration", _MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    columns = {table: list(names) for table, names in module.UUID_COLUMNS.items()}
+    # Added after migration 009
+    columns["drink_specs"] = ["id"]
+    columns["order_items"].append("drink_spec_id")
+    return columns
+
+
+def _to_hex(conn: sqlite3.Connection) -> None:
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    for table, columns in _uuid_columns().items():
+        if table not in tables:
+            continue
+        assignments = ", ".join(
+            f"{c} = CASE WHEN typeof({c}) = 'blob' THEN lower(hex({c})) ELSE {c} END"
+            for c in columns
+        )
+        conn.execute(f"UPDATE {table} SET {assignments}")
+    conn.commit()
+
+
+def _busiest_team(conn: sqlite3.Connection):
+    return conn.execute(
+        "SELECT team_id FROM orders GROUP BY team_id ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()[0]
+
+
+def measure(path: str, repeat: int) -> dict:
+    conn = sqlite3.connect(path)
+    try:
+        sizes = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+        index_names = [
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'order_items'"
+            )
+        ]
+        team_id = _busiest_team(conn)
+        latency = {}
+        for name, sql in QUERIES.items():
+            conn.execute(sql, (team_id,)).fetchall()  # warm the page cache
+            timings = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                conn.execute(sql, (team_id,)).fetchall()
+                timings.append((time.perf_counter() - t0) * 1000)
+            latency[f"{name}_ms"] = round(statistics.median(timings), 2)
+        return {
+            "uuid_storage": conn.execute("SELECT typeof(id) FROM orders LIMIT 1").fetchone()[0],
+            "file_mb": round(os.path.getsize(path) / 2**20, 1),
+            "order_items_mb": round(sizes.get("order_items", 0) / 2**20, 1),
+            "order_items_indexes_mb": round(
+                sum(sizes.get(name, 0) for name in index_names) / 2**20, 1
+            ),
+            **latency,
+        }
+    finally:
+        conn.close()
+
+
+def run(database_url: str, repeat: int) -> dict:
+    source = database_url.split("///", 1)[1]
+    binary, text = f"{source}.binary", f"{source}.hex"
+    results = {}
+    try:
+        shutil.copyfile(source, binary)
+        shutil.copyfile(source, text)
+        with sqlite3.connect(text) as conn:
+            _to_hex(conn)
+        for path in (binary, text):
+            conn = sqlite3.connect(path)
+            conn.execute("VACUUM")
+            conn.close()
+        results["hex"] = measure(text, repeat)
+        results["blob"] = measure(binary, repeat)
+    finally:
+        for path in (binary, text):
+            if os.path.exists(path):
+                os.remove(path)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.database_url, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Diff two loadgen.py result files.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/compare.py baseline.json candidate.json [--threshold 10]
+
+Prints the relative change per endpoint and exits non-zero when any endpoint's p95
+regressed by more than ``--threshold`` percent (or started returning errors).
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+
+def change(before: float, after: float) -> float:
+    if before == 0:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """Return (report lines, regressed endpoint names)."""
+    lines, regressed = [], []
+    header = f"{'endpoint':18}" + "".join(f"{m:>26}" for m in METRICS)
+    lines.append(header)
+    for name, after in candidate["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            lines.append(f"{name:18} (new)")
+            continue
+        cells = [
+            f"{before[m]:>9.1f} -> {after[m]:>7.1f} {change(before[m], after[m]):+5.0f}%"
+            for m in METRICS
+        ]
+        lines.append(f"{name:18}" + "".join(f"{c:>26}" for c in cells))
+        if change(before["p95_ms"], after["p95_ms"]) > threshold or (
+            after["errors"] > before["errors"]
+        ):
+            regressed.append(name)
+    return lines, regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 regression %%")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    lines, regressed = compare(baseline, candidate, args.threshold)
+    print(f"{baseline['meta'].get('commit')} -> {candidate['meta'].get('commit')}")
+    print("\n".join(lines))
+    if regressed:
+        print(f"\np95 regressed beyond {args.threshold:.0f}%: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
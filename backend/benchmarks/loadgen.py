@@ -0,0 +1,392 @@
+"""Per-endpoint latency and throughput benchmark for the API.
+
+Seed a database first (benchmarks/seed.py), then either drive the ASGI app in-process
+through httpx, or point the load generator at a running server:
+
+    PYTHONPATH=. python benchmarks/loadgen.py --database-url sqlite:///./bench.db
+    PYTHONPATH=. python benchmarks/loadgen.py --database-url postgresql://... \\
+        --base-url http://localhost:8000 --output results.json
+
+The database URL is needed in both modes: targets (teams, colleagues, share tokens) are
+sampled from it and magic-link tokens for the verify scenario are minted into it. In
+HTTP mode the server must share the same JWT_SECRET and have login rate limiting and
+coalescing disabled (LOGIN_RATE_LIMIT_PER_EMAIL=0, LOGIN_RATE_LIMIT_PER_IP=0,
+LOGIN_COALESCE_SECONDS=0), otherwise the auth scenarios measure 429s.
+
+Results are written as JSON (p50/p95/p99 latency and throughput per endpoint) so two
+runs can be diffed with benchmarks/compare.py.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+SCENARIOS = (
+    "auth_login",
+    "auth_verify",
+    "colleague_list",
+    "order_create",
+    "shared_order",
+    "stats_overview",
+    "stats_drinks",
+    "stats_colleagues",
+)
+
+
+@dataclass
+class Target:
+    team_id: uuid.UUID
+    owner_id: uuid.UUID
+    owner_email: str
+    # (colleague_id, coffee_option_id) pairs usable in a new order
+    choices: list[tuple[uuid.UUID, uuid.UUID]] = field(default_factory=list)
+    share_tokens: list[str] = field(default_factory=list)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    total = len(latencies) + errors
+    return {
+        "requests": total,
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "throughput_rps": round(total / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+async def load_targets(engine: AsyncEngine, teams: int, email_domain: str) -> list[Target]:
+    """Sample up to ``teams`` seeded teams with their owner, colleagues and orders."""
+    from app.models.coffee_option import CoffeeOption
+    from app.models.colleague import Colleague
+    from app.models.order import Order
+    from app.models.team import Team, TeamMembership, TeamRole
+    from app.models.user import User
+
+    async with engine.connect() as conn:
+        rows = (
+            await conn.execute(
+                select(Team.id, User.id, User.email)
+                .join(TeamMembership, TeamMembership.team_id == Team.id)
+                .join(User, User.id == TeamMembership.user_id)
+                .where(
+                    TeamMembership.role == TeamRole.owner,
+                    Team.is_active == True,  # noqa: E712
+                    User.email.like(f"%@{email_domain}"),
+                )
+                .order_by(func.random())
+                .limit(teams)
+            )
+        ).all()
+        targets = [Target(team_id=t, owner_id=u, owner_email=e) for t, u, e in rows]
+        for target in targets:
+            target.choices = [
+                (colleague_id, option_id)
+                for colleague_id, option_id in (
+                    await conn.execute(
+                        select(Colleague.id, CoffeeOption.id)
+                        .join(CoffeeOption, CoffeeOption.colleague_id == Colleague.id)
+                        .where(
+                            Colleague.team_id == target.team_id,
+                            CoffeeOption.is_default == True,  # noqa: E712
+                        )
+                    )
+                ).all()
+            ]
+            target.share_tokens = list(
+                (
+                    await conn.execute(
+                        select(Order.share_token)
+                        .where(Order.team_id == target.team_id)
+                        .order_by(Order.created_at.desc())
+                        .limit(50)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+    return targets
+
+
+async def mint_magic_tokens(
+    engine: AsyncEngine, user_ids: list[uuid.UUID], count: int
+) -> list[str]:
+    """Insert ``count`` fresh magic-link tokens (round-robin over users); returns raw tokens."""
+    from app.config import settings
+    from app.models.ids import uuid7
+    from app.models.user import MagicLinkToken
+    from app.services.auth import generate_magic_token
+
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.magic_link_expiry_minutes)
+    raw_tokens, rows = [], []
+    for i in range(count):
+        raw, hashed = generate_magic_token()
+        raw_tokens.append(raw)
+        rows.append(
+            {
+                "id": uuid7(),
+                "user_id": user_ids[i % len(user_ids)],
+                "token_hash": hashed,
+                "expires_at": expires_at,
+                "used": False,
+            }
+        )
+    if rows:
+        async with engine.begin() as conn:
+            await conn.execute(insert(MagicLinkToken), rows)
+    return raw_tokens
+
+
+def build_scenarios(
+    targets: list[Target],
+    magic_tokens: list[str],
+    rng: random.Random,
+) -> dict[str, Callable[[int], tuple[str, str, dict | None, Target | None]]]:
+    """Map scenario name -> fn(i) returning (method, path, json body, acting target)."""
+    verify_tokens = iter(magic_tokens)
+    with_orders = [t for t in targets if t.share_tokens] or targets
+
+    def pick() -> Target:
+        return rng.choice(targets)
+
+    def order_body(target: Target) -> dict:
+        picked = rng.sample(target.choices, min(8, len(target.choices)))
+        return {"items": [{"colleague_id": str(c), "coffee_option_id": str(o)} for c, o in picked]}
+
+    def stats(kind: str):
+        def build(_):
+            target = pick()
+            return "GET", f"/api/v1/teams/{target.team_id}/stats/{kind}", None, target
+
+        return build
+
+    def auth_login(_):
+        return "POST", "/api/v1/auth/login", {"email": pick().owner_email}, None
+
+    def auth_verify(_):
+        return "POST", "/api/v1/auth/verify", {"token": next(verify_tokens)}, None
+
+    def colleague_list(_):
+        target = pick()
+        return "GET", f"/api/v1/teams/{target.team_id}/colleagues", None, target
+
+    def order_create(_):
+        target = pick()
+        return "POST", f"/api/v1/teams/{target.team_id}/orders", order_body(target), target
+
+    def shared_order(_):
+        token = rng.choice(rng.choice(with_orders).share_tokens)
+        return "GET", f"/api/v1/orders/share/{token}", None, None
+
+    return {
+        "auth_login": auth_login,
+        "auth_verify": auth_verify,
+        "colleague_list": colleague_list,
+        "order_create": order_create,
+        "shared_order": shared_order,
+        "stats_overview": stats("overview"),
+        "stats_drinks": stats("drinks"),
+        "stats_colleagues": stats("colleagues"),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    build: Callable[[int], tuple[str, str, dict | None, Target | None]],
+    cookies: Callable[[Target], dict[str, str]],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            method, path, body, target = build(i)
+            headers = {}
+            if target is not None:
+                headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in cookies(target).items())
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body, headers=headers)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_benchmark(
+    client: httpx.AsyncClient,
+    engine: AsyncEngine,
+    scenarios: list[str] | tuple[str, ...] = SCENARIOS,
+    requests: int = 200,
+    concurrency: int = 8,
+    warmup: int = 10,
+    teams: int = 50,
+    email_domain: str | None = None,
+    rng_seed: int = 7,
+) -> dict:
+    """Run each scenario against ``client``; returns the JSON-serialisable report."""
+    from app.services.auth import create_jwt
+    from benchmarks.seed import BENCH_EMAIL_DOMAIN
+
+    targets = await load_targets(engine, teams, email_domain or BENCH_EMAIL_DOMAIN)
+    if not targets:
+        raise SystemExit("No seeded teams found; run benchmarks/seed.py first")
+
+    magic_tokens = []
+    if "auth_verify" in scenarios:
+        magic_tokens = await mint_magic_tokens(
+            engine, [t.owner_id for t in targets], requests + warmup
+        )
+
+    jwts = {t.team_id: create_jwt(t.owner_id, t.owner_email) for t in targets}
+    builders = build_scenarios(targets, magic_tokens, random.Random(rng_seed))
+
+    def cookies(target: Target) -> dict[str, str]:
+        return {"access_token": jwts[target.team_id]}
+
+    endpoints = {}
+    for name in scenarios:
+        if warmup:
+            await run_scenario(client, builders[name], cookies, warmup, min(concurrency, warmup))
+        endpoints[name] = await run_scenario(client, builders[name], cookies, requests, concurrency)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "dialect": engine.dialect.name,
+            "requests": requests,
+            "concurrency": concurrency,
+            "teams_sampled": len(targets),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    if args.base_url:
+        from benchmarks.seed import to_async_url
+
+        engine = create_async_engine(to_async_url(args.database_url))
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        # The app reads its settings at import time, so configure it before importing
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ.setdefault("ENVIRONMENT", "benchmark")
+        for name in ("LOGIN_RATE_LIMIT_PER_EMAIL", "LOGIN_RATE_LIMIT_PER_IP"):
+            os.environ.setdefault(name, "0")
+        os.environ.setdefault("LOGIN_COALESCE_SECONDS", "0")
+
+        from app.database import engine
+        from app.main import app
+        from app.routers import auth
+
+        async def _skip_email(email: str, token: str) -> None:
+            pass
+
+        # Measure the API, not stdout or the email provider
+        auth.send_magic_link_email = _skip_email
+        client = httpx.AsyncClient(
+            # Unhandled app errors (e.g. SQLite "database is locked") count as 500s
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://bench",
+        )
+
+    try:
+        report = await run_benchmark(
+            client,
+            engine,
+            scenarios=args.scenarios,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            warmup=args.warmup,
+            teams=args.teams,
+        )
+    finally:
+        await client.aclose()
+        await engine.dispose()
+    report["meta"]["mode"] = "http" if args.base_url else "inprocess"
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--base-url", help="Benchmark a running server instead of in-process")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--teams", type=int, default=50, help="Teams to sample targets from")
+    parser.add_argument(
+        "--scenario",
+        dest="scenarios",
+        action="append",
+        choices=SCENARIOS,
+        help="Limit to the given scenario (repeatable); default all",
+    )
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    report = asyncio.run(_main(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        for name, result in report["endpoints"].items():
+            print(
+                f"{name:18} p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+                f"p99={result['p99_ms']:8.2f}ms {result['throughput_rps']:8.1f} req/s "
+                f"errors={result['errors']}",
+                file=sys.stderr,
+            )
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
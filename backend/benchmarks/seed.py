@@ -0,0 +1,271 @@
+"""Seed a realistic multi-tenant dataset for benchmarking.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/seed.py --database-url sqlite:///./bench.db --scale full
+    PYTHONPATH=. python benchmarks/seed.py --database-url postgresql://... --no-create-schema
+
+Scales (teams / colleagues / order items):
+    small   10 /     1,000 /    50,000
+    medium 100 /    10,000 /   500,000
+    full  1000 /   100,000 / 5,000,000
+
+Every team gets an owner, the default menu, one or two coffee options per colleague
+and a year of order history. Rows go in through Core executemany in batches, so even
+the full scale runs without holding the dataset in memory.
+"""
+
+import argparse
+import asyncio
+import random
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+import app.models  # noqa: F401 — register every table on Base.metadata
+from app.models.coffee_option import CoffeeOption
+from app.models.colleague import Colleague
+from app.models.drink_spec import DrinkSpec
+from app.models.ids import uuid7
+from app.models.menu import DrinkType, MilkOption, Size
+from app.models.order import Order, OrderItem
+from app.models.team import Team, TeamMembership, TeamRole
+from app.models.user import Base, User
+from app.services.drink_spec import spec_from_values
+from app.services.team import SEED_DRINK_TYPES, SEED_MILK_OPTIONS, SEED_SIZES
+
+
+@dataclass(frozen=True)
+class Scale:
+    teams: int
+    colleagues_per_team: int
+    order_items: int
+    items_per_order: int = 8
+    history_days: int = 365
+
+
+SCALES = {
+    "tiny": Scale(teams=2, colleagues_per_team=10, order_items=80),
+    "small": Scale(teams=10, colleagues_per_team=100, order_items=50_000),
+    "medium": Scale(teams=100, colleagues_per_team=100, order_items=500_000),
+    "full": Scale(teams=1000, colleagues_per_team=100, order_items=5_000_000),
+}
+
+BATCH_SIZE = 10_000
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+
+
+def to_async_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    return url
+
+
+def owner_email(team_index: int) -> str:
+    return f"owner{team_index}@{BENCH_EMAIL_DOMAIN}"
+
+
+class _Batcher:
+    """Buffers rows per table and flushes them with executemany."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows: dict = {}
+        self.counts: dict[str, int] = {}
+
+    async def add(self, model, row: dict) -> None:
+        rows = self.rows.setdefault(model, [])
+        rows.append(row)
+        if len(rows) >= BATCH_SIZE:
+            await self.flush()
+
+    async def flush(self) -> None:
+        # Tables are flushed in first-seen order, which is parent-before-child here
+        for model, rows in self.rows.items():
+            if rows:
+                await self.conn.execute(insert(model), rows)
+                name = model.__tablename__
+                self.counts[name] = self.counts.get(name, 0) + len(rows)
+                self.rows[model] = []
+
+
+async def seed(
+    engine: AsyncEngine,
+    scale: Scale,
+    rng_seed: int = 42,
+    email_prefix: str = "",
+) -> dict[str, int]:
+    """Insert ``scale`` worth of data; returns row counts per table.
+
+    ``email_prefix`` keeps owner emails unique when seeding the same database twice.
+    """
+    rng = random.Random(rng_seed)
+    now = datetime.now(timezone.utc)
+    orders_per_team = max(1, scale.order_items // scale.items_per_order // scale.teams)
+
+    async with engine.begin() as conn:
+        batch = _Batcher(conn)
+        for t in range(scale.teams):
+            user_id, team_id = uuid7(), uuid7()
+            email = email_prefix + owner_email(t)
+            await batch.add(User, {"id": user_id, "email": email})
+            await batch.add(Team, {"id": team_id, "name": f"Bench Team {t}", "created_by": user_id})
+            await batch.add(
+                TeamMembership,
+                {
+                    "id": uuid7(),
+                    "team_id": team_id,
+                    "user_id": user_id,
+                    "role": TeamRole.owner,
+                },
+            )
+
+            drinks = [(uuid7(), name) for name, _ in SEED_DRINK_TYPES]
+            sizes = [(uuid7(), name, abbr) for name, abbr, _ in SEED_SIZES]
+            milks = [(uuid7(), name) for name, _ in SEED_MILK_OPTIONS]
+            for i, (drink_id, name) in enumerate(drinks):
+                await batch.add(
+                    DrinkType,
+                    {"id": drink_id, "team_id": team_id, "name": name, "display_order": i},
+                )
+            for i, (size_id, name, abbr) in enumerate(sizes):
+                await batch.add(
+                    Size,
+                    {
+                        "id": size_id,
+                        "team_id": team_id,
+                        "name": name,
+                        "abbreviation": abbr,
+                        "display_order": i,
+                    },
+                )
+            for i, (milk_id, name) in enumerate(milks):
+                await batch.add(
+                    MilkOption,
+                    {"id": milk_id, "team_id": team_id, "name": name, "display_order": i},
+                )
+
+            # (colleague_id, option_id, drink_spec_id)
+            choices, specs = [], {}
+            for c in range(scale.colleagues_per_team):
+                colleague_id = uuid7()
+                await batch.add(
+                    Colleague,
+                    {
+                        "id": colleague_id,
+                        "team_id": team_id,
+                        "name": f"Colleague {t}-{c}",
+                        "usually_in": rng.random() < 0.7,
+                        "display_order": c,
+                    },
+                )
+                for o in range(rng.choice((1, 1, 2))):
+                    option_id = uuid7()
+                    drink_id, drink = rng.choice(drinks)
+                    size_id, size, abbr = rng.choice(sizes)
+                    milk_id, milk = rng.choice(milks + [(None, None)])
+                    sugar = rng.choice((0, 0, 0, 1, 2))
+                    await batch.add(
+                        CoffeeOption,
+                        {
+                            "id": option_id,
+                            "colleague_id": colleague_id,
+                            "drink_type_id": drink_id,
+                            "size_id": size_id,
+                            "milk_option_id": milk_id,
+                            "sugar": sugar,
+                            "is_default": o == 0,
+                            "display_order": o,
+                        },
+                    )
+                    spec = spec_from_values(
+                        drink_type_name=drink,
+                        size_name=size,
+                        size_abbreviation=abbr,
+                        milk_option_name=milk,
+                        sugar=sugar,
+                        notes=None,
+                    )
+                    specs[spec["id"]] = spec
+                    choices.append((colleague_id, option_id, spec["id"]))
+            # Specs are shared across teams (and earlier seeds), so skip the stored ones
+            dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+            await conn.execute(
+                dialect.insert(DrinkSpec).values(list(specs.values())).on_conflict_do_nothing()
+            )
+
+            for _ in range(orders_per_team):
+                order_id = uuid7()
+                created_at = now - timedelta(seconds=rng.randrange(scale.history_days * 86400))
+                await batch.add(
+                    Order,
+                    {
+                        "id": order_id,
+                        "team_id": team_id,
+                        "share_token": secrets.token_urlsafe(48),
+                        "created_by": user_id,
+                        "created_at": created_at,
+                    },
+                )
+                for choice in rng.sample(choices, min(scale.items_per_order, len(choices))):
+                    colleague_id, option_id, drink_spec_id = choice
+                    await batch.add(
+                        OrderItem,
+                        {
+                            "id": uuid7(),
+                            "order_id": order_id,
+                            "colleague_id": colleague_id,
+                            "coffee_option_id": option_id,
+                            "drink_spec_id": drink_spec_id,
+                            "created_at": created_at,
+                        },
+                    )
+        await batch.flush()
+    return batch.counts
+
+
+def _fast_sqlite_pragmas(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(to_async_url(args.database_url))
+    if engine.dialect.name == "sqlite":
+        _fast_sqlite_pragmas(engine)
+    if args.create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    counts = await seed(engine, SCALES[args.scale], args.seed)
+    await engine.dispose()
+    print(f"Seeded {counts} in {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a benchmark dataset")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--no-create-schema",
+        dest="create_schema",
+        action="store_false",
+        help="Skip create_all (e.g. when the schema came from alembic)",
+    )
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
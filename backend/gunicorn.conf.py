@@ -1,5 +1,67 @@
-bind = "0.0.0.0:8000"
-workers = 2
-worker_class = "uvicorn.workers.UvicornWorker"
+import os
+import shutil
+import sys
+import tempfile
+
+# gunicorn loads this file before putting the working directory on sys.path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings  # noqa: E402
+from app.server_config import build_server_config, startup_report  # noqa: E402
+
+_config = build_server_config()
+
+if settings.metrics_enabled:
+    # Workers write their metrics to files here so any of them can answer a scrape for
+    # all; set before preload imports prometheus_client, and emptied of the last run's
+    _metrics_dir = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "coffeerun-metrics")
+    )
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir)
+
+if settings.profiling_token and not settings.profiling_dir:
+    # Workers save profiles here so whichever answers GET /api/profiles/<id> has them all;
+    # set before the app creates its profile store
+    settings.profiling_dir = os.path.join(tempfile.gettempdir(), "coffeerun-profiles")
+
+bind = _config.bind
+workers = _config.workers
+worker_class = _config.worker_class
+keepalive = _config.keepalive
+timeout = _config.timeout
+graceful_timeout = _config.graceful_timeout
+max_requests = _config.max_requests
+max_requests_jitter = _config.max_requests_jitter
+preload_app = _config.preload_app
+forwarded_allow_ips = _config.forwarded_allow_ips
 accesslog = "-"
 errorlog = "-"
+
+
+def on_starting(server):
+    # Runs in the master after preload_app has imported the app, so checking the schema
+    # costs one query instead of a separate interpreter importing SQLAlchemy and alembic
+    if _config.run_migrations:
+        from app.cli import migrate
+
+        migrate()
+
+
+def when_ready(server):
+    server.log.info(startup_report(_config))
+
+
+def post_fork(server, worker):
+    # With preload_app the engine object is created in the master; make sure no pooled
+    # connection is ever shared between forked workers
+    if "app.database" in sys.modules:
+        sys.modules["app.database"].engine.sync_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges (in-flight requests, pool state) from scrapes
+    if settings.metrics_enabled:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,4 +1,4 @@
 #!/bin/sh
 set -e
-PYTHONPATH=. alembic upgrade head
+# Migrations run in the gunicorn master (see on_starting in gunicorn.conf.py)
 exec gunicorn app.main:app --config gunicorn.conf.py
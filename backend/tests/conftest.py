@@ -91,6 +91,28 @@ async def client(app):
         yield c
 
 
+@pytest.fixture(autouse=True)
+async def reset_login_throttling():
+    """Every test starts with empty login rate-limit buckets and coalescing state."""
+    from app.routers.auth import login_coalescer
+    from app.services.rate_limit import get_rate_limit_backend
+
+    await get_rate_limit_backend().reset()
+    login_coalescer.reset()
+    yield
+
+
+@pytest.fixture
+async def loop_watchdog():
+    """Fails the test when anything it runs blocks the event loop for over 250 ms."""
+    from app.services.loop_watchdog import LoopWatchdog
+
+    watchdog = LoopWatchdog(threshold_seconds=0.25)
+    async with watchdog:
+        yield watchdog
+    watchdog.raise_for_stalls()
+
+
 # ---------------------------------------------------------------------------
 # Factory helpers
 # ---------------------------------------------------------------------------
@@ -0,0 +1,256 @@
+"""Tests for the columnar analytics store and the stats it serves."""
+
+import secrets
+import shutil
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+
+from app.config import settings
+from app.models.order import Order, OrderItem
+from app.routers import analytics as analytics_router
+from app.services import analytics
+from app.services.analytics import AnalyticsStore, export_orders
+from app.services.drink_spec import ensure_specs, spec_from_values
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+NOW = datetime.now(timezone.utc)
+
+# (age, [(colleague, drink)]): Ana orders more than Ben, Latte outsells Flat White
+# overall and the reverse holds over the last week
+ORDERS = [
+    (timedelta(days=21), [("Ana", "Latte"), ("Ben", "Flat White")]),
+    (timedelta(days=14), [("Ana", "Latte"), ("Ben", "Latte")]),
+    (timedelta(days=2), [("Ana", "Latte"), ("Ben", "Flat White")]),
+    (timedelta(hours=1), [("Ana", "Flat White")]),
+]
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """An empty store, with the export watermark just before this module's history."""
+    monkeypatch.setattr(settings, "analytics_export_lag_seconds", 0)
+    monkeypatch.setattr(settings, "analytics_export_chunk_hours", 24 * 30)
+    store = AnalyticsStore(tmp_path / "analytics")
+    store.save_watermark(NOW - timedelta(days=60))
+    return store
+
+
+async def _add_item(db, order_id, colleague, option, drink, created_at):
+    spec = spec_from_values(
+        drink_type_name=drink,
+        size_name="Regular",
+        size_abbreviation="R",
+        milk_option_name=None,
+        sugar=0,
+        notes=None,
+    )
+    await ensure_specs(db, [spec])
+    db.add(
+        OrderItem(
+            order_id=order_id,
+            colleague_id=colleague.id,
+            coffee_option_id=option.id,
+            drink_spec_id=spec["id"],
+            created_at=created_at,
+        )
+    )
+
+
+async def _setup(app, session_factory, db):
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"analytics_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+    menu = await get_menu_ids(db, team.id)
+    people = {}
+    for name in ("Ana", "Ben"):
+        colleague = await create_colleague(db, team, name)
+        people[name] = (
+            colleague,
+            await create_coffee_option(db, colleague.id, menu["drink_type_id"], menu["size_id"]),
+        )
+
+    orders = []
+    for age, items in ORDERS:
+        order = Order(
+            team_id=team.id,
+            share_token=secrets.token_urlsafe(16),
+            created_by=owner.id,
+            created_at=NOW - age,
+        )
+        db.add(order)
+        await db.flush()
+        for name, drink in items:
+            await _add_item(db, order.id, *people[name], drink, NOW - age)
+        orders.append(order.id)
+    await db.commit()
+    return client, team, people, orders
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+
+async def test_stats_match_the_database(app, session_factory, db, store, monkeypatch):
+    client, team, _, _ = await _setup(app, session_factory, db)
+    base = f"/api/v1/teams/{team.id}/stats"
+    paths = [
+        f"{base}/{report}{query}"
+        for report in ("overview", "drinks", "colleagues")
+        for query in ("", "?days=7", "?days=0")
+    ]
+    from_database = {path: (await client.get(path)).json() for path in paths}
+    assert from_database[f"{base}/colleagues"][0]["favourite_drink"] == "Latte"
+
+    assert await export_orders(session_factory, store, now=NOW + timedelta(seconds=1)) >= 4
+    assert store.ready
+    monkeypatch.setattr(analytics, "analytics_store", store)
+    for path in paths:
+        assert (await client.get(path)).json() == from_database[path], path
+
+
+async def test_export_is_incremental_and_replaces_edited_orders(app, session_factory, db, store):
+    client, team, people, orders = await _setup(app, session_factory, db)
+    first = NOW + timedelta(seconds=1)
+    await export_orders(session_factory, store, now=first)
+    exported = {part: part.stat().st_mtime_ns for part in store.parts(team.id)}
+
+    # Editing an order replaces its items; the new ones carry a later created_at
+    edited = orders[-1]
+    await db.execute(delete(OrderItem).where(OrderItem.order_id == edited))
+    for name in ("Ana", "Ben"):
+        await _add_item(db, edited, *people[name], "Mocha", first + timedelta(seconds=1))
+    await db.commit()
+
+    assert await export_orders(session_factory, store, now=first + timedelta(seconds=5)) == 1
+    assert await export_orders(session_factory, store, now=first + timedelta(seconds=9)) == 0
+
+    # The edit was appended as a part of its own; earlier parts were left as they were
+    parts = store.parts(team.id)
+    assert len(parts) == len(exported) + 1
+    assert {part: part.stat().st_mtime_ns for part in parts[:-1]} == exported
+
+    drinks = await analytics.drinks(store, team.id, days=None, limit=10)
+    assert {d.drink_name: d.count for d in drinks} == {"Latte": 4, "Flat White": 2, "Mocha": 2}
+    overview = await analytics.overview(store, team.id, days=None)
+    assert (overview.total_orders, overview.total_coffees) == (4, 8)
+
+
+async def test_parts_are_merged_without_superseded_rows(
+    app, session_factory, db, store, monkeypatch
+):
+    client, team, people, orders = await _setup(app, session_factory, db)
+    monkeypatch.setattr(settings, "analytics_export_chunk_hours", 24)
+    monkeypatch.setattr(analytics, "_MAX_PARTS", 2)
+    first = NOW + timedelta(seconds=1)
+    await export_orders(session_factory, store, now=first)
+    assert len(store.parts(team.id)) <= 2
+
+    # An edit supersedes rows in the merged part; merging again drops them
+    await db.execute(delete(OrderItem).where(OrderItem.order_id == orders[0]))
+    await _add_item(db, orders[0], *people["Ben"], "Mocha", first + timedelta(seconds=1))
+    await db.commit()
+    await export_orders(session_factory, store, now=first + timedelta(seconds=5))
+    store.compact(team.id)
+
+    (merged,) = store.parts(team.id)
+    assert store.query(team.id, "SELECT count(*) FROM items") == [(6,)]
+    assert store.query(team.id, "SELECT count(*) FROM read_parquet(?)", [str(merged)]) == [(6,)]
+    drinks = await analytics.drinks(store, team.id, days=None, limit=10)
+    assert {d.drink_name: d.count for d in drinks} == {"Latte": 3, "Flat White": 2, "Mocha": 1}
+
+
+async def test_export_state_lives_in_the_directory(
+    app, session_factory, db, store, tmp_path, monkeypatch
+):
+    _, team, _, _ = await _setup(app, session_factory, db)
+    monkeypatch.setattr(analytics, "analytics_store", store)
+    now = NOW + timedelta(seconds=1)
+    await export_orders(session_factory, store, now=now)
+    assert analytics.serving_store() is store
+
+    # A host with a directory of its own exports all history into it, not from our watermark
+    other = AnalyticsStore(tmp_path / "other")
+    assert (other.watermark, other.ready) == (None, False)
+    await export_orders(session_factory, other, now=now)
+    assert other.ready
+
+    # A deleted directory stops serving at once, and the next run rebuilds it from scratch
+    shutil.rmtree(store.directory)
+    assert analytics.serving_store() is None
+    await export_orders(session_factory, store, now=now)
+    assert analytics.serving_store() is store
+
+    for exported in (store, other):
+        overview = await analytics.overview(exported, team.id, days=None)
+        assert (overview.total_orders, overview.total_coffees) == (4, 7)
+
+
+async def test_one_exporter_at_a_time(session_factory, store):
+    with store.export_lock() as locked:
+        assert locked
+        assert await export_orders(session_factory, store, now=NOW) == 0
+    assert not store.ready
+
+
+async def test_team_without_history_has_empty_stats(store):
+    overview = await analytics.overview(store, uuid.uuid4(), days=None)
+    assert (overview.total_orders, overview.busiest_day) == (0, None)
+    assert await analytics.drinks(store, uuid.uuid4(), days=None, limit=10) == []
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+
+async def test_reports_wait_for_the_first_export(app, session_factory, db, store, monkeypatch):
+    client, team, _, _ = await _setup(app, session_factory, db)
+    demo = FastAPI()
+    demo.include_router(analytics_router.router, prefix="/api/v1/teams/{team_id}")
+    demo.dependency_overrides = app.dependency_overrides
+    monkeypatch.setattr(analytics, "analytics_store", store)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=demo), base_url="http://test", cookies=client.cookies
+    ) as reports:
+        base = f"/api/v1/teams/{team.id}/stats"
+        assert (await reports.get(f"{base}/trends")).status_code == 503
+
+        await export_orders(session_factory, store, now=NOW + timedelta(seconds=1))
+        trends = (await reports.get(f"{base}/trends", params={"weeks": 4})).json()
+        mix = (await reports.get(f"{base}/drink-mix", params={"weeks": 4})).json()
+        cohorts = (await reports.get(f"{base}/retention", params={"months": 3})).json()
+
+    assert len(trends) == 4
+    assert sum(week["orders"] for week in trends) == 4
+    assert sum(week["coffees"] for week in trends) == 7
+
+    for week in {point["week_start"] for point in mix}:
+        shares = [point["share"] for point in mix if point["week_start"] == week]
+        assert sum(shares) == pytest.approx(1, abs=1e-3)
+
+    (cohort,) = cohorts
+    first_order = (NOW - ORDERS[0][0]).date()
+    assert cohort["cohort"] == first_order.replace(day=1).isoformat()
+    assert cohort["colleagues"] == 2
+    assert cohort["retention"][0] == 1.0
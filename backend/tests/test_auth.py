@@ -2,9 +2,12 @@
 
 import uuid
 
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy import select
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 from app.models.user import MagicLinkToken, User
+from app.server_config import build_server_config
 from app.services.auth import generate_magic_token
 
 from tests.conftest import create_authenticated_client
@@ -49,6 +52,79 @@ async def test_login_invalid_email_returns_422(client):
     assert resp.status_code == 422
 
 
+async def test_login_coalesces_duplicate_requests(client, db):
+    email = f"dupe_{uuid.uuid4().hex[:8]}@example.com"
+    for _ in range(3):
+        resp = await client.post("/api/v1/auth/login", json={"email": email})
+        assert resp.status_code == 200
+
+    result = await db.execute(select(MagicLinkToken).join(User).where(User.email == email))
+    assert len(result.scalars().all()) == 1
+
+
+async def test_login_rate_limited_per_email(client, monkeypatch):
+    from app.config import settings
+    from app.routers.auth import login_coalescer
+
+    monkeypatch.setattr(login_coalescer, "window_seconds", 0)
+    monkeypatch.setattr(settings, "login_rate_limit_per_email", 2)
+    email = f"limited_{uuid.uuid4().hex[:8]}@example.com"
+
+    for _ in range(2):
+        resp = await client.post("/api/v1/auth/login", json={"email": email})
+        assert resp.status_code == 200
+
+    resp = await client.post("/api/v1/auth/login", json={"email": email})
+    assert resp.status_code == 429
+    assert int(resp.headers["retry-after"]) > 0
+
+    # A different email is unaffected
+    resp = await client.post(
+        "/api/v1/auth/login", json={"email": f"other_{uuid.uuid4().hex[:8]}@example.com"}
+    )
+    assert resp.status_code == 200
+
+
+async def test_login_rate_limited_per_ip(client, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "login_rate_limit_per_ip", 2)
+    for i in range(2):
+        resp = await client.post(
+            "/api/v1/auth/login", json={"email": f"ip{i}_{uuid.uuid4().hex[:8]}@example.com"}
+        )
+        assert resp.status_code == 200
+
+    resp = await client.post(
+        "/api/v1/auth/login", json={"email": f"ipx_{uuid.uuid4().hex[:8]}@example.com"}
+    )
+    assert resp.status_code == 429
+
+
+async def test_login_rate_limit_uses_forwarded_client_behind_trusted_proxy(app, monkeypatch):
+    from app.config import settings
+
+    # What gunicorn hands uvicorn, which applies it with this middleware
+    config = build_server_config(env={"FORWARDED_ALLOW_IPS": "172.18.0.0/16"}, cpus=1)
+    proxied = ProxyHeadersMiddleware(app, trusted_hosts=config.forwarded_allow_ips)
+    monkeypatch.setattr(settings, "login_rate_limit_per_ip", 2)
+
+    async def login(client_ip):
+        return await caddy.post(
+            "/api/v1/auth/login",
+            json={"email": f"fwd_{uuid.uuid4().hex[:8]}@example.com"},
+            headers={"X-Forwarded-For": client_ip},
+        )
+
+    # Every request arrives from Caddy's container address
+    transport = ASGITransport(app=proxied, client=("172.18.0.5", 43210))
+    async with AsyncClient(transport=transport, base_url="http://test") as caddy:
+        for _ in range(2):
+            assert (await login("203.0.113.7")).status_code == 200
+        assert (await login("203.0.113.7")).status_code == 429
+        assert (await login("198.51.100.23")).status_code == 200
+
+
 # ---------------------------------------------------------------------------
 # Verify
 # ---------------------------------------------------------------------------
@@ -157,6 +233,41 @@ async def test_me_includes_team_after_creation(app, session_factory):
     assert data["teams"][0]["team_id"] == team_data["id"]
 
 
+async def test_me_returns_etag_and_304_on_match(app, session_factory):
+    authed_client, _ = await create_authenticated_client(
+        app, session_factory, f"etag_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    resp = await authed_client.get("/api/v1/auth/me")
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+
+    resp = await authed_client.get("/api/v1/auth/me", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
+
+
+async def test_me_etag_changes_when_teams_change(app, session_factory):
+    authed_client, _ = await create_authenticated_client(
+        app, session_factory, f"etagteam_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    etag = (await authed_client.get("/api/v1/auth/me")).headers["etag"]
+
+    resp = await authed_client.post("/api/v1/teams", json={"name": "ETag Team"})
+    team_id = resp.json()["id"]
+
+    resp = await authed_client.get("/api/v1/auth/me", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert [t["team_id"] for t in resp.json()["teams"]] == [team_id]
+
+    etag = resp.headers["etag"]
+    await authed_client.delete(f"/api/v1/teams/{team_id}")
+    resp = await authed_client.get("/api/v1/auth/me", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["teams"] == []
+
+
 # ---------------------------------------------------------------------------
 # Logout
 # ---------------------------------------------------------------------------
@@ -0,0 +1,47 @@
+"""Smoke test for the benchmark harness so it keeps working as the API evolves."""
+
+import uuid
+
+from benchmarks.compare import compare
+from benchmarks.bench_uuid_pk import run_kind
+from benchmarks.loadgen import SCENARIOS, percentile, run_benchmark
+from benchmarks.seed import SCALES, seed
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+async def test_seed_and_run_every_scenario(client, engine):
+    prefix = f"{uuid.uuid4().hex[:8]}."
+    counts = await seed(engine, SCALES["tiny"], email_prefix=prefix)
+    assert counts["teams"] == 2
+    assert counts["order_items"] == 80
+
+    report = await run_benchmark(
+        client,
+        engine,
+        requests=3,
+        concurrency=2,
+        warmup=1,
+        email_domain="bench.example.com",
+    )
+    assert set(report["endpoints"]) == set(SCENARIOS)
+    for name, result in report["endpoints"].items():
+        assert result["errors"] == 0, name
+        assert result["requests"] == 3
+        assert 0 < result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+    lines, regressed = compare(report, report, threshold=10)
+    assert regressed == []
+    assert len(lines) == len(SCENARIOS) + 1
+
+
+async def test_uuid_pk_benchmark(engine):
+    result = await run_kind(engine, "uuid7", rows=200, batch=50)
+    assert result["rows"] == 200
+    assert result["pk_index_mb"] >= 0
@@ -0,0 +1,149 @@
+"""Tests for response compression middleware."""
+
+import gzip
+import json
+import uuid
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.middleware.compression import (
+    CompressionMiddleware,
+    choose_encoding,
+    compression_cache,
+    skip_compression,
+)
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+GZIP = {"Accept-Encoding": "gzip"}
+BIG_JSON = json.dumps([{"drink": "Flat White", "size": "Regular"}] * 100)
+
+
+def _demo_app() -> FastAPI:
+    demo = FastAPI()
+
+    @demo.get("/json")
+    async def big_json():
+        return Response(BIG_JSON, media_type="application/json")
+
+    @demo.get("/small")
+    async def small_json():
+        return Response('{"ok": true}', media_type="application/json")
+
+    @demo.get("/binary")
+    async def binary():
+        return Response(b"\x00" * 4096, media_type="image/png")
+
+    @demo.get("/plain")
+    async def plain():
+        return PlainTextResponse("coffee " * 500)
+
+    @demo.get("/opt-out")
+    @skip_compression
+    async def opt_out():
+        return Response(BIG_JSON, media_type="application/json")
+
+    demo.add_middleware(CompressionMiddleware)
+    return demo
+
+
+async def _get(path: str, headers: dict[str, str]):
+    transport = ASGITransport(app=_demo_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        # Read raw bytes so we see exactly what went over the wire
+        async with c.stream("GET", path, headers=headers) as resp:
+            raw = b"".join([chunk async for chunk in resp.aiter_raw()])
+        return resp, raw
+
+
+# ---------------------------------------------------------------------------
+# Encoding negotiation
+# ---------------------------------------------------------------------------
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("deflate") is None
+    assert choose_encoding("") is None
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("*") == "gzip"
+
+
+# ---------------------------------------------------------------------------
+# Middleware rules
+# ---------------------------------------------------------------------------
+
+
+async def test_large_json_is_gzipped():
+    resp, raw = await _get("/json", GZIP)
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in resp.headers["vary"].lower()
+    assert int(resp.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw).decode() == BIG_JSON
+
+
+async def test_allowlisted_text_is_gzipped():
+    resp, _ = await _get("/plain", GZIP)
+    assert resp.headers["content-encoding"] == "gzip"
+
+
+async def test_small_body_not_compressed():
+    resp, raw = await _get("/small", GZIP)
+    assert "content-encoding" not in resp.headers
+    assert raw == b'{"ok": true}'
+
+
+async def test_content_type_outside_allowlist_not_compressed():
+    resp, _ = await _get("/binary", GZIP)
+    assert "content-encoding" not in resp.headers
+
+
+async def test_client_without_gzip_gets_identity():
+    resp, raw = await _get("/json", {"Accept-Encoding": "identity"})
+    assert "content-encoding" not in resp.headers
+    assert raw.decode() == BIG_JSON
+
+
+async def test_route_opt_out():
+    resp, raw = await _get("/opt-out", GZIP)
+    assert "content-encoding" not in resp.headers
+    assert raw.decode() == BIG_JSON
+
+
+# ---------------------------------------------------------------------------
+# Shared orders
+# ---------------------------------------------------------------------------
+
+
+async def test_shared_order_compression_is_cached(app, session_factory, db, monkeypatch):
+    monkeypatch.setattr(settings, "compression_minimum_size", 200)
+    owner_client, owner = await create_authenticated_client(
+        app, session_factory, f"gz_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email), "GZ")
+    menu = await get_menu_ids(db, team.id)
+    colleague = await create_colleague(db, team, "Zipped")
+    option = await create_coffee_option(db, colleague.id, menu["drink_type_id"], menu["size_id"])
+    created = await owner_client.post(
+        f"/api/v1/teams/{team.id}/orders",
+        json={"items": [{"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}]},
+    )
+    share_token = created.json()["share_token"]
+
+    hits = compression_cache.hits
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as anon:
+        first = await anon.get(f"/api/v1/orders/share/{share_token}", headers=GZIP)
+        second = await anon.get(f"/api/v1/orders/share/{share_token}", headers=GZIP)
+    assert first.headers["content-encoding"] == "gzip"
+    assert second.json() == first.json()
+    assert compression_cache.hits == hits + 1
@@ -0,0 +1,110 @@
+"""Tests for the content-keyed drink specs that order items reference."""
+
+import uuid
+
+from sqlalchemy import func, select
+
+from app.models.drink_spec import DrinkSpec
+from app.models.order import OrderItem
+from app.services.drink_spec import spec_from_values, spec_key
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _setup(app, session_factory, db):
+    """Owner client + team with Ana and Ben, both on the same flat white."""
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"specs_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+    menu = await get_menu_ids(db, team.id)
+    items = []
+    for name in ("Ana", "Ben"):
+        colleague = await create_colleague(db, team, name)
+        option = await create_coffee_option(
+            db, colleague.id, menu["drink_type_id"], menu["size_id"], notes="extra hot"
+        )
+        items.append({"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)})
+    return client, f"/api/v1/teams/{team.id}", menu, items
+
+
+async def _spec_ids(db, order_id):
+    rows = await db.scalars(
+        select(OrderItem.drink_spec_id).where(OrderItem.order_id == uuid.UUID(order_id))
+    )
+    return set(rows)
+
+
+# ---------------------------------------------------------------------------
+# Keys
+# ---------------------------------------------------------------------------
+
+
+def test_spec_key_is_stable():
+    values = dict(
+        drink_type_name="Flat White",
+        size_name="Regular",
+        size_abbreviation="R",
+        milk_option_name=None,
+        sugar=1,
+        notes=None,
+    )
+    # Stored ids depend on this exact value; migration 010 computes it too
+    assert spec_key(**values) == uuid.UUID("ffaf580b-0863-4496-e412-c8cb6f3460e3")
+    assert spec_from_values(**values)["id"] == spec_key(**values)
+    assert spec_key(**{**values, "notes": ""}) != spec_key(**values)
+    assert spec_key(**{**values, "sugar": 2}) != spec_key(**values)
+
+
+# ---------------------------------------------------------------------------
+# Orders
+# ---------------------------------------------------------------------------
+
+
+async def test_identical_drinks_share_one_spec(app, session_factory, db):
+    client, base, _, items = await _setup(app, session_factory, db)
+    first = (await client.post(f"{base}/orders", json={"items": items})).json()
+    second = (await client.post(f"{base}/orders", json={"items": items[:1]})).json()
+
+    spec_ids = await _spec_ids(db, first["id"])
+    assert len(spec_ids) == 1
+    assert await _spec_ids(db, second["id"]) == spec_ids
+    assert await db.scalar(select(func.count()).where(DrinkSpec.id.in_(spec_ids))) == 1
+
+    item = first["items"][0]
+    assert item["notes"] == "extra hot"
+    assert item["milk_option_name"] is None
+    assert first["consolidated"][0]["count"] == 2
+
+
+async def test_order_keeps_spec_after_menu_rename(app, session_factory, db):
+    client, base, menu, items = await _setup(app, session_factory, db)
+    order = (await client.post(f"{base}/orders", json={"items": items})).json()
+    old_name = order["items"][0]["drink_type_name"]
+
+    resp = await client.put(
+        f"{base}/menu/drink-types/{menu['drink_type_id']}", json={"name": "Renamed Brew"}
+    )
+    assert resp.status_code == 200
+
+    resp = await client.get(f"{base}/orders/{order['id']}")
+    assert {i["drink_type_name"] for i in resp.json()["items"]} == {old_name}
+
+    # Editing the order snapshots the current menu into a new spec
+    resp = await client.put(f"{base}/orders/{order['id']}", json={"items": items})
+    assert {i["drink_type_name"] for i in resp.json()["items"]} == {"Renamed Brew"}
+
+    resp = await client.get(f"{base}/stats/drinks")
+    assert {s["drink_name"]: s["count"] for s in resp.json()} == {"Renamed Brew": 2}
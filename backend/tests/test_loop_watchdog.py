@@ -0,0 +1,92 @@
+"""Tests for the event-loop stall watchdog and the handlers it guards."""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.services import email
+from app.services.loop_watchdog import EventLoopBlocked, LoopWatchdog
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+
+# ---------------------------------------------------------------------------
+# Watchdog
+# ---------------------------------------------------------------------------
+
+
+async def test_blocking_handler_is_caught_with_its_stack():
+    demo = FastAPI()
+
+    @demo.get("/slow")
+    async def blocking_handler():
+        time.sleep(0.3)  # a sync call in an async handler
+        return {}
+
+    async with LoopWatchdog(threshold_seconds=0.1) as watchdog:
+        transport = ASGITransport(app=demo)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get("/slow")).status_code == 200
+        await asyncio.sleep(0.05)  # let the heartbeat close the stall
+
+    (stall,) = watchdog.stalls
+    assert "blocking_handler" in stall.stack
+    assert "time.sleep(0.3)" in stall.stack
+    assert 0.2 <= stall.seconds < 1
+    with pytest.raises(EventLoopBlocked, match="blocking_handler"):
+        watchdog.raise_for_stalls()
+
+
+async def test_awaiting_handler_is_not_a_stall():
+    async with LoopWatchdog(threshold_seconds=0.1) as watchdog:
+        await asyncio.sleep(0.3)
+    assert not watchdog.stalls
+    assert not watchdog.running
+    watchdog.raise_for_stalls()
+
+
+async def test_stall_log_is_bounded():
+    async with LoopWatchdog(threshold_seconds=0.02, max_stalls=2) as watchdog:
+        for _ in range(3):
+            time.sleep(0.1)
+            await asyncio.sleep(0.03)
+    assert len(watchdog.stalls) == 2
+
+
+# ---------------------------------------------------------------------------
+# Handlers under the watchdog
+# ---------------------------------------------------------------------------
+
+
+async def test_login_does_not_block_the_loop(client, loop_watchdog, monkeypatch):
+    # The dev-mode banner goes through a thread; a stdout that stops draining must
+    # not take the loop with it
+    monkeypatch.setattr(email, "print", lambda *_: time.sleep(0.4), raising=False)
+    resp = await client.post("/api/v1/auth/login", json={"email": "watchdog@example.com"})
+    assert resp.status_code == 200
+
+
+async def test_order_round_trip_does_not_block_the_loop(app, session_factory, db, loop_watchdog):
+    owner_client, owner = await create_authenticated_client(
+        app, session_factory, f"stall_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+    menu = await get_menu_ids(db, team.id)
+    colleague = await create_colleague(db, team, "Steady")
+    option = await create_coffee_option(db, colleague.id, menu["drink_type_id"], menu["size_id"])
+
+    item = {"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}
+    resp = await owner_client.post(f"/api/v1/teams/{team.id}/orders", json={"items": [item]})
+    assert resp.status_code == 201
+    assert (await owner_client.get(f"/api/v1/teams/{team.id}/orders")).status_code == 200
@@ -9,6 +9,7 @@ from app.models.team import Team, TeamRole
 from tests.conftest import (
     add_team_member,
     create_authenticated_client,
+    create_colleague,
 )
 
 
@@ -174,6 +175,22 @@ async def test_owner_removes_member(app, session_factory, db):
     assert resp.status_code == 200
 
 
+async def test_remove_member_unlinks_colleague(app, session_factory, db):
+    from app.models.colleague import Colleague
+
+    tid, oc, owner, mc, mgr, memc, mem = await _setup_team_with_roles(app, session_factory, db)
+    team = (await db.execute(select(Team).where(Team.id == uuid.UUID(tid)))).scalar_one()
+    colleague = await create_colleague(db, team, "Linked Member", user_id=mem.id)
+
+    resp = await oc.delete(f"/api/v1/teams/{tid}/members/{mem.id}")
+    assert resp.status_code == 200
+
+    user_id = (
+        await db.execute(select(Colleague.user_id).where(Colleague.id == colleague.id))
+    ).scalar_one()
+    assert user_id is None
+
+
 async def test_owner_removes_manager(app, session_factory, db):
     tid, oc, owner, mc, mgr, memc, mem = await _setup_team_with_roles(app, session_factory, db)
     resp = await oc.delete(f"/api/v1/teams/{tid}/members/{mgr.id}")
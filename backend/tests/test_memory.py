@@ -0,0 +1,143 @@
+"""Peak allocation per request for the hot read paths on a large team.
+
+Budgets are measured with tracemalloc around a single request against a 500-colleague
+team (two coffee options each, a 500-item order, 500 members) and include the test
+client's copy of the body. They have about 50% headroom over today's figures. Loading
+ORM objects for these responses took 5.6 MiB, 2.1 MiB and 5.0 MiB respectively, so a
+regression to it fails.
+"""
+
+import tracemalloc
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.coffee_option import CoffeeOption
+from app.models.colleague import Colleague
+from app.models.order import Order, OrderItem
+from app.models.team import TeamMembership, TeamRole
+from app.models.user import User
+from app.services.drink_spec import ensure_specs, spec_from_values
+from tests.conftest import (
+    create_authenticated_client,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+COLLEAGUES = 500
+MEMBERS = 500
+
+BUDGET_KB = {
+    "colleagues": 3072,
+    "members": 1024,
+    "order": 1536,
+}
+
+
+@pytest.fixture(scope="module")
+async def big_team(app, session_factory):
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"big_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as db:
+        team = await create_team_with_owner(db, await create_test_user(db, owner.email))
+        menu = await get_menu_ids(db, team.id)
+
+        colleagues = [
+            {"id": uuid.uuid4(), "team_id": team.id, "name": f"Colleague {n:03d}"}
+            for n in range(COLLEAGUES)
+        ]
+        await db.execute(insert(Colleague), colleagues)
+        options = [
+            {
+                "id": uuid.uuid4(),
+                "colleague_id": colleague["id"],
+                "drink_type_id": menu["drink_type_id"],
+                "size_id": menu["size_id"],
+                "milk_option_id": menu["milk_option_id"] if n else None,
+                "sugar": n,
+                "notes": "extra hot" if n else None,
+                "display_order": n,
+            }
+            for colleague in colleagues
+            for n in range(2)
+        ]
+        await db.execute(insert(CoffeeOption), options)
+
+        users = [
+            {"id": uuid.uuid4(), "email": f"member{n}_{uuid.uuid4().hex[:8]}@example.com"}
+            for n in range(MEMBERS)
+        ]
+        await db.execute(insert(User), users)
+        role = TeamRole.member
+        await db.execute(
+            insert(TeamMembership),
+            [
+                {"id": uuid.uuid4(), "team_id": team.id, "user_id": user["id"], "role": role}
+                for user in users
+            ],
+        )
+
+        spec = spec_from_values(
+            drink_type_name="Flat White",
+            size_name="Regular",
+            size_abbreviation="R",
+            milk_option_name="Oat",
+            sugar=1,
+            notes=None,
+        )
+        await ensure_specs(db, [spec])
+        order = Order(
+            id=uuid.uuid4(), team_id=team.id, share_token=uuid.uuid4().hex, created_by=owner.id
+        )
+        db.add(order)
+        await db.flush()
+        await db.execute(
+            insert(OrderItem),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "order_id": order.id,
+                    "colleague_id": option["colleague_id"],
+                    "coffee_option_id": option["id"],
+                    "drink_spec_id": spec["id"],
+                }
+                for option in options[::2]
+            ],
+        )
+        await db.commit()
+    yield client, team, order.id
+    await client.aclose()
+
+
+async def _peak_kb(client, url: str) -> float:
+    await client.get(url)  # warm caches and compiled statements first
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        resp = await client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert resp.status_code == 200
+    return peak / 1024
+
+
+async def test_list_colleagues_peak_allocation(big_team):
+    client, team, _ = big_team
+    peak = await _peak_kb(client, f"/api/v1/teams/{team.id}/colleagues")
+    assert peak < BUDGET_KB["colleagues"], f"{peak:.0f} KiB"
+
+
+async def test_list_members_peak_allocation(big_team):
+    client, team, _ = big_team
+    peak = await _peak_kb(client, f"/api/v1/teams/{team.id}/members")
+    assert peak < BUDGET_KB["members"], f"{peak:.0f} KiB"
+
+
+async def test_get_order_peak_allocation(big_team):
+    client, team, order_id = big_team
+    peak = await _peak_kb(client, f"/api/v1/teams/{team.id}/orders/{order_id}")
+    assert peak < BUDGET_KB["order"], f"{peak:.0f} KiB"
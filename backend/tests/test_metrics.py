@@ -0,0 +1,173 @@
+"""Tests for the Prometheus metrics: middleware, samplers and multiprocess aggregation."""
+
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.middleware.metrics import MetricsMiddleware
+from app.services.auth import claims_cache
+from app.services.metrics import (
+    LoopLagProbe,
+    _sample_pool,
+    metered_pool_class,
+    render_metrics,
+    sample_metrics,
+    track_email,
+)
+from tests.conftest import create_authenticated_client, create_team_with_owner, create_test_user
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+# ---------------------------------------------------------------------------
+# Requests
+# ---------------------------------------------------------------------------
+
+
+async def test_latency_is_labelled_by_route_template(app, session_factory):
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"metrics_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+
+    route = "/api/v1/teams/{team_id}/menu/sizes"
+    labels = {"method": "GET", "route": route, "status": "200"}
+    unmatched = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = _value("coffeerun_http_request_duration_seconds_count", **labels)
+    before_unmatched = _value("coffeerun_http_request_duration_seconds_count", **unmatched)
+
+    transport = ASGITransport(app=MetricsMiddleware(app))
+    async with AsyncClient(
+        transport=transport, base_url="http://test", cookies=client.cookies
+    ) as metered:
+        for _ in range(2):
+            assert (await metered.get(f"/api/v1/teams/{team.id}/menu/sizes")).status_code == 200
+        assert (await metered.get(f"/api/v1/nothing-here/{uuid.uuid4()}")).status_code == 404
+
+    assert _value("coffeerun_http_request_duration_seconds_count", **labels) == before + 2
+    assert (
+        _value("coffeerun_http_request_duration_seconds_count", **unmatched) == before_unmatched + 1
+    )
+    assert _value("coffeerun_http_requests_in_flight") == 0
+
+
+async def test_metrics_endpoint_renders_exposition():
+    from app.routers import metrics
+
+    demo = FastAPI()
+    demo.include_router(metrics.router)
+    async with AsyncClient(transport=ASGITransport(app=demo), base_url="http://test") as client:
+        resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert "coffeerun_cache_lookups_total" in resp.text
+    assert "coffeerun_event_loop_lag_seconds_bucket" in resp.text
+
+
+# ---------------------------------------------------------------------------
+# Sampled figures
+# ---------------------------------------------------------------------------
+
+
+def test_cache_counters_follow_component_totals():
+    claims_cache.clear()
+    sample_metrics()
+    hits = {"cache": "jwt_claims", "result": "hit"}
+    before = _value("coffeerun_cache_lookups_total", **hits)
+
+    claims_cache.hits = 3
+    sample_metrics()
+    sample_metrics()  # unchanged totals add nothing
+    assert _value("coffeerun_cache_lookups_total", **hits) == before + 3
+
+    # A cleared cache starts counting afresh instead of going backwards
+    claims_cache.clear()
+    claims_cache.hits = 1
+    sample_metrics()
+    assert _value("coffeerun_cache_lookups_total", **hits) == before + 4
+    claims_cache.clear()
+
+
+async def test_pool_state_and_wait_time(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=metered_pool_class("test"),
+        pool_size=2,
+    )
+    waits = _value("coffeerun_db_pool_wait_seconds_count", engine="test")
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        _sample_pool("test", engine)
+        assert _value("coffeerun_db_pool_checked_out", engine="test") == 1
+        assert _value("coffeerun_db_pool_size", engine="test") == 2
+    _sample_pool("test", engine)
+    assert _value("coffeerun_db_pool_checked_out", engine="test") == 0
+    assert _value("coffeerun_db_pool_wait_seconds_count", engine="test") == waits + 1
+    await engine.dispose()
+
+
+def test_email_sends_are_counted():
+    with track_email("magic_link"):
+        assert _value("coffeerun_email_sends_in_flight") == 1
+    sent = _value("coffeerun_emails_total", kind="magic_link", result="sent")
+    with pytest.raises(RuntimeError):
+        with track_email("magic_link"):
+            raise RuntimeError("provider down")
+    assert _value("coffeerun_emails_total", kind="magic_link", result="sent") == sent
+    assert _value("coffeerun_emails_total", kind="magic_link", result="error") >= 1
+    assert _value("coffeerun_email_sends_in_flight") == 0
+
+
+async def test_loop_lag_probe_measures_late_wakeups():
+    probe = LoopLagProbe(interval_seconds=0.01)
+    before = _value("coffeerun_event_loop_lag_seconds_sum")
+    await probe()  # first run only sets the expected wake-up
+    time.sleep(0.06)  # a blocking call holding the loop
+    await probe()
+    assert _value("coffeerun_event_loop_lag_seconds_sum") - before >= 0.04
+
+
+# ---------------------------------------------------------------------------
+# Multiprocess
+# ---------------------------------------------------------------------------
+
+
+def test_scrape_aggregates_every_worker(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": "."}
+    worker = (
+        "from app.services.metrics import track_email\nwith track_email('team_invite'):\n    pass\n"
+    )
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], cwd=BACKEND_DIR, env=env, check=True)
+
+    scrape = "from app.services.metrics import render_metrics\nprint(render_metrics()[0].decode())"
+    output = subprocess.run(
+        [sys.executable, "-c", scrape],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert 'coffeerun_emails_total{kind="team_invite",result="sent"} 2.0' in output
+
+
+def test_render_without_multiprocess_dir_uses_process_registry():
+    body, content_type = render_metrics()
+    assert b"coffeerun_http_requests_in_flight" in body
+    assert content_type.startswith("text/plain")
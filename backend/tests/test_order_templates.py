@@ -0,0 +1,151 @@
+"""Tests for order templates and creating orders from them."""
+
+import uuid
+
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _setup(app, session_factory, db):
+    """Owner client + team with two colleagues, each with one coffee option."""
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"tmpl_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+    menu = await get_menu_ids(db, team.id)
+    pairs = []
+    for name in ("Ana", "Ben"):
+        colleague = await create_colleague(db, team, name)
+        option = await create_coffee_option(
+            db, colleague.id, menu["drink_type_id"], menu["size_id"], menu["milk_option_id"]
+        )
+        pairs.append((colleague, option))
+    return client, team, f"/api/v1/teams/{team.id}", pairs
+
+
+def _items(pairs):
+    return [
+        {"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}
+        for colleague, option in pairs
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Templates
+# ---------------------------------------------------------------------------
+
+
+async def test_create_and_list_template(app, session_factory, db):
+    client, team, base, pairs = await _setup(app, session_factory, db)
+    resp = await client.post(
+        f"{base}/order-templates", json={"name": "Monday", "items": _items(pairs)}
+    )
+    assert resp.status_code == 201
+    assert len(resp.json()["items"]) == 2
+
+    templates = (await client.get(f"{base}/order-templates")).json()
+    assert [t["name"] for t in templates] == ["Monday"]
+
+
+async def test_template_rejects_option_of_another_colleague(app, session_factory, db):
+    client, team, base, pairs = await _setup(app, session_factory, db)
+    (ana, ana_option), (ben, _) = pairs
+    resp = await client.post(
+        f"{base}/order-templates",
+        json={
+            "name": "Mixed up",
+            "items": [{"colleague_id": str(ben.id), "coffee_option_id": str(ana_option.id)}],
+        },
+    )
+    assert resp.status_code == 400
+
+
+async def test_delete_template(app, session_factory, db):
+    client, team, base, pairs = await _setup(app, session_factory, db)
+    template = (
+        await client.post(f"{base}/order-templates", json={"name": "Gone", "items": _items(pairs)})
+    ).json()
+    assert (await client.delete(f"{base}/order-templates/{template['id']}")).status_code == 200
+    assert (await client.get(f"{base}/order-templates")).json() == []
+
+
+# ---------------------------------------------------------------------------
+# Orders from templates
+# ---------------------------------------------------------------------------
+
+
+async def test_order_from_template(app, session_factory, db):
+    client, team, base, pairs = await _setup(app, session_factory, db)
+    template = (
+        await client.post(f"{base}/order-templates", json={"name": "Daily", "items": _items(pairs)})
+    ).json()
+
+    resp = await client.post(f"{base}/orders/from-template/{template['id']}")
+    assert resp.status_code == 201
+    order = resp.json()
+    assert sorted(item["colleague_name"] for item in order["items"]) == ["Ana", "Ben"]
+    assert all(item["drink_type_name"] and item["size_name"] for item in order["items"])
+    assert sum(line["count"] for line in order["consolidated"]) == 2
+
+    # The cloned order is a normal order
+    fetched = await client.get(f"{base}/orders/{order['id']}")
+    assert fetched.status_code == 200
+    assert len(fetched.json()["items"]) == 2
+
+
+async def test_order_from_template_skips_inactive(app, session_factory, db):
+    client, team, base, pairs = await _setup(app, session_factory, db)
+    (ana, _), (_, ben_option) = pairs
+    template = (
+        await client.post(f"{base}/order-templates", json={"name": "Daily", "items": _items(pairs)})
+    ).json()
+    assert (await client.delete(f"{base}/coffee-options/{ben_option.id}")).status_code == 200
+
+    resp = await client.post(f"{base}/orders/from-template/{template['id']}")
+    assert resp.status_code == 201
+    assert [item["colleague_name"] for item in resp.json()["items"]] == ["Ana"]
+
+    # Deactivating Ana leaves nothing to order
+    assert (await client.delete(f"{base}/colleagues/{ana.id}")).status_code == 200
+    resp = await client.post(f"{base}/orders/from-template/{template['id']}")
+    assert resp.status_code == 400
+
+
+async def test_repeat_last_order(app, session_factory, db):
+    client, team, base, pairs = await _setup(app, session_factory, db)
+    assert (await client.post(f"{base}/orders/from-template/last")).status_code == 404
+
+    first = (await client.post(f"{base}/orders", json={"items": _items(pairs[:1])})).json()
+    resp = await client.post(f"{base}/orders/from-template/last")
+    assert resp.status_code == 201
+    repeated = resp.json()
+    assert repeated["id"] != first["id"]
+    assert [item["colleague_name"] for item in repeated["items"]] == ["Ana"]
+    # Items cloned in SQL get time-ordered ids like rows created by the app
+    assert uuid.UUID(repeated["id"]).version == 7
+    assert uuid.UUID(repeated["items"][0]["id"]).version == 7
+
+
+async def test_order_from_other_teams_template(app, session_factory, db):
+    client, team, base, pairs = await _setup(app, session_factory, db)
+    template = (
+        await client.post(f"{base}/order-templates", json={"name": "Ours", "items": _items(pairs)})
+    ).json()
+
+    other_client, other_team, other_base, _ = await _setup(app, session_factory, db)
+    resp = await other_client.post(f"{other_base}/orders/from-template/{template['id']}")
+    assert resp.status_code == 404
+    resp = await other_client.post(f"{other_base}/orders/from-template/not-a-uuid")
+    assert resp.status_code == 404
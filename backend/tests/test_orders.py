@@ -69,6 +69,80 @@ async def test_create_order_denormalizes_drink(app, session_factory, db):
     assert item["size_abbreviation"]
 
 
+# ---------------------------------------------------------------------------
+# Idempotent create
+# ---------------------------------------------------------------------------
+
+
+def _order_body(colleague, option):
+    return {"items": [{"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}]}
+
+
+async def test_create_order_retry_replays_response(app, session_factory, db):
+    oc, owner, team, tid, colleague, option = await _setup_order_env(app, session_factory, db)
+    headers = {"Idempotency-Key": "retry-1"}
+    first = await oc.post(
+        f"/api/v1/teams/{tid}/orders", json=_order_body(colleague, option), headers=headers
+    )
+    retry = await oc.post(
+        f"/api/v1/teams/{tid}/orders", json=_order_body(colleague, option), headers=headers
+    )
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+    orders = (await oc.get(f"/api/v1/teams/{tid}/orders")).json()
+    assert len(orders) == 1
+
+
+async def test_create_order_key_reused_for_different_payload(app, session_factory, db):
+    oc, owner, team, tid, colleague, option = await _setup_order_env(app, session_factory, db)
+    headers = {"Idempotency-Key": "reused"}
+    await oc.post(
+        f"/api/v1/teams/{tid}/orders", json=_order_body(colleague, option), headers=headers
+    )
+    doubled = _order_body(colleague, option)
+    doubled["items"] *= 2
+    resp = await oc.post(f"/api/v1/teams/{tid}/orders", json=doubled, headers=headers)
+    assert resp.status_code == 422
+    assert "Idempotency-Key" in resp.json()["detail"]
+
+
+async def test_create_order_failed_request_does_not_keep_key(app, session_factory, db):
+    oc, owner, team, tid, colleague, option = await _setup_order_env(app, session_factory, db)
+    headers = {"Idempotency-Key": "failed-first"}
+    bad = {"items": [{"colleague_id": str(uuid.uuid4()), "coffee_option_id": str(option.id)}]}
+    resp = await oc.post(f"/api/v1/teams/{tid}/orders", json=bad, headers=headers)
+    assert resp.status_code == 400
+    resp = await oc.post(
+        f"/api/v1/teams/{tid}/orders", json=_order_body(colleague, option), headers=headers
+    )
+    assert resp.status_code == 201
+
+
+async def test_expired_idempotency_keys_are_swept(app, session_factory, db):
+    from app.services.background import exclusive_lock
+    from app.services.idempotency import LOCK_PATH, purge_expired_idempotency_keys
+
+    oc, owner, team, tid, colleague, option = await _setup_order_env(app, session_factory, db)
+    headers = {"Idempotency-Key": "sweep-me"}
+    first = await oc.post(
+        f"/api/v1/teams/{tid}/orders", json=_order_body(colleague, option), headers=headers
+    )
+    # Only one worker sweeps at a time
+    with exclusive_lock(LOCK_PATH) as locked:
+        assert locked
+        assert await purge_expired_idempotency_keys(session_factory, ttl_hours=-1) == 0
+    assert await purge_expired_idempotency_keys(session_factory, ttl_hours=-1) >= 1
+
+    again = await oc.post(
+        f"/api/v1/teams/{tid}/orders", json=_order_body(colleague, option), headers=headers
+    )
+    assert again.status_code == 201
+    assert again.json()["id"] != first.json()["id"]
+
+
 # ---------------------------------------------------------------------------
 # List Orders
 # ---------------------------------------------------------------------------
@@ -90,6 +164,25 @@ async def test_list_orders(app, session_factory, db):
     assert len(resp.json()) >= 2
 
 
+async def test_list_orders_date_filters(app, session_factory, db):
+    oc, owner, team, tid, colleague, option = await _setup_order_env(app, session_factory, db)
+    await oc.post(
+        f"/api/v1/teams/{tid}/orders",
+        json={"items": [{"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}]},
+    )
+    resp = await oc.get(
+        f"/api/v1/teams/{tid}/orders", params={"created_after": "2000-01-01T00:00:00Z"}
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()) == 1
+
+    resp = await oc.get(
+        f"/api/v1/teams/{tid}/orders", params={"created_before": "2000-01-01T00:00:00Z"}
+    )
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
 # ---------------------------------------------------------------------------
 # Get Order
 # ---------------------------------------------------------------------------
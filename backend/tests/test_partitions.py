@@ -0,0 +1,77 @@
+"""Tests for hot/cold order history management."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from app.models.archive import OrderArchive, OrderItemArchive
+from app.models.order import Order, OrderItem
+from app.services.background import exclusive_lock
+from app.services.partitions import LOCK_PATH, add_months, hot_cutoff, manage_order_partitions
+
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+
+def test_add_months_wraps_years():
+    assert add_months(2026, 11, 3) == (2027, 2)
+    assert add_months(2026, 1, -1) == (2025, 12)
+    assert add_months(2026, 5, -24) == (2024, 5)
+
+
+def test_hot_cutoff_is_month_aligned():
+    now = datetime(2026, 10, 19, 8, 30, tzinfo=timezone.utc)
+    assert hot_cutoff(now, hot_months=12) == datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+
+async def test_sqlite_moves_cold_orders_to_archive(app, session_factory, db):
+    owner_client, owner = await create_authenticated_client(
+        app, session_factory, f"cold_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        owner_u = await create_test_user(s, owner.email)
+        team = await create_team_with_owner(s, owner_u, "Cold Team")
+    menu = await get_menu_ids(db, team.id)
+    colleague = await create_colleague(db, team, "Cold Person")
+    option = await create_coffee_option(db, colleague.id, menu["drink_type_id"], menu["size_id"])
+
+    item = {"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}
+    old = await owner_client.post(f"/api/v1/teams/{team.id}/orders", json={"items": [item]})
+    recent = await owner_client.post(f"/api/v1/teams/{team.id}/orders", json={"items": [item]})
+    old_id = uuid.UUID(old.json()["id"])
+    recent_id = uuid.UUID(recent.json()["id"])
+
+    long_ago = datetime.now(timezone.utc) - timedelta(days=400)
+    await db.execute(update(Order).where(Order.id == old_id).values(created_at=long_ago))
+    await db.execute(
+        update(OrderItem).where(OrderItem.order_id == old_id).values(created_at=long_ago)
+    )
+    await db.commit()
+
+    report = await manage_order_partitions(session_factory, hot_months=12)
+    assert report["archived_orders"] >= 1
+
+    hot_ids = (await db.execute(select(Order.id).where(Order.team_id == team.id))).scalars()
+    assert list(hot_ids) == [recent_id]
+    assert (await db.execute(select(func.count()).where(OrderArchive.id == old_id))).scalar() == 1
+    assert (
+        await db.execute(select(func.count()).where(OrderItemArchive.order_id == old_id))
+    ).scalar() == 1
+
+    # History only lists the hot order now
+    resp = await owner_client.get(f"/api/v1/teams/{team.id}/orders")
+    assert [o["id"] for o in resp.json()] == [str(recent_id)]
+
+
+async def test_partition_maintenance_runs_in_one_worker(session_factory):
+    with exclusive_lock(LOCK_PATH) as locked:
+        assert locked
+        assert await manage_order_partitions(session_factory) == {}
+    assert "archived_orders" in await manage_order_partitions(session_factory)
@@ -0,0 +1,247 @@
+"""Tests for the per-weekday attendance forecast."""
+
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.models.colleague import Colleague
+from app.models.order import Order, OrderItem
+from app.models.presence import ColleaguePresence
+from app.models.watermark import JobWatermark
+from app.services.drink_spec import ensure_specs, spec_from_values
+from app.services.background import exclusive_lock
+from app.services.presence import LOCK_PATH, WATERMARK_NAME, update_presence_forecast
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+# A Monday, long before the orders other tests create
+HISTORY_START = datetime(2020, 1, 6, tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _setup(app, session_factory, db, names=("Ana", "Ben", "Cat")):
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"presence_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+    menu = await get_menu_ids(db, team.id)
+    pairs = []
+    for name in names:
+        colleague = await create_colleague(db, team, name)
+        option = await create_coffee_option(
+            db, colleague.id, menu["drink_type_id"], menu["size_id"]
+        )
+        pairs.append((colleague, option))
+    # Existed for the whole seeded history
+    await db.execute(
+        update(Colleague)
+        .where(Colleague.team_id == team.id)
+        .values(created_at=HISTORY_START - timedelta(days=30))
+    )
+    await db.commit()
+    return client, team, owner, f"/api/v1/teams/{team.id}", pairs
+
+
+async def _place_order(db, team, owner, at, pairs):
+    order = Order(
+        team_id=team.id,
+        share_token=secrets.token_urlsafe(16),
+        created_by=owner.id,
+        created_at=at,
+    )
+    db.add(order)
+    await db.flush()
+    spec = spec_from_values(
+        drink_type_name="Latte",
+        size_name="Regular",
+        size_abbreviation="R",
+        milk_option_name=None,
+        sugar=0,
+        notes=None,
+    )
+    await ensure_specs(db, [spec])
+    for colleague, option in pairs:
+        db.add(
+            OrderItem(
+                order_id=order.id,
+                colleague_id=colleague.id,
+                coffee_option_id=option.id,
+                drink_spec_id=spec["id"],
+            )
+        )
+    await db.commit()
+
+
+async def _reset_watermark(db, at=HISTORY_START):
+    """The watermark is global; start each test's history at a known point."""
+    existing = await db.get(JobWatermark, WATERMARK_NAME)
+    if existing is None:
+        db.add(JobWatermark(name=WATERMARK_NAME, watermark=at))
+    else:
+        existing.watermark = at
+    await db.commit()
+
+
+async def _presence(db, colleague_id, weekday):
+    return (
+        await db.execute(
+            select(ColleaguePresence.days_observed, ColleaguePresence.days_present).where(
+                ColleaguePresence.colleague_id == colleague_id,
+                ColleaguePresence.weekday == weekday,
+            )
+        )
+    ).one_or_none()
+
+
+# ---------------------------------------------------------------------------
+# Incremental job
+# ---------------------------------------------------------------------------
+
+
+async def test_counts_observed_and_present_days(app, session_factory, db):
+    _, team, owner, _, pairs = await _setup(app, session_factory, db)
+    (ana, ana_opt), (ben, ben_opt), (cat, _) = pairs
+    await _reset_watermark(db)
+    # Three Mondays: Ana every week, Ben once, Cat never; one Tuesday with only Ben
+    for week in range(3):
+        monday = HISTORY_START + timedelta(weeks=week, hours=9)
+        ordered = [(ana, ana_opt)] + ([(ben, ben_opt)] if week == 0 else [])
+        await _place_order(db, team, owner, monday, ordered)
+    # Two orders on the same day only count the day once
+    await _place_order(db, team, owner, HISTORY_START + timedelta(hours=15), [(ana, ana_opt)])
+    await _place_order(db, team, owner, HISTORY_START + timedelta(days=1), [(ben, ben_opt)])
+
+    processed = await update_presence_forecast(
+        session_factory, now=HISTORY_START + timedelta(weeks=3)
+    )
+    assert processed == 21
+
+    assert tuple(await _presence(db, ana.id, 0)) == (3, 3)
+    assert tuple(await _presence(db, ben.id, 0)) == (3, 1)
+    assert tuple(await _presence(db, cat.id, 0)) == (3, 0)
+    assert tuple(await _presence(db, ana.id, 1)) == (1, 0)
+    assert tuple(await _presence(db, ben.id, 1)) == (1, 1)
+    # No orders on Wednesdays: not observed at all
+    assert await _presence(db, ana.id, 2) is None
+
+
+async def test_second_run_only_adds_new_days(app, session_factory, db):
+    _, team, owner, _, pairs = await _setup(app, session_factory, db, names=("Ana",))
+    ana = pairs[0][0]
+    await _reset_watermark(db)
+    await _place_order(db, team, owner, HISTORY_START + timedelta(hours=9), pairs)
+
+    await update_presence_forecast(session_factory, now=HISTORY_START + timedelta(days=7))
+    assert (
+        await update_presence_forecast(session_factory, now=HISTORY_START + timedelta(days=7)) == 0
+    )
+    assert tuple(await _presence(db, ana.id, 0)) == (1, 1)
+
+    # Today's orders wait until the day is complete
+    await _place_order(db, team, owner, HISTORY_START + timedelta(days=7, hours=9), pairs)
+    assert (
+        await update_presence_forecast(
+            session_factory, now=HISTORY_START + timedelta(days=7, hours=12)
+        )
+        == 0
+    )
+    assert (
+        await update_presence_forecast(session_factory, now=HISTORY_START + timedelta(days=8)) == 1
+    )
+    assert tuple(await _presence(db, ana.id, 0)) == (2, 2)
+
+
+async def test_one_worker_runs_the_job(app, session_factory, db):
+    _, team, owner, _, pairs = await _setup(app, session_factory, db, names=("Ana",))
+    await _reset_watermark(db)
+    await _place_order(db, team, owner, HISTORY_START + timedelta(hours=9), pairs)
+
+    now = HISTORY_START + timedelta(days=7)
+    with exclusive_lock(LOCK_PATH) as locked:
+        assert locked
+        assert await update_presence_forecast(session_factory, now=now) == 0
+    assert await _presence(db, pairs[0][0].id, 0) is None
+    assert await update_presence_forecast(session_factory, now=now) == 7
+
+
+async def test_colleague_added_later_is_not_observed_before(app, session_factory, db):
+    _, team, owner, _, pairs = await _setup(app, session_factory, db, names=("Ana", "Ben"))
+    (ana, ana_opt), (ben, _) = pairs
+    await db.execute(
+        update(Colleague)
+        .where(Colleague.id == ben.id)
+        .values(created_at=HISTORY_START + timedelta(days=7))
+    )
+    await db.commit()
+    await _reset_watermark(db)
+    for week in range(2):
+        await _place_order(
+            db, team, owner, HISTORY_START + timedelta(weeks=week, hours=9), [(ana, ana_opt)]
+        )
+
+    await update_presence_forecast(session_factory, now=HISTORY_START + timedelta(weeks=2))
+    assert tuple(await _presence(db, ben.id, 0)) == (1, 0)
+
+
+# ---------------------------------------------------------------------------
+# Endpoint
+# ---------------------------------------------------------------------------
+
+
+async def test_forecast_endpoint(app, session_factory, db):
+    client, team, owner, base, pairs = await _setup(app, session_factory, db)
+    (ana, ana_opt), (ben, ben_opt), (cat, _) = pairs
+    await db.execute(update(Colleague).where(Colleague.id == cat.id).values(usually_in=False))
+    await db.commit()
+    await _reset_watermark(db)
+    for week in range(4):
+        ordered = [(ana, ana_opt)] + ([(ben, ben_opt)] if week == 0 else [])
+        await _place_order(db, team, owner, HISTORY_START + timedelta(weeks=week), ordered)
+    await update_presence_forecast(session_factory, now=HISTORY_START + timedelta(weeks=4))
+
+    resp = await client.get(f"{base}/colleagues/presence-forecast", params={"weekday": 0})
+    assert resp.status_code == 200
+    forecast = {f["colleague_id"]: f for f in resp.json()}
+    assert forecast[str(ana.id)]["probability"] == 1.0
+    assert forecast[str(ana.id)]["likely_in"] is True
+    assert forecast[str(ben.id)]["probability"] == 0.25
+    assert forecast[str(ben.id)]["likely_in"] is False
+    assert forecast[str(cat.id)]["days_observed"] == 4
+    assert forecast[str(cat.id)]["likely_in"] is False
+
+    # Not enough history for Tuesdays: falls back to usually_in
+    tuesday = (
+        await client.get(f"{base}/colleagues/presence-forecast", params={"weekday": 1})
+    ).json()
+    by_id = {f["colleague_id"]: f for f in tuesday}
+    assert by_id[str(ana.id)]["probability"] is None
+    assert by_id[str(ana.id)]["likely_in"] is True
+    assert by_id[str(cat.id)]["likely_in"] is False
+
+
+async def test_forecast_endpoint_excludes_visitors_and_rejects_bad_weekday(
+    app, session_factory, db
+):
+    client, team, _, base, _ = await _setup(app, session_factory, db, names=("Ana",))
+    await create_colleague(db, team, "Guest", colleague_type="visitor")
+
+    resp = await client.get(f"{base}/colleagues/presence-forecast")
+    assert resp.status_code == 200
+    assert len(resp.json()) == 1
+    assert resp.json()[0]["weekday"] == datetime.now(timezone.utc).weekday()
+
+    resp = await client.get(f"{base}/colleagues/presence-forecast", params={"weekday": 7})
+    assert resp.status_code == 400
@@ -0,0 +1,155 @@
+"""Tests for opt-in request profiling and the /api/profiles admin endpoints."""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.middleware.profiling import ProfilingMiddleware
+from app.services.profiling import ProfileStore, RequestProfile, SharedProfileStore, profile_store
+
+TOKEN = "profile-secret"
+
+
+def _demo() -> FastAPI:
+    from app.routers import profiles
+
+    demo = FastAPI()
+    demo.include_router(profiles.router, prefix="/api")
+
+    @demo.get("/slow")
+    async def slow_endpoint():
+        await asyncio.sleep(0.01)
+        time.sleep(0.02)
+        return {"ok": True}
+
+    return demo
+
+
+@pytest.fixture
+async def profiled(monkeypatch):
+    """A demo app wrapped in the profiling middleware, with the admin router mounted."""
+    monkeypatch.setattr(settings, "profiling_token", TOKEN)
+    monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+    profile_store.clear()
+
+    transport = ASGITransport(app=ProfilingMiddleware(_demo()))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    profile_store.clear()
+
+
+# ---------------------------------------------------------------------------
+# Triggering
+# ---------------------------------------------------------------------------
+
+
+async def test_requests_are_not_profiled_by_default(profiled):
+    resp = await profiled.get("/slow")
+    assert resp.status_code == 200
+    assert "x-profile-id" not in resp.headers
+    assert len(profile_store) == 0
+
+
+async def test_wrong_token_is_not_profiled(profiled):
+    resp = await profiled.get("/slow", headers={"X-Profile-Token": "guess"})
+    assert "x-profile-id" not in resp.headers
+    assert len(profile_store) == 0
+
+
+async def test_admin_header_profiles_the_request(profiled):
+    resp = await profiled.get("/slow", headers={"X-Profile-Token": TOKEN})
+    assert resp.status_code == 200
+    profile = profile_store.get(resp.headers["x-profile-id"])
+    assert profile.trigger == "header"
+    assert (profile.method, profile.path, profile.status) == ("GET", "/slow", 200)
+    assert profile.duration_ms >= 30
+
+
+async def test_sample_rate_profiles_without_exposing_the_id(profiled, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_sample_rate", 1.0)
+    resp = await profiled.get("/slow")
+    assert "x-profile-id" not in resp.headers
+    (summary,) = profile_store.summaries()
+    assert summary["trigger"] == "sample"
+
+
+# ---------------------------------------------------------------------------
+# Admin endpoints
+# ---------------------------------------------------------------------------
+
+
+async def test_profiles_require_the_token(profiled):
+    assert (await profiled.get("/api/profiles")).status_code == 403
+    resp = await profiled.get("/api/profiles", headers={"X-Profile-Token": "guess"})
+    assert resp.status_code == 403
+
+
+async def test_profile_downloads_as_speedscope_json(profiled):
+    admin = {"X-Profile-Token": TOKEN}
+    profile_id = (await profiled.get("/slow", headers=admin)).headers["x-profile-id"]
+
+    listing = (await profiled.get("/api/profiles", headers=admin)).json()
+    assert [p["id"] for p in listing] == [profile_id]  # fetching is not itself profiled
+
+    resp = await profiled.get(f"/api/profiles/{profile_id}", headers=admin)
+    assert resp.status_code == 200
+    assert f"{profile_id}.speedscope.json" in resp.headers["content-disposition"]
+    speedscope = json.loads(resp.content)
+    assert speedscope["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    frames = [frame["name"] for frame in speedscope["shared"]["frames"]]
+    assert "slow_endpoint" in frames
+
+    missing = await profiled.get("/api/profiles/nope", headers=admin)
+    assert missing.status_code == 404
+
+
+async def test_any_worker_serves_profiles_from_the_shared_directory(tmp_path, monkeypatch):
+    from app.routers import profiles
+
+    monkeypatch.setattr(settings, "profiling_token", TOKEN)
+    monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+    # One worker records, another (with its own store on the same directory) answers
+    recorder = SharedProfileStore(maxsize=2, directory=tmp_path)
+    monkeypatch.setattr(profiles, "profile_store", SharedProfileStore(2, tmp_path))
+
+    admin = {"X-Profile-Token": TOKEN}
+    transport = ASGITransport(app=ProfilingMiddleware(_demo(), store=recorder))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = [(await client.get("/slow", headers=admin)).headers["x-profile-id"] for _ in range(3)]
+
+        listing = (await client.get("/api/profiles", headers=admin)).json()
+        assert [p["id"] for p in listing] == [ids[2], ids[1]]
+
+        resp = await client.get(f"/api/profiles/{ids[2]}", headers=admin)
+        assert resp.status_code == 200
+        frames = [frame["name"] for frame in json.loads(resp.content)["shared"]["frames"]]
+        assert "slow_endpoint" in frames
+        assert (await client.get(f"/api/profiles/{ids[0]}", headers=admin)).status_code == 404
+        # Ids are matched exactly, never as a pattern
+        assert (await client.get("/api/profiles/*", headers=admin)).status_code == 404
+    assert len(recorder) == 2
+
+
+def test_store_keeps_only_the_newest_profiles():
+    store = ProfileStore(maxsize=2)
+    for n in range(3):
+        store.add(
+            RequestProfile(
+                id=str(n),
+                method="GET",
+                path="/",
+                status=200,
+                duration_ms=1.0,
+                trigger="sample",
+                created_at=datetime.now(timezone.utc),
+                session=None,
+            )
+        )
+    assert [p["id"] for p in store.summaries()] == ["2", "1"]
+    assert store.get("0") is None
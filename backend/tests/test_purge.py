@@ -0,0 +1,117 @@
+"""Tests for the inactive-team purge/archival job."""
+
+import uuid
+
+from sqlalchemy import func, select
+
+from app.models.archive import OrderArchive, OrderItemArchive
+from app.models.colleague import Colleague
+from app.models.menu import DrinkType
+from app.models.order import Order, OrderItem
+from app.models.team import Team, TeamMembership
+from app.services.background import exclusive_lock
+from app.services.purge import LOCK_PATH, purge_inactive_teams, purge_team
+
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+
+async def _deleted_team_with_orders(app, session_factory, db, order_count: int):
+    owner_client, owner = await create_authenticated_client(
+        app, session_factory, f"purge_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        owner_u = await create_test_user(s, owner.email)
+        team = await create_team_with_owner(s, owner_u, "Purge Team")
+    menu = await get_menu_ids(db, team.id)
+    colleague = await create_colleague(db, team, "Purged Person")
+    option = await create_coffee_option(db, colleague.id, menu["drink_type_id"], menu["size_id"])
+
+    item = {"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}
+    for _ in range(order_count):
+        resp = await owner_client.post(f"/api/v1/teams/{team.id}/orders", json={"items": [item]})
+        assert resp.status_code == 201
+
+    resp = await owner_client.delete(f"/api/v1/teams/{team.id}")
+    assert resp.status_code == 200
+    return team
+
+
+async def _count(db, model, *where) -> int:
+    return (await db.execute(select(func.count()).select_from(model).where(*where))).scalar()
+
+
+async def test_purge_team_archives_orders_in_chunks(app, session_factory, db):
+    team = await _deleted_team_with_orders(app, session_factory, db, order_count=5)
+
+    moved = await purge_team(session_factory, team.id, chunk_size=2, archive=True)
+    assert moved == 5
+
+    assert await _count(db, Order, Order.team_id == team.id) == 0
+    assert await _count(db, OrderArchive, OrderArchive.team_id == team.id) == 5
+    archived_names = (
+        (
+            await db.execute(
+                select(OrderItemArchive.colleague_name)
+                .join(OrderArchive, OrderItemArchive.order_id == OrderArchive.id)
+                .where(OrderArchive.team_id == team.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert archived_names == ["Purged Person"] * 5
+
+    # Team-scoped hot rows are gone; the team row remains as a tombstone
+    assert await _count(db, Colleague, Colleague.team_id == team.id) == 0
+    assert await _count(db, DrinkType, DrinkType.team_id == team.id) == 0
+    assert await _count(db, TeamMembership, TeamMembership.team_id == team.id) == 0
+    purged = (await db.execute(select(Team).where(Team.id == team.id))).scalar_one()
+    assert purged.purged_at is not None
+
+
+async def test_purge_team_delete_mode_skips_archive(app, session_factory, db):
+    team = await _deleted_team_with_orders(app, session_factory, db, order_count=2)
+    order_ids = select(Order.id).where(Order.team_id == team.id)
+    item_count = await _count(db, OrderItem, OrderItem.order_id.in_(order_ids))
+    assert item_count == 2
+
+    await purge_team(session_factory, team.id, archive=False)
+
+    assert await _count(db, Order, Order.team_id == team.id) == 0
+    assert await _count(db, OrderArchive, OrderArchive.team_id == team.id) == 0
+
+
+async def test_purge_inactive_teams_skips_active_and_purged(app, session_factory, db):
+    team = await _deleted_team_with_orders(app, session_factory, db, order_count=1)
+    async with session_factory() as s:
+        owner = await create_test_user(s, f"alive_{uuid.uuid4().hex[:8]}@example.com")
+        live_team = await create_team_with_owner(s, owner, "Live Team")
+
+    assert await purge_inactive_teams(session_factory, grace_days=0) >= 1
+    assert await _count(db, OrderArchive, OrderArchive.team_id == team.id) == 1
+    assert await _count(db, DrinkType, DrinkType.team_id == live_team.id) > 0
+
+    # Already purged teams are not processed again
+    assert await purge_inactive_teams(session_factory, grace_days=0) == 0
+
+
+async def test_purge_inactive_teams_runs_in_one_worker(app, session_factory, db):
+    team = await _deleted_team_with_orders(app, session_factory, db, order_count=1)
+    with exclusive_lock(LOCK_PATH) as locked:
+        assert locked
+        assert await purge_inactive_teams(session_factory, grace_days=0) == 0
+    assert await _count(db, Order, Order.team_id == team.id) == 1
+    assert await purge_inactive_teams(session_factory, grace_days=0) >= 1
+
+
+async def test_purge_inactive_teams_respects_grace_period(app, session_factory, db):
+    team = await _deleted_team_with_orders(app, session_factory, db, order_count=1)
+    await purge_inactive_teams(session_factory, grace_days=7)
+    assert await _count(db, Order, Order.team_id == team.id) == 1
@@ -0,0 +1,87 @@
+"""Tests for the cached hot-path statements and compiled-cache statistics."""
+
+import uuid
+
+import pytest
+from tests.conftest import create_authenticated_client, create_team_with_owner, create_test_user
+
+from app.middleware.auth import _membership_query
+from app.models.menu import DrinkType, MilkOption, Size
+from app.routers.menu import _active_items_query
+from app.routers.shared_orders import _shared_order_query
+from app.services.query_cache import QueryCacheStats
+
+
+@pytest.fixture
+def stats(engine):
+    stats = QueryCacheStats()
+    stats.attach(engine.sync_engine)
+    yield stats
+    stats.detach()
+
+
+def _cache_key(statement):
+    return statement._generate_cache_key()
+
+
+def test_hot_statements_bind_their_values():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    assert _cache_key(_membership_query(a, b)) == _cache_key(_membership_query(b, a))
+    assert _cache_key(_shared_order_query("x")) == _cache_key(_shared_order_query("y"))
+    assert _cache_key(_active_items_query(Size, a)) == _cache_key(_active_items_query(Size, b))
+
+
+def test_menu_statement_differs_per_model():
+    team_id = uuid.uuid4()
+    drink_types, sizes, milk_options = (
+        _cache_key(_active_items_query(m, team_id)) for m in (DrinkType, Size, MilkOption)
+    )
+    assert drink_types != sizes != milk_options != drink_types
+
+
+async def test_repeat_execution_hits_compiled_cache(session_factory, stats):
+    async with session_factory() as db:
+        await db.execute(_membership_query(uuid.uuid4(), uuid.uuid4()))
+        stats.reset()
+        for _ in range(3):
+            await db.execute(_membership_query(uuid.uuid4(), uuid.uuid4()))
+        await (await db.connection()).exec_driver_sql("SELECT 1")
+
+    snapshot = stats.snapshot()
+    assert snapshot["hits"] == 3
+    assert snapshot["misses"] == 0
+    assert snapshot["uncached"] == 1
+    assert snapshot["hit_ratio"] == 1.0
+    assert snapshot["cache_entries"] > 0
+    assert snapshot["repeat_misses"] == []
+
+
+async def test_endpoints_reuse_compiled_statements(app, session_factory, stats):
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"qcache_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+    url = f"/api/v1/teams/{team.id}/menu/sizes"
+
+    await client.get(url)
+    stats.reset()
+    for _ in range(3):
+        assert (await client.get(url)).status_code == 200
+
+    assert stats.misses == 0
+    assert stats.hits >= 3 * 3  # user lookup, membership check, size list
+
+
+async def test_diagnostics_endpoint_reports_stats():
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from app.routers import diagnostics
+
+    demo = FastAPI()
+    demo.include_router(diagnostics.router, prefix="/api")
+    async with AsyncClient(transport=ASGITransport(app=demo), base_url="http://test") as client:
+        resp = await client.get("/api/diagnostics/query-cache")
+    assert resp.status_code == 200
+    assert {"hits", "misses", "hit_ratio", "cache_capacity", "repeat_misses"} <= set(resp.json())
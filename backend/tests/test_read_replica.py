@@ -0,0 +1,123 @@
+"""Tests for routing read-only endpoints to a read replica (here a second SQLite file)."""
+
+import os
+import tempfile
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import READ_PRIMARY_COOKIE, read_replica
+from app.middleware.replica import ReadYourWritesMiddleware
+from app.models.user import Base
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def replica():
+    """An empty replica database: anything a read finds there proves it was routed."""
+    fd, path = tempfile.mkstemp(suffix=".db", prefix="test_replica_")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    read_replica.configure(async_sessionmaker(engine, class_=AsyncSession))
+    yield read_replica
+    read_replica.configure(None)
+    await engine.dispose()
+    os.unlink(path)
+
+
+async def _team_with_order(app, session_factory, db):
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"replica_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+    menu = await get_menu_ids(db, team.id)
+    colleague = await create_colleague(db, team, "Ana")
+    option = await create_coffee_option(db, colleague.id, menu["drink_type_id"], menu["size_id"])
+    base = f"/api/v1/teams/{team.id}"
+    item = {"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}
+    resp = await client.post(f"{base}/orders", json={"items": [item]})
+    assert resp.status_code == 201
+    return client, base, resp.json(), item
+
+
+# ---------------------------------------------------------------------------
+# Routing
+# ---------------------------------------------------------------------------
+
+
+async def test_reads_go_to_replica(app, session_factory, db, replica):
+    client, base, order, item = await _team_with_order(app, session_factory, db)
+
+    # The order only exists on the primary; the membership check still runs there
+    resp = await client.get(f"{base}/orders")
+    assert resp.status_code == 200
+    assert resp.json() == []
+    resp = await client.get(f"{base}/orders/{order['id']}")
+    assert resp.status_code == 404
+    assert replica.replica_reads >= 2
+
+    # Writes are never routed
+    resp = await client.put(f"{base}/orders/{order['id']}", json={"items": [item, item]})
+    assert resp.status_code == 200
+    assert len(resp.json()["items"]) == 2
+
+
+async def test_recent_write_reads_from_primary(app, session_factory, db, replica):
+    client, base, order, _ = await _team_with_order(app, session_factory, db)
+    client.cookies.set(READ_PRIMARY_COOKIE, "1")
+    resp = await client.get(f"{base}/orders")
+    assert [o["id"] for o in resp.json()] == [order["id"]]
+
+
+async def test_unavailable_replica_falls_back_to_primary(app, session_factory, db, replica):
+    client, base, order, _ = await _team_with_order(app, session_factory, db)
+    missing = os.path.join(tempfile.gettempdir(), uuid.uuid4().hex, "replica.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///file:{missing}?mode=ro&uri=true")
+    replica.configure(async_sessionmaker(engine, class_=AsyncSession))
+
+    resp = await client.get(f"{base}/orders/{order['id']}")
+    assert resp.status_code == 200
+    assert replica.unavailable_until > 0
+    await engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# Read-your-writes cookie
+# ---------------------------------------------------------------------------
+
+
+async def test_successful_write_sets_sticky_cookie(app, session_factory, db):
+    client, base, _, item = await _team_with_order(app, session_factory, db)
+    transport = ASGITransport(app=ReadYourWritesMiddleware(app))
+    async with AsyncClient(
+        transport=transport, base_url="http://test", cookies=client.cookies
+    ) as sticky_client:
+        resp = await sticky_client.post(f"{base}/orders", json={"items": [item]})
+        assert resp.status_code == 201
+        cookie = resp.headers["set-cookie"]
+        assert cookie.startswith(f"{READ_PRIMARY_COOKIE}=1;")
+        assert "Max-Age=" in cookie
+
+        resp = await sticky_client.get(f"{base}/orders")
+        assert "set-cookie" not in resp.headers
+
+        resp = await sticky_client.put(f"{base}/orders/{uuid.uuid4()}", json={"items": []})
+        assert resp.status_code == 404
+        assert "set-cookie" not in resp.headers
@@ -0,0 +1,110 @@
+"""Tests for the /api/ready readiness checks."""
+
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+from app.services import readiness as readiness_module
+from app.services.readiness import check_readiness, loop_lag, migration_heads
+from app.services.warmup import WarmupStatus, warmup_status
+
+READY = WarmupStatus(done=True)
+
+
+# ---------------------------------------------------------------------------
+# Endpoint
+# ---------------------------------------------------------------------------
+
+
+async def test_ready_reports_warming_until_warm_up_finishes(client, monkeypatch):
+    monkeypatch.setattr(warmup_status, "done", False)
+    resp = await client.get("/api/ready")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "warming"
+
+    # Liveness is unaffected
+    assert (await client.get("/api/health")).status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Checks
+# ---------------------------------------------------------------------------
+
+
+async def test_ready_when_database_answers(engine):
+    readiness = await check_readiness(engine, READY, check_migrations=False)
+    assert readiness.ready
+    assert readiness.checks["database"]["ok"]
+    assert readiness.checks["event_loop"]["ok"]
+
+
+async def test_migrations_must_be_at_head(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES ('001')"))
+
+    readiness = await check_readiness(engine, READY, check_migrations=True)
+    assert readiness.status == "not_ready"
+    assert readiness.checks["migrations"] == {
+        "ok": False,
+        "current": ["001"],
+        "head": sorted(migration_heads()),
+    }
+
+    (head,) = migration_heads()
+    async with engine.begin() as conn:
+        await conn.execute(text("UPDATE alembic_version SET version_num = :v"), {"v": head})
+    assert (await check_readiness(engine, READY, check_migrations=True)).ready
+    await engine.dispose()
+
+
+async def test_unreachable_database_is_not_ready(tmp_path):
+    missing = tmp_path / "missing" / "db.sqlite"
+    engine = create_async_engine(f"sqlite+aiosqlite:///file:{missing}?mode=ro&uri=true")
+    readiness = await check_readiness(engine, READY, check_migrations=False)
+    assert readiness.status == "not_ready"
+    assert readiness.checks["database"] == {"ok": False, "error": "OperationalError"}
+    await engine.dispose()
+
+
+async def test_database_probe_times_out(engine, monkeypatch):
+    monkeypatch.setattr(settings, "ready_db_timeout_seconds", 0)
+    readiness = await check_readiness(engine, READY, check_migrations=False)
+    assert readiness.checks["database"] == {"ok": False, "error": "timeout"}
+
+
+async def test_exhausted_pool_is_not_ready(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    async with engine.connect() as held:
+        await held.execute(text("SELECT 1"))
+        readiness = await check_readiness(engine, READY, check_migrations=False)
+        assert readiness.checks["pool"] == {"ok": False, "checked_out": 1, "limit": 1}
+        # Probing the database would only queue behind the held connection
+        assert "database" not in readiness.checks
+    assert (await check_readiness(engine, READY, check_migrations=False)).ready
+    await engine.dispose()
+
+
+async def test_loop_lag_measures_blocking_callbacks():
+    asyncio.get_running_loop().call_soon(time.sleep, 0.05)
+    assert await loop_lag() >= 0.04
+
+
+async def test_lagging_event_loop_is_not_ready(engine, monkeypatch):
+    async def _slow_loop():
+        return 0.8
+
+    monkeypatch.setattr(readiness_module, "loop_lag", _slow_loop)
+    readiness = await check_readiness(engine, READY, check_migrations=False)
+    assert readiness.status == "not_ready"
+    assert readiness.checks["event_loop"] == {"ok": False, "lag_ms": 800.0}
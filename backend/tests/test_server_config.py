@@ -0,0 +1,60 @@
+"""Tests for the adaptive gunicorn configuration."""
+
+from app.server_config import (
+    FAST_WORKER,
+    PURE_PYTHON_WORKER,
+    build_server_config,
+    default_workers,
+    startup_report,
+)
+
+
+def test_workers_follow_cpus():
+    assert default_workers(4, None, worker_memory_mb=160, cap=8) == 4
+    assert default_workers(1.5, None, worker_memory_mb=160, cap=8) == 2
+    assert default_workers(0.5, None, worker_memory_mb=160, cap=8) == 1
+
+
+def test_workers_bounded_by_memory_and_cap():
+    # 512 MiB keeps half as headroom: 256 // 160 = 1 worker
+    assert default_workers(8, 512, worker_memory_mb=160, cap=8) == 1
+    assert default_workers(32, 64_000, worker_memory_mb=160, cap=8) == 8
+
+
+def test_defaults():
+    config = build_server_config(env={}, cpus=2, memory_mb=4096)
+    assert config.workers == 2
+    assert config.worker_class == FAST_WORKER
+    assert config.keepalive > 120  # outlives Caddy's idle upstream connections
+    assert config.max_requests > 0
+    assert 0 < config.max_requests_jitter < config.max_requests
+    assert config.preload_app is True
+    assert config.forwarded_allow_ips == "127.0.0.1,::1"
+
+
+def test_env_overrides():
+    env = {
+        "WEB_CONCURRENCY": "5",
+        "GUNICORN_KEEPALIVE": "10",
+        "GUNICORN_MAX_REQUESTS": "0",
+        "GUNICORN_PRELOAD": "false",
+        "SERVER_FAST_LOOP": "0",
+        "GUNICORN_BIND": "127.0.0.1:9000",
+        "FORWARDED_ALLOW_IPS": "172.18.0.0/16",
+    }
+    config = build_server_config(env=env, cpus=2, memory_mb=4096)
+    assert config.workers == 5
+    assert config.keepalive == 10
+    assert config.max_requests == 0
+    assert config.max_requests_jitter == 0
+    assert config.preload_app is False
+    assert config.worker_class == PURE_PYTHON_WORKER
+    assert config.bind == "127.0.0.1:9000"
+    assert config.forwarded_allow_ips == "172.18.0.0/16"
+
+
+def test_startup_report_lists_effective_settings():
+    report = startup_report(build_server_config(env={}, cpus=2, memory_mb=2048))
+    assert "workers=2" in report
+    assert "memory=2048 MiB" in report
+    assert "keepalive=130s" in report
@@ -1,8 +1,11 @@
 """Unit tests for pure service functions."""
 
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 
+import pytest
+
 from app.services.auth import (
     create_jwt,
     decode_jwt,
@@ -89,6 +92,64 @@ def test_decode_jwt_tampered():
     assert decode_jwt(tampered) is None
 
 
+def test_decode_jwt_served_from_cache():
+    from app.services.auth import claims_cache
+
+    token = create_jwt(uuid.uuid4(), "cache@example.com")
+    first = decode_jwt(token)
+    hits = claims_cache.hits
+    second = decode_jwt(token)
+    assert second == first
+    assert claims_cache.hits == hits + 1
+
+
+def test_decode_jwt_does_not_cache_invalid_tokens():
+    from app.services.auth import claims_cache
+
+    token = create_jwt(uuid.uuid4(), "badcache@example.com")
+    # Flip a character inside the signature (the last one may only carry padding bits)
+    tampered = token[:-5] + ("a" if token[-5] != "a" else "b") + token[-4:]
+    assert decode_jwt(tampered) is None
+    assert claims_cache.get(tampered) is None
+
+
+def test_claims_cache_evicts_expired_entries():
+    from app.services.auth import ClaimsCache
+
+    cache = ClaimsCache(maxsize=8)
+    cache.put("stale", {"sub": "x", "exp": time.time() - 1})
+    assert cache.get("stale") is None
+    assert len(cache) == 0
+
+
+def test_claims_cache_is_bounded_lru():
+    from app.services.auth import ClaimsCache
+
+    exp = time.time() + 60
+    cache = ClaimsCache(maxsize=2)
+    cache.put("a", {"exp": exp})
+    cache.put("b", {"exp": exp})
+    cache.get("a")
+    cache.put("c", {"exp": exp})
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_verify_jwt_pyjwt_backend(monkeypatch):
+    pytest.importorskip("jwt")
+    from app.config import settings
+    from app.services.auth import verify_jwt
+
+    monkeypatch.setattr(settings, "jwt_backend", "pyjwt")
+    user_id = uuid.uuid4()
+    token = create_jwt(user_id, "pyjwt@example.com")
+    assert verify_jwt(token)["sub"] == str(user_id)
+    tampered = token[:-5] + ("a" if token[-5] != "a" else "b") + token[-4:]
+    assert verify_jwt(tampered) is None
+
+
 # ---------------------------------------------------------------------------
 # Order consolidation
 # ---------------------------------------------------------------------------
@@ -212,3 +273,118 @@ async def test_seed_team_menu(db):
     for m in milks:
         assert m.team_id == team.id
         assert m.is_active is True
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting and request coalescing
+# ---------------------------------------------------------------------------
+
+
+async def test_in_memory_token_bucket():
+    from app.services.rate_limit import InMemoryRateLimitBackend
+
+    backend = InMemoryRateLimitBackend()
+    assert await backend.take("k", capacity=2, refill_per_second=0.001) == 0
+    assert await backend.take("k", capacity=2, refill_per_second=0.001) == 0
+    assert await backend.take("k", capacity=2, refill_per_second=0.001) > 0
+    assert await backend.take("other", capacity=2, refill_per_second=0.001) == 0
+
+
+async def test_coalescer_runs_concurrent_calls_once():
+    import asyncio
+
+    from app.services.rate_limit import RequestCoalescer
+
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "sent"
+
+    coalescer = RequestCoalescer(window_seconds=30)
+    results = await asyncio.gather(*(coalescer.run("a@example.com", work) for _ in range(3)))
+    assert calls == 1
+    assert [r[0] for r in results] == ["sent"] * 3
+    assert sorted(r[1] for r in results) == [False, True, True]
+
+
+async def test_coalescer_retries_after_failure():
+    from app.services.rate_limit import RequestCoalescer
+
+    async def boom():
+        raise RuntimeError("smtp down")
+
+    async def ok():
+        return "sent"
+
+    coalescer = RequestCoalescer(window_seconds=30)
+    with pytest.raises(RuntimeError):
+        await coalescer.run("b@example.com", boom)
+    assert await coalescer.run("b@example.com", ok) == ("sent", False)
+
+
+# ---------------------------------------------------------------------------
+# Primary keys
+# ---------------------------------------------------------------------------
+
+
+def test_uuid7_layout():
+    from app.models.ids import uuid7
+
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert before <= value.int >> 80 <= after
+
+
+def test_uuid7_is_monotonic_within_a_millisecond(monkeypatch):
+    from app.models import ids
+
+    # A frozen clock exhausts the per-millisecond counter; ids must keep increasing
+    frozen = time.time_ns()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: frozen)
+    # Restored afterwards, so the clock this test pushes ahead does not leak out
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    values = [ids.uuid7() for _ in range(10_000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+async def test_uuids_stored_as_16_byte_blobs_on_sqlite(db):
+    from sqlalchemy import text
+
+    from app.models.user import User
+
+    user = User(email=f"blob_{uuid.uuid4().hex[:8]}@example.com")
+    db.add(user)
+    await db.commit()
+    stored = (
+        await db.execute(
+            text("SELECT typeof(id), length(id) FROM users WHERE email = :email"),
+            {"email": user.email},
+        )
+    ).one()
+    assert tuple(stored) == ("blob", 16)
+    assert (await db.execute(select(User).where(User.id == user.id))).scalar_one().id == user.id
+
+
+# ---------------------------------------------------------------------------
+# Response serialization
+# ---------------------------------------------------------------------------
+
+
+def test_json_serializer_matches_model_dump():
+    import json
+
+    from app.responses import JSONSerializer
+    from app.schemas.order import DrinkStat
+
+    stats = [DrinkStat(drink_name="Latte", count=3), DrinkStat(drink_name="Mocha", count=1)]
+    response = JSONSerializer(list[DrinkStat]).response(stats, headers={"X-Test": "1"})
+    assert response.media_type == "application/json"
+    assert response.headers["X-Test"] == "1"
+    assert json.loads(response.body) == [s.model_dump() for s in stats]
@@ -0,0 +1,137 @@
+"""Tests for cold start: import profile, lifespan warm-up and the migration check."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.services.warmup import WarmupStatus, optional_modules, preimport_modules, warm_up
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Generous: catches an accidental heavy import, not interpreter noise on slow CI
+IMPORT_BUDGET_MS = 5000
+
+# Only needed once a request actually uses them; the warm-up imports them before traffic
+LAZY_MODULES = {"resend", "redis", "brotli", "alembic", "pyinstrument", "duckdb"}
+
+
+def _import_profile() -> dict[str, int]:
+    """Cumulative microseconds per module from ``python -X importtime -c 'import app.main'``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONPATH": "."},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        profile[module.strip()] = int(cumulative)
+    return profile
+
+
+# ---------------------------------------------------------------------------
+# Import profile
+# ---------------------------------------------------------------------------
+
+
+def test_app_import_time_within_budget():
+    profile = _import_profile()
+    slowest = sorted(profile.items(), key=lambda item: item[1], reverse=True)[:10]
+    report = ", ".join(f"{name}={us / 1000:.0f}ms" for name, us in slowest)
+    assert profile["app.main"] / 1000 < IMPORT_BUDGET_MS, report
+
+
+def test_optional_dependencies_not_imported_eagerly():
+    profile = _import_profile()
+    eager = {name for name in profile if name.split(".")[0] in LAZY_MODULES}
+    assert not eager
+
+
+# ---------------------------------------------------------------------------
+# Warm-up
+# ---------------------------------------------------------------------------
+
+
+async def test_warm_up_runs_every_step(engine, session_factory):
+    status = WarmupStatus()
+    await warm_up(engine, session_factory, status)
+    assert status.done
+    assert set(status.steps) == {"imports", "jwt", "pool", "queries"}
+    assert status.duration_ms is not None
+
+
+async def test_warm_up_survives_failing_step(engine):
+    def broken_session_factory():
+        raise RuntimeError("database unavailable")
+
+    status = WarmupStatus()
+    await warm_up(engine, broken_session_factory, status)
+    assert status.done
+    assert "queries" in status.steps
+
+
+def test_optional_modules_follow_settings(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "resend_api_key", "re_test")
+    monkeypatch.setattr(settings, "compression_enabled", False)
+    modules = optional_modules()
+    assert "resend" in modules
+    assert "brotli" not in modules
+    assert preimport_modules(["definitely_not_installed_module"]) == []
+
+
+# ---------------------------------------------------------------------------
+# Migration check
+# ---------------------------------------------------------------------------
+
+
+def _migrate(database_url: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "app.cli", "migrate", *args],
+        cwd=BACKEND_DIR,
+        env={
+            **os.environ,
+            "PYTHONPATH": ".",
+            "DATABASE_URL": database_url,
+            "ENVIRONMENT": "production",
+        },
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_migrate_skips_when_current(tmp_path):
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'migrate.db'}"
+
+    behind = _migrate(database_url, "--check")
+    assert behind.returncode == 1
+    assert "behind" in behind.stdout
+
+    assert _migrate(database_url).returncode == 0
+
+    current = _migrate(database_url)
+    assert current.returncode == 0
+    assert "is current" in current.stdout
+    assert "Running upgrade" not in current.stderr
+
+
+def test_migrated_schema_matches_models(tmp_path):
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'check.db'}"
+    assert _migrate(database_url).returncode == 0
+
+    check = subprocess.run(
+        [sys.executable, "-m", "alembic", "check"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONPATH": ".", "DATABASE_URL": database_url},
+        capture_output=True,
+        text=True,
+    )
+    assert check.returncode == 0, check.stderr
+    assert "No new upgrade operations detected" in check.stdout
@@ -0,0 +1,153 @@
+"""Tests for the incrementally maintained usual-drink counts and predictions."""
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from app.models.drink_frequency import DrinkFrequency
+from tests.conftest import (
+    create_authenticated_client,
+    create_coffee_option,
+    create_colleague,
+    create_team_with_owner,
+    create_test_user,
+    get_menu_ids,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _setup(app, session_factory, db):
+    """Owner client + team with Ana (flat white, latte) and Ben (one option)."""
+    client, owner = await create_authenticated_client(
+        app, session_factory, f"usual_{uuid.uuid4().hex[:8]}@example.com"
+    )
+    async with session_factory() as s:
+        team = await create_team_with_owner(s, await create_test_user(s, owner.email))
+    menu = await get_menu_ids(db, team.id)
+    ana = await create_colleague(db, team, "Ana")
+    ben = await create_colleague(db, team, "Ben")
+    ana_flat_white = await create_coffee_option(
+        db, ana.id, menu["drink_type_id"], menu["size_id"], is_default=True
+    )
+    ana_latte = await create_coffee_option(
+        db, ana.id, menu["drink_type_id"], menu["size_id"], menu["milk_option_id"]
+    )
+    ben_option = await create_coffee_option(db, ben.id, menu["drink_type_id"], menu["size_id"])
+    options = {"ana_flat_white": ana_flat_white, "ana_latte": ana_latte, "ben": ben_option}
+    return client, f"/api/v1/teams/{team.id}", ana, ben, options
+
+
+def _item(colleague, option):
+    return {"colleague_id": str(colleague.id), "coffee_option_id": str(option.id)}
+
+
+async def _count(db, colleague_id, option_id):
+    return await db.scalar(
+        select(func.coalesce(func.sum(DrinkFrequency.order_count), 0)).where(
+            DrinkFrequency.colleague_id == colleague_id,
+            DrinkFrequency.coffee_option_id == option_id,
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+# Counts maintained on order write
+# ---------------------------------------------------------------------------
+
+
+async def test_create_order_counts_items(app, session_factory, db):
+    client, base, ana, ben, options = await _setup(app, session_factory, db)
+    for _ in range(2):
+        resp = await client.post(
+            f"{base}/orders",
+            json={"items": [_item(ana, options["ana_latte"]), _item(ben, options["ben"])]},
+        )
+        assert resp.status_code == 201
+
+    assert await _count(db, ana.id, options["ana_latte"].id) == 2
+    assert await _count(db, ben.id, options["ben"].id) == 2
+    assert await _count(db, ana.id, options["ana_flat_white"].id) == 0
+    weekday = await db.scalar(
+        select(DrinkFrequency.weekday).where(DrinkFrequency.colleague_id == ana.id)
+    )
+    assert weekday == datetime.now(timezone.utc).weekday()
+
+
+async def test_update_order_replaces_counts(app, session_factory, db):
+    client, base, ana, _, options = await _setup(app, session_factory, db)
+    order = (
+        await client.post(f"{base}/orders", json={"items": [_item(ana, options["ana_latte"])]})
+    ).json()
+
+    resp = await client.put(
+        f"{base}/orders/{order['id']}",
+        json={"items": [_item(ana, options["ana_flat_white"])]},
+    )
+    assert resp.status_code == 200
+    assert await _count(db, ana.id, options["ana_latte"].id) == 0
+    assert await _count(db, ana.id, options["ana_flat_white"].id) == 1
+
+
+async def test_repeat_last_order_counts_items(app, session_factory, db):
+    client, base, ana, _, options = await _setup(app, session_factory, db)
+    await client.post(f"{base}/orders", json={"items": [_item(ana, options["ana_latte"])]})
+    resp = await client.post(f"{base}/orders/from-template/last")
+    assert resp.status_code == 201
+    assert await _count(db, ana.id, options["ana_latte"].id) == 2
+
+
+# ---------------------------------------------------------------------------
+# Predictions
+# ---------------------------------------------------------------------------
+
+
+async def test_usual_drinks_ranks_by_frequency(app, session_factory, db):
+    client, base, ana, ben, options = await _setup(app, session_factory, db)
+    orders = [
+        [_item(ana, options["ana_latte"]), _item(ben, options["ben"])],
+        [_item(ana, options["ana_latte"])],
+        [_item(ana, options["ana_flat_white"])],
+    ]
+    for items in orders:
+        await client.post(f"{base}/orders", json={"items": items})
+
+    resp = await client.get(f"{base}/colleagues/usual-drinks", params={"top": 2})
+    assert resp.status_code == 200
+    usual = {u["colleague_id"]: u for u in resp.json()}
+    ana_predictions = usual[str(ana.id)]["predictions"]
+    assert [p["coffee_option_id"] for p in ana_predictions] == [
+        str(options["ana_latte"].id),
+        str(options["ana_flat_white"].id),
+    ]
+    assert ana_predictions[0]["weekday_count"] == 2
+    assert [p["coffee_option_id"] for p in usual[str(ben.id)]["predictions"]] == [
+        str(options["ben"].id)
+    ]
+
+    # Default is the single most likely option; another weekday still ranks by total
+    other_day = (datetime.now(timezone.utc).weekday() + 1) % 7
+    resp = await client.get(f"{base}/colleagues/usual-drinks", params={"weekday": other_day})
+    usual = {u["colleague_id"]: u for u in resp.json()}
+    assert len(usual[str(ana.id)]["predictions"]) == 1
+    assert usual[str(ana.id)]["predictions"][0]["weekday_count"] == 0
+    assert usual[str(ana.id)]["predictions"][0]["coffee_option_id"] == str(options["ana_latte"].id)
+
+
+async def test_usual_drinks_skips_inactive_colleagues(app, session_factory, db):
+    client, base, ana, ben, options = await _setup(app, session_factory, db)
+    await client.post(
+        f"{base}/orders",
+        json={"items": [_item(ana, options["ana_latte"]), _item(ben, options["ben"])]},
+    )
+    await client.delete(f"{base}/colleagues/{ben.id}")
+
+    resp = await client.get(f"{base}/colleagues/usual-drinks")
+    assert [u["colleague_id"] for u in resp.json()] == [str(ana.id)]
+
+    resp = await client.get(f"{base}/colleagues/usual-drinks", params={"top": 0})
+    assert resp.status_code == 400
@@ -3,11 +3,11 @@ const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
   const res = await fetch(`${API_URL}/api/v1${path}`, {
     credentials: 'include',
+    ...options,
     headers: {
       'Content-Type': 'application/json',
       ...options.headers,
     },
-    ...options,
   })
 
   if (!res.ok) {
@@ -19,10 +19,42 @@ async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
   return res.json()
 }
 
+/**
+ * GET that revalidates against a previously seen ETag.
+ * Resolves to null when the server answers 304 Not Modified.
+ */
+async function requestConditional<T>(
+  path: string,
+  etag: string | null
+): Promise<{ data: T; etag: string | null } | null> {
+  const res = await fetch(`${API_URL}/api/v1${path}`, {
+    credentials: 'include',
+    cache: 'no-store',
+    headers: {
+      'Content-Type': 'application/json',
+      ...(etag ? { 'If-None-Match': etag } : {}),
+    },
+  })
+
+  if (res.status === 304) return null
+  if (!res.ok) {
+    const error = await res.json().catch(() => ({ detail: 'Request failed' }))
+    throw new Error(error.detail || `HTTP ${res.status}`)
+  }
+
+  return { data: await res.json(), etag: res.headers.get('ETag') }
+}
+
 export const api = {
+  getConditional: <T>(path: string, etag: string | null) => requestConditional<T>(path, etag),
+
   get: <T>(path: string) => request<T>(path),
-  post: <T>(path: string, body?: unknown) =>
-    request<T>(path, { method: 'POST', body: body ? JSON.stringify(body) : undefined }),
+  post: <T>(path: string, body?: unknown, headers?: Record<string, string>) =>
+    request<T>(path, {
+      method: 'POST',
+      body: body ? JSON.stringify(body) : undefined,
+      headers,
+    }),
   put: <T>(path: string, body?: unknown) =>
     request<T>(path, { method: 'PUT', body: body ? JSON.stringify(body) : undefined }),
   delete: <T>(path: string) => request<T>(path, { method: 'DELETE' }),
@@ -33,7 +65,8 @@ export function createTeamApi(teamId: string) {
   const prefix = `/teams/${teamId}`
   return {
     get: <T>(path: string) => api.get<T>(`${prefix}${path}`),
-    post: <T>(path: string, body?: unknown) => api.post<T>(`${prefix}${path}`, body),
+    post: <T>(path: string, body?: unknown, headers?: Record<string, string>) =>
+      api.post<T>(`${prefix}${path}`, body, headers),
     put: <T>(path: string, body?: unknown) => api.put<T>(`${prefix}${path}`, body),
     delete: <T>(path: string) => api.delete<T>(`${prefix}${path}`),
   }
@@ -139,6 +172,20 @@ export interface Colleague {
   updated_at: string
 }
 
+export interface PresenceForecast {
+  colleague_id: string
+  weekday: number
+  days_observed: number
+  probability: number | null
+  likely_in: boolean
+}
+
+export interface UsualDrinks {
+  colleague_id: string
+  weekday: number
+  predictions: { coffee_option_id: string; weekday_count: number; total_count: number }[]
+}
+
 export interface ConsolidatedItem {
   count: number
   drink_type_name: string
@@ -1,4 +1,4 @@
-import { createContext, type ReactNode, useCallback, useEffect, useMemo, useState } from 'react'
+import { createContext, type ReactNode, useCallback, useEffect, useMemo, useRef, useState } from 'react'
 import { api, createTeamApi, type TeamApi, type User, type TeamMembership } from '@/api/client'
 
 const ACTIVE_TEAM_KEY = 'coffeerun_active_team_id'
@@ -69,12 +69,19 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     return resolved
   }, [])
 
+  // ETag of the last /auth/me body we applied; lets refreshUser revalidate with a 304
+  const meEtag = useRef<string | null>(null)
+
   const fetchUser = useCallback(async () => {
     try {
-      const data = await api.get<User>('/auth/me')
-      setUser(data)
-      applyTeamId(data.teams, localStorage.getItem(ACTIVE_TEAM_KEY))
+      const res = await api.getConditional<User>('/auth/me', meEtag.current)
+      if (res) {
+        meEtag.current = res.etag
+        setUser(res.data)
+        applyTeamId(res.data.teams, localStorage.getItem(ACTIVE_TEAM_KEY))
+      }
     } catch {
+      meEtag.current = null
       setUser(null)
       setActiveTeamId(null)
       localStorage.removeItem(ACTIVE_TEAM_KEY)
@@ -94,6 +101,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
 
   const verify = async (token: string): Promise<User> => {
     const data = await api.post<User>('/auth/verify', { token })
+    meEtag.current = null
     setUser(data)
     applyTeamId(data.teams, localStorage.getItem(ACTIVE_TEAM_KEY))
     return data
@@ -105,6 +113,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     } catch {
       // Server logout failed — still clear local state
     }
+    meEtag.current = null
     setUser(null)
     setActiveTeamId(null)
     localStorage.removeItem(ACTIVE_TEAM_KEY)
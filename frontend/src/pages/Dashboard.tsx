@@ -1,4 +1,4 @@
-import { useEffect, useState, useMemo } from 'react'
+import { useEffect, useState, useMemo, useRef } from 'react'
 import { useNavigate } from 'react-router-dom'
 import {
   type Colleague,
@@ -7,6 +7,8 @@ import {
   type Size,
   type MilkOption,
   type CoffeeOption,
+  type PresenceForecast,
+  type UsualDrinks,
 } from '@/api/client'
 import { useAuth } from '@/hooks/useAuth'
 import { ColleagueCard } from '@/components/ColleagueCard'
@@ -32,6 +34,9 @@ export function Dashboard() {
   const [loading, setLoading] = useState(true)
   const [creating, setCreating] = useState(false)
   const navigate = useNavigate()
+  // Reused while the same items are resubmitted, so a retry after a dropped
+  // connection returns the first order instead of creating a duplicate
+  const idempotency = useRef<{ items: string; key: string } | null>(null)
 
   // Menu data — loaded lazily when a picker opens
   const [menuData, setMenuData] = useState<{
@@ -59,7 +64,22 @@ export function Dashboard() {
       return
     }
     setLoading(true)
-    teamApi.get<Colleague[]>('/colleagues').then((data) => {
+    // Monday = 0, matching the backend's weekday numbering
+    const weekday = (new Date().getDay() + 6) % 7
+    Promise.all([
+      teamApi.get<Colleague[]>('/colleagues'),
+      // The forecast only refines the preselection; fall back to usually_in without it
+      teamApi
+        .get<PresenceForecast[]>(`/colleagues/presence-forecast?weekday=${weekday}`)
+        .catch(() => [] as PresenceForecast[]),
+      teamApi
+        .get<UsualDrinks[]>(`/colleagues/usual-drinks?weekday=${weekday}`)
+        .catch(() => [] as UsualDrinks[]),
+    ]).then(([data, forecast, usual]) => {
+      const likelyIn = new Map(forecast.map((f) => [f.colleague_id, f.likely_in]))
+      const usualOption = new Map(
+        usual.map((u) => [u.colleague_id, u.predictions[0]?.coffee_option_id])
+      )
       setAllColleagues(data)
       setSelection((prev) => {
         const next: Selection = {}
@@ -68,9 +88,13 @@ export function Dashboard() {
             // Preserve existing selection
             next[c.id] = prev[c.id]
           } else {
-            const defaultOpt = c.coffee_options.find((o) => o.is_default) || c.coffee_options[0]
+            // What they usually order on this weekday, else their default option
+            const defaultOpt =
+              c.coffee_options.find((o) => o.id === usualOption.get(c.id)) ||
+              c.coffee_options.find((o) => o.is_default) ||
+              c.coffee_options[0]
             next[c.id] = {
-              checked: c.usually_in,
+              checked: likelyIn.get(c.id) ?? c.usually_in,
               selectedOptionId: defaultOpt?.id || '',
             }
           }
@@ -123,9 +147,19 @@ export function Dashboard() {
 
     if (items.length === 0) return
 
+    const itemsKey = JSON.stringify(items)
+    if (!idempotency.current || idempotency.current.items !== itemsKey) {
+      idempotency.current = { items: itemsKey, key: crypto.randomUUID() }
+    }
+
     setCreating(true)
     try {
-      const order = await teamApi.post<Order>('/orders', { items })
+      const order = await teamApi.post<Order>(
+        '/orders',
+        { items },
+        { 'Idempotency-Key': idempotency.current.key }
+      )
+      idempotency.current = null
       navigate(`/order/${order.id}`)
     } catch (err) {
       alert(err instanceof Error ? err.message : 'Failed to create order')
@@ -134,6 +168,19 @@ export function Dashboard() {
     }
   }
 
+  // Server clones yesterday's items, skipping anyone or anything since removed
+  const handleRepeatLastOrder = async () => {
+    setCreating(true)
+    try {
+      const order = await teamApi.post<Order>('/orders/from-template/last')
+      navigate(`/order/${order.id}`)
+    } catch (err) {
+      alert(err instanceof Error ? err.message : 'Failed to repeat last order')
+    } finally {
+      setCreating(false)
+    }
+  }
+
   // --- Add Visitor handlers ---
   const openAddVisitor = async () => {
     setShowAddVisitor(true)
@@ -302,11 +349,21 @@ export function Dashboard() {
 
       {/* Sticky bottom button */}
       <div className="fixed bottom-16 left-0 right-0 p-4 bg-background/80 backdrop-blur border-t">
-        <div className="max-w-2xl mx-auto">
+        <div className="max-w-2xl mx-auto flex gap-2">
+          {checkedCount === 0 && (
+            <Button
+              variant="outline"
+              onClick={handleRepeatLastOrder}
+              disabled={creating}
+              className="h-12 text-base"
+            >
+              Repeat last order
+            </Button>
+          )}
           <Button
             onClick={handleCreateOrder}
             disabled={checkedCount === 0 || creating}
-            className="w-full h-12 text-base"
+            className="flex-1 h-12 text-base"
           >
             {creating ? 'Creating...' : 'View Order'}
             {checkedCount > 0 && (